@@ -0,0 +1,162 @@
+"""
+슈퍼바이저 모델 서킷 브레이커 모듈 (closed → open → half_open)
+
+Vertex AI가 연속으로 실패하면 브레이커를 열어 일정 시간 Gemini 호출을 막고,
+그동안의 요청은 로컬 가중치 샘플링 라우터로 처리합니다. 열린 시간이 지나면 half_open에서
+소수의 탐침(probe) 호출만 허용하고, 성공하면 닫고 실패하면 더 긴 시간 동안 다시 엽니다.
+
+- 열린 시간: CIRCUIT_BREAKER_OPEN_MS x 2^(연속 열림 횟수 - 1), 최대 CIRCUIT_BREAKER_MAX_OPEN_MS (절반 지터)
+- 재시도 간격: SUPERVISOR_RETRY_BACKOFF_MS x 2^(시도 - 1), 최대 SUPERVISOR_RETRY_BACKOFF_MAX_MS (전체 지터)
+
+프로세스 안의 모든 요청이 하나의 브레이커를 공유합니다.
+"""
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from .metrics import REGISTRY
+from .structured_logging import get_logger
+
+CIRCUIT_TRANSITIONS = REGISTRY.counter(
+    "sports_agent_circuit_breaker_transitions_total", "서킷 브레이커 상태 전환 횟수 (to 라벨)"
+)
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    "sports_agent_circuit_breaker_rejections_total", "브레이커가 열려 Gemini 없이 처리한 요청 수"
+)
+
+logger = get_logger("supervisor")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커 (스레드 안전)"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        failure_threshold: int = 5,
+        open_ms: float = 1000,
+        max_open_ms: float = 60000,
+        half_open_max_calls: int = 1,
+        retry_backoff_ms: float = 100,
+        retry_backoff_max_ms: float = 2000,
+        seed: Optional[int] = None
+    ):
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_ms / 1000
+        self.max_open_seconds = max_open_ms / 1000
+        self.half_open_max_calls = half_open_max_calls
+        self.retry_backoff = retry_backoff_ms / 1000
+        self.retry_backoff_max = retry_backoff_max_ms / 1000
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probes_in_flight = 0
+
+    def _transition(self, state: str) -> None:
+        """상태 전환 (락을 잡은 상태에서 호출)"""
+        if state == self.state:
+            return
+        logger.warning("🔌 서킷 브레이커 상태 변경", previous=self.state, state=state, trips=self._trips)
+        self.state = state
+        CIRCUIT_TRANSITIONS.inc(to=state)
+
+    def _open(self) -> None:
+        self._trips += 1
+        backoff = min(self.max_open_seconds, self.open_seconds * 2 ** (self._trips - 1))
+        self._open_until = time.monotonic() + backoff / 2 + self.random.uniform(0, backoff / 2)
+        self._probes_in_flight = 0
+        self._transition(OPEN)
+
+    def allow_request(self) -> bool:
+        """Gemini 호출 허용 여부 (half_open에서는 탐침 슬롯을 차지하므로 반드시 record_* 또는 release 호출)"""
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self.state == OPEN and time.monotonic() >= self._open_until:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return True
+        CIRCUIT_REJECTIONS.inc()
+        return False
+
+    def record_success(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._consecutive_failures = 0
+            if self.state == HALF_OPEN:
+                self._trips = 0
+                self._probes_in_flight = 0
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._consecutive_failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def release(self) -> None:
+        """결과 없이 끝난(취소된) 탐침 슬롯 반환"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    def retry_delay(self, attempt: int) -> float:
+        """attempt번째 실패 후 재시도까지 대기 시간(초, 전체 지터)"""
+        return self.random.uniform(0, min(self.retry_backoff_max, self.retry_backoff * 2 ** (attempt - 1)))
+
+    @property
+    def state_value(self) -> int:
+        return STATE_VALUES[self.state]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            open_remaining = max(0.0, self._open_until - time.monotonic()) if self.state == OPEN else 0.0
+            return {
+                "enabled": self.enabled,
+                "state": self.state,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "trips": self._trips,
+                "open_remaining_ms": round(open_remaining * 1000, 2),
+                "rejections": int(CIRCUIT_REJECTIONS.value()),
+                "transitions": {state: int(CIRCUIT_TRANSITIONS.value(to=state)) for state in STATE_VALUES}
+            }
+
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """프로세스 공용 서킷 브레이커 반환 (환경변수 설정으로 최초 생성)"""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        _circuit_breaker = CircuitBreaker(
+            enabled=os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true",
+            failure_threshold=int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")),
+            open_ms=float(os.getenv("CIRCUIT_BREAKER_OPEN_MS", "1000")),
+            max_open_ms=float(os.getenv("CIRCUIT_BREAKER_MAX_OPEN_MS", "60000")),
+            half_open_max_calls=int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS", "1")),
+            retry_backoff_ms=float(os.getenv("SUPERVISOR_RETRY_BACKOFF_MS", "100")),
+            retry_backoff_max_ms=float(os.getenv("SUPERVISOR_RETRY_BACKOFF_MAX_MS", "2000"))
+        )
+    return _circuit_breaker
@@ -0,0 +1,211 @@
+"""
+라우팅 집계 카운터 모듈
+
+최근 N개 이력에 대한 에이전트별 선택 횟수/확신도 합계를 메모리에 유지합니다.
+이력 저장 시 한 번만 갱신되므로 비율·통계 조회가 이력 길이와 무관하게 O(1)입니다.
+
+- RoutingCounters: 최근 N개를 동일 가중치로 집계 (window 모드)
+- DecayedRoutingCounters: 반감기 기반 지수 감쇠 누적값으로 비율 계산 (decay 모드)
+- SharedRecordCounters: 여러 워커가 공유하는 이력 저장소의 최근 레코드로 주기적으로 다시 만드는 집계
+"""
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class RoutingCounters:
+    """슬라이딩 윈도우 기반 에이전트별 집계"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._entries = deque()
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._confidence_sums: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def rebuild(self, records: Iterable[Dict]) -> None:
+        """디스크 이력으로부터 집계 재구성 (시작 시 1회)"""
+        with self._lock:
+            self._entries.clear()
+            self._counts.clear()
+            self._confidence_sums.clear()
+            for record in records:
+                self._add_locked(record["selected_agent"], record.get("confidence", 0.0))
+
+    def add(self, selected_agent: str, confidence: float) -> None:
+        """선택 1건 반영 (윈도우를 벗어난 가장 오래된 선택은 차감)"""
+        with self._lock:
+            self._add_locked(selected_agent, confidence)
+
+    def _add_locked(self, selected_agent: str, confidence: float) -> None:
+        confidence = confidence or 0.0
+        self._entries.append((selected_agent, confidence))
+        self._counts[selected_agent] += 1
+        self._confidence_sums[selected_agent] += confidence
+
+        if len(self._entries) > self.window:
+            old_agent, old_confidence = self._entries.popleft()
+            self._counts[old_agent] -= 1
+            self._confidence_sums[old_agent] -= old_confidence
+            if self._counts[old_agent] <= 0:
+                del self._counts[old_agent]
+                del self._confidence_sums[old_agent]
+
+    def clear(self) -> None:
+        self.rebuild([])
+
+    @property
+    def total(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self) -> Tuple[Dict[str, int], Dict[str, float], int]:
+        """(에이전트별 횟수, 에이전트별 확신도 합계, 총 횟수) 복사본 반환"""
+        with self._lock:
+            return dict(self._counts), dict(self._confidence_sums), len(self._entries)
+
+    def window_snapshot(self) -> Tuple[Dict[str, int], Dict[str, float], int]:
+        """감쇠 없이 윈도우 내 실제 횟수 기준 스냅샷 (통계 표시용)"""
+        return RoutingCounters.snapshot(self)
+
+    def ratios(self, agents: List[str]) -> Tuple[Dict[str, float], int]:
+        """지정한 에이전트들의 선택 비율과 총 횟수 반환"""
+        counts, _, total = self.snapshot()
+        return {
+            agent: counts.get(agent, 0) / total if total > 0 else 0.0
+            for agent in agents
+        }, total
+
+
+def _record_time(record: Dict) -> Optional[float]:
+    """이력 레코드의 timestamp(ISO 형식)를 epoch 초로 변환"""
+    try:
+        return datetime.fromisoformat(record["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class DecayedRoutingCounters(RoutingCounters):
+    """
+    지수 시간 감쇠 집계 (반감기 half_life_seconds)
+
+    선택 1건마다 에이전트별 누적값에 감쇠 계수 2^(-경과시간/반감기)를 곱한 뒤 1을 더하므로
+    갱신 비용은 에이전트 수에만 비례(O(1))합니다. 윈도우 재집계가 필요 없고
+    최근 선택일수록 비율에 크게 반영되어 가중치 변경에 빠르게 수렴합니다.
+    """
+
+    def __init__(self, window: int = 1000, half_life_seconds: float = 300.0):
+        super().__init__(window)
+        self.half_life_seconds = half_life_seconds
+        self._decayed_counts: Dict[str, float] = defaultdict(float)
+        self._decayed_confidence_sums: Dict[str, float] = defaultdict(float)
+        self._last_decay_at: Optional[float] = None
+
+    def _decay_to(self, now: float) -> None:
+        if self._last_decay_at is not None and now > self._last_decay_at:
+            factor = math.pow(2.0, -(now - self._last_decay_at) / self.half_life_seconds)
+            for agent in self._decayed_counts:
+                self._decayed_counts[agent] *= factor
+                self._decayed_confidence_sums[agent] *= factor
+        if self._last_decay_at is None or now > self._last_decay_at:
+            self._last_decay_at = now
+
+    def rebuild(self, records: Iterable[Dict]) -> None:
+        """디스크 이력으로 재구성 (레코드 timestamp 기준으로 감쇠 적용)"""
+        with self._lock:
+            self._entries.clear()
+            self._counts.clear()
+            self._confidence_sums.clear()
+            self._decayed_counts.clear()
+            self._decayed_confidence_sums.clear()
+            self._last_decay_at = None
+            for record in records:
+                self._add_decayed_locked(
+                    record["selected_agent"], record.get("confidence", 0.0), _record_time(record)
+                )
+            self._decay_to(time.time())
+
+    def add(self, selected_agent: str, confidence: float) -> None:
+        with self._lock:
+            self._add_decayed_locked(selected_agent, confidence, time.time())
+
+    def _add_decayed_locked(self, selected_agent: str, confidence: float, at: Optional[float]) -> None:
+        self._add_locked(selected_agent, confidence)
+        self._decay_to(at if at is not None else (self._last_decay_at or time.time()))
+        self._decayed_counts[selected_agent] += 1.0
+        self._decayed_confidence_sums[selected_agent] += confidence or 0.0
+
+    def snapshot(self) -> Tuple[Dict[str, float], Dict[str, float], int]:
+        """
+        감쇠 가중 스냅샷: 에이전트별 유효 횟수를 총 횟수에 맞게 환산해 반환
+        (횟수/총 횟수 = 감쇠 비율이 되므로 window 모드와 같은 방식으로 사용 가능)
+        """
+        with self._lock:
+            total = len(self._entries)
+            decayed_total = sum(self._decayed_counts.values())
+            if total == 0 or decayed_total <= 0:
+                return {}, {}, total
+            scale = total / decayed_total
+            counts = {agent: value * scale for agent, value in self._decayed_counts.items() if value > 0}
+            confidence_sums = {agent: self._decayed_confidence_sums[agent] * scale for agent in counts}
+            return counts, confidence_sums, total
+
+    @property
+    def effective_total(self) -> float:
+        """현재 시점 기준 감쇠 누적값 합계 (유효 표본 수)"""
+        with self._lock:
+            self._decay_to(time.time())
+            return sum(self._decayed_counts.values())
+
+
+class SharedRecordCounters(RoutingCounters):
+    """
+    공유 이력 저장소의 최근 window개 레코드로 ttl_seconds마다 다시 만드는 집계
+    집계 방식(window/decay)은 counters_factory가 정하므로 모든 워커가 같은 비율을 보고,
+    그 사이 이 프로세스에서 추가된 선택은 현재 집계에 바로 더함
+    """
+
+    def __init__(
+        self,
+        load_records: Callable[[], List[Dict]],
+        counters_factory: Callable[[int], RoutingCounters],
+        window: int = 1000,
+        ttl_seconds: float = 0.25
+    ):
+        super().__init__(window)
+        self.load_records = load_records
+        self.counters_factory = counters_factory
+        self.ttl_seconds = ttl_seconds
+        self._current: Optional[RoutingCounters] = None
+        self._loaded_at = 0.0
+
+    def current(self) -> RoutingCounters:
+        """TTL 안이면 현재 집계, 지났으면 공유 저장소로 다시 만든 집계"""
+        with self._lock:
+            now = time.monotonic()
+            if self._current is None or now - self._loaded_at > self.ttl_seconds:
+                counters = self.counters_factory(self.window)
+                counters.rebuild(self.load_records())
+                self._current = counters
+                self._loaded_at = now
+            return self._current
+
+    def rebuild(self, records=None) -> None:
+        """다음 조회 시 공유 저장소로 다시 집계 (records는 사용하지 않음)"""
+        with self._lock:
+            self._current = None
+
+    def add(self, selected_agent: str, confidence: float) -> None:
+        self.current().add(selected_agent, confidence)
+
+    @property
+    def total(self) -> int:
+        return self.current().total
+
+    def snapshot(self) -> Tuple[Dict[str, float], Dict[str, float], int]:
+        return self.current().snapshot()
+
+    def window_snapshot(self) -> Tuple[Dict[str, int], Dict[str, float], int]:
+        return self.current().window_snapshot()
@@ -0,0 +1,159 @@
+"""
+라우팅 결정 캐시 모듈
+
+정규화된 질문 + 양자화된 라우팅 상태(정규화 비율, 가중치)를 키로
+Gemini의 AgentSelection 결과를 LRU/TTL 캐시에 저장합니다.
+
+모드 (DECISION_CACHE_MODE):
+- off: 캐시 미사용 (기본)
+- fixed: 캐시된 결정을 그대로 재사용
+- sample: 키별로 최대 DECISION_CACHE_SAMPLES개의 결정을 모은 뒤, 그 분포에서 샘플링
+          (표본이 모이기 전에는 miss로 처리해 Gemini를 호출하므로 이력 피드백 루프가 유지됨)
+"""
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .utils import AgentSelection
+
+
+def normalize_query(user_query: str) -> str:
+    """질문 정규화 (소문자, 공백 압축, 끝 문장부호 제거)"""
+    normalized = re.sub(r"\s+", " ", user_query.strip().lower())
+    return normalized.rstrip(" .!?~…")
+
+
+def quantize(values: Dict[str, float], quantum: float) -> Tuple[Tuple[str, int], ...]:
+    """비율/가중치 양자화 (작은 변동은 같은 키로 취급)"""
+    return tuple(sorted((key, int(round(value / quantum))) for key, value in values.items()))
+
+
+class DecisionCache:
+    """LRU + TTL 라우팅 결정 캐시"""
+
+    def __init__(
+        self,
+        mode: str = "off",
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        quantum: float = 0.05,
+        samples_per_key: int = 5,
+        seed: Optional[int] = None,
+    ):
+        if mode not in ("off", "fixed", "sample"):
+            raise ValueError(f"지원하지 않는 DECISION_CACHE_MODE: {mode}")
+        self.mode = mode
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.quantum = quantum
+        self.samples_per_key = samples_per_key if mode == "sample" else 1
+
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def state_key(self, normalized_ratios: Dict[str, float], agent_weights: Dict[str, float]) -> Tuple:
+        """양자화된 라우팅 상태 (시맨틱 캐시와 공유)"""
+        return (
+            quantize(normalized_ratios, self.quantum),
+            quantize(agent_weights, self.quantum)
+        )
+
+    def make_key(self, user_query: str, normalized_ratios: Dict[str, float], agent_weights: Dict[str, float]) -> Tuple:
+        return (normalize_query(user_query),) + self.state_key(normalized_ratios, agent_weights)
+
+    def get(self, key: Tuple) -> Optional[AgentSelection]:
+        """캐시 조회 (표본이 충분하지 않거나 만료되었으면 None)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry["created_at"] > self.ttl_seconds:
+                del self._entries[key]
+                self.stats["expirations"] += 1
+                entry = None
+
+            if entry is None or len(entry["selections"]) < self.samples_per_key:
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            selections: List[AgentSelection] = entry["selections"]
+            if self.mode == "sample":
+                return self._random.choice(selections)
+            return selections[-1]
+
+    def contains(self, key: Tuple) -> bool:
+        """키에 대한 항목 존재 여부 (표본 수집 중인 항목 포함, 통계에 반영하지 않음)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() - entry["created_at"] <= self.ttl_seconds
+
+    def samples(self, key: Tuple) -> List[AgentSelection]:
+        """키에 모인 결정 표본 (만료되었거나 없으면 빈 목록, 통계에 반영하지 않음)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry["created_at"] > self.ttl_seconds:
+                return []
+            return list(entry["selections"])
+
+    def put(self, key: Tuple, selection: AgentSelection) -> None:
+        """Gemini 결정 저장 (sample 모드는 키별 표본에 누적)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {"created_at": time.monotonic(), "selections": []}
+                self._entries[key] = entry
+            entry["selections"].append(selection)
+            if len(entry["selections"]) > self.samples_per_key:
+                entry["selections"].pop(0)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self) -> int:
+        """전체 무효화 (가중치 변경 시), 삭제된 항목 수 반환"""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self.stats["invalidations"] += 1
+            return removed
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "mode": self.mode,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self.stats
+            }
+
+
+_decision_cache: Optional[DecisionCache] = None
+
+
+def get_decision_cache() -> DecisionCache:
+    """프로세스 공용 결정 캐시 반환 (환경변수 설정으로 최초 생성)"""
+    global _decision_cache
+    if _decision_cache is None:
+        _decision_cache = DecisionCache(
+            mode=os.getenv("DECISION_CACHE_MODE", "off"),
+            max_entries=int(os.getenv("DECISION_CACHE_MAX_ENTRIES", "1024")),
+            ttl_seconds=float(os.getenv("DECISION_CACHE_TTL_SECONDS", "300")),
+            quantum=float(os.getenv("DECISION_CACHE_QUANTUM", "0.05")),
+            samples_per_key=int(os.getenv("DECISION_CACHE_SAMPLES", "5")),
+        )
+    return _decision_cache
@@ -0,0 +1,194 @@
+"""
+오프라인 가짜 Gemini 백엔드 모듈 (부하/지연 테스트용)
+
+SUPERVISOR_MODEL=fake 로 설정하면 Vertex AI 대신 이 모델이 사용됩니다.
+네트워크나 GCP 인증 없이 그래프, API, 이력 파이프라인 전체를 테스트할 수 있습니다.
+
+환경변수:
+- FAKE_MODEL_POLICY: ratio(기본, 프롬프트의 비율대로 샘플링) | keyword | fixed
+- FAKE_MODEL_FIXED_AGENT: fixed 정책에서 항상 선택할 에이전트
+- FAKE_MODEL_LATENCY_MS: 평균 지연 (ms, 기본 0)
+- FAKE_MODEL_LATENCY_DIST: constant | uniform | normal | lognormal | exponential
+- FAKE_MODEL_LATENCY_JITTER_MS: 지연 분산 정도 (uniform은 반폭, normal/lognormal은 표준편차)
+- FAKE_MODEL_ERROR_RATE: 호출 실패 확률 (0.0~1.0)
+- FAKE_MODEL_SEED: 난수 시드 (재현 가능한 테스트용)
+"""
+import asyncio
+import math
+import os
+import random
+import re
+import time
+from typing import Dict, Optional
+
+from .utils import AgentSelection
+from .structured_logging import get_logger
+
+logger = get_logger("supervisor")
+
+
+SPORTS_AGENTS = ["축구_에이전트", "농구_에이전트", "야구_에이전트", "테니스_에이전트"]
+
+# keyword 정책용 키워드 (weights.get_mock_routing_data와 동일한 키워드 체계)
+FAKE_KEYWORDS = {
+    "축구_에이전트": ["축구", "킥", "풋살"],
+    "농구_에이전트": ["농구", "슛", "3점", "덩크"],
+    "야구_에이전트": ["야구", "배팅", "홈런", "캐치볼"],
+    "테니스_에이전트": ["테니스", "라켓", "서브", "배드민턴"]
+}
+
+_RATIO_PATTERN = re.compile(r"(축구_에이전트|농구_에이전트|야구_에이전트|테니스_에이전트)\s*:\s*([\d.]+)%")
+
+
+class FakeModelError(RuntimeError):
+    """가짜 모델이 주입한 오류"""
+
+
+class FakeSupervisorModel:
+    """ChatVertexAI 구조화 출력 모델을 흉내내는 가짜 모델"""
+
+    def __init__(
+        self,
+        policy: str = "ratio",
+        fixed_agent: str = "축구_에이전트",
+        latency_ms: float = 0.0,
+        latency_distribution: str = "constant",
+        latency_jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if policy not in ("ratio", "keyword", "fixed"):
+            raise ValueError(f"지원하지 않는 FAKE_MODEL_POLICY: {policy}")
+        if fixed_agent not in SPORTS_AGENTS:
+            raise ValueError(f"유효하지 않은 FAKE_MODEL_FIXED_AGENT: {fixed_agent}")
+
+        self.policy = policy
+        self.fixed_agent = fixed_agent
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.call_count = 0
+
+    def with_structured_output(self, schema):
+        """ChatVertexAI 인터페이스 호환 (항상 AgentSelection 반환)"""
+        return self
+
+    # ------------------------------------------------------------------
+    # 지연/오류 주입
+    # ------------------------------------------------------------------
+    def sample_latency(self) -> float:
+        """설정된 분포에서 지연 시간(초) 샘플링"""
+        mean = self.latency_ms
+        jitter = self.latency_jitter_ms
+        dist = self.latency_distribution
+
+        if mean <= 0:
+            return 0.0
+        if dist == "uniform":
+            value = self._random.uniform(mean - jitter, mean + jitter)
+        elif dist == "normal":
+            value = self._random.gauss(mean, jitter)
+        elif dist == "lognormal":
+            sigma = math.sqrt(math.log(1 + (jitter / mean) ** 2)) if jitter > 0 else 0.0
+            mu = math.log(mean) - sigma ** 2 / 2
+            value = self._random.lognormvariate(mu, sigma)
+        elif dist == "exponential":
+            value = self._random.expovariate(1.0 / mean)
+        else:
+            value = mean
+        return max(value, 0.0) / 1000
+
+    def _maybe_fail(self):
+        if self.error_rate > 0 and self._random.random() < self.error_rate:
+            raise FakeModelError("가짜 모델 오류 주입 (FAKE_MODEL_ERROR_RATE)")
+
+    # ------------------------------------------------------------------
+    # 선택 정책
+    # ------------------------------------------------------------------
+    @staticmethod
+    def parse_ratios(prompt: str) -> Dict[str, float]:
+        """프롬프트의 과거 패턴 비율 파싱 (에이전트별 첫 번째 값 사용)"""
+        ratios = {}
+        for agent, percentage in _RATIO_PATTERN.findall(prompt):
+            if agent not in ratios:
+                ratios[agent] = float(percentage) / 100
+        return ratios
+
+    @staticmethod
+    def parse_query(prompt: str) -> str:
+        match = re.search(r'사용자 질문:\s*"(.*)"', prompt)
+        return match.group(1) if match else prompt
+
+    def _sample_by_ratio(self, prompt: str) -> AgentSelection:
+        ratios = self.parse_ratios(prompt)
+        agents = [agent for agent in SPORTS_AGENTS if ratios.get(agent, 0) > 0]
+        if not agents:
+            agents = SPORTS_AGENTS
+            weights = [1.0] * len(agents)
+        else:
+            weights = [ratios[agent] for agent in agents]
+
+        selected = self._random.choices(agents, weights=weights, k=1)[0]
+        return AgentSelection(
+            selected_agent=selected,
+            reason=f"[fake] 과거 패턴 비율 기반 샘플링 ({ratios.get(selected, 0):.1%})",
+            confidence=round(min(max(ratios.get(selected, 0.25), 0.0), 1.0), 2)
+        )
+
+    def _decide(self, prompt: str) -> AgentSelection:
+        if self.policy == "fixed":
+            return AgentSelection(
+                selected_agent=self.fixed_agent,
+                reason="[fake] 고정 정책",
+                confidence=1.0
+            )
+
+        if self.policy == "keyword":
+            query = self.parse_query(prompt).lower()
+            for agent, keywords in FAKE_KEYWORDS.items():
+                if any(keyword in query for keyword in keywords):
+                    return AgentSelection(
+                        selected_agent=agent,
+                        reason="[fake] 키워드 매칭",
+                        confidence=0.9
+                    )
+
+        return self._sample_by_ratio(prompt)
+
+    # ------------------------------------------------------------------
+    # 호출 인터페이스
+    # ------------------------------------------------------------------
+    def invoke(self, prompt: str) -> AgentSelection:
+        self.call_count += 1
+        time.sleep(self.sample_latency())
+        self._maybe_fail()
+        return self._decide(prompt)
+
+    async def ainvoke(self, prompt: str) -> AgentSelection:
+        self.call_count += 1
+        await asyncio.sleep(self.sample_latency())
+        self._maybe_fail()
+        return self._decide(prompt)
+
+
+def create_fake_model_from_env() -> FakeSupervisorModel:
+    """환경변수 설정으로 가짜 모델 생성"""
+    seed = os.getenv("FAKE_MODEL_SEED")
+    model = FakeSupervisorModel(
+        policy=os.getenv("FAKE_MODEL_POLICY", "ratio"),
+        fixed_agent=os.getenv("FAKE_MODEL_FIXED_AGENT", "축구_에이전트"),
+        latency_ms=float(os.getenv("FAKE_MODEL_LATENCY_MS", "0")),
+        latency_distribution=os.getenv("FAKE_MODEL_LATENCY_DIST", "constant"),
+        latency_jitter_ms=float(os.getenv("FAKE_MODEL_LATENCY_JITTER_MS", "0")),
+        error_rate=float(os.getenv("FAKE_MODEL_ERROR_RATE", "0")),
+        seed=int(seed) if seed else None,
+    )
+    logger.info(
+        "🧪 가짜 Gemini 백엔드 사용",
+        policy=model.policy,
+        latency_ms=model.latency_ms,
+        error_rate=model.error_rate
+    )
+    return model
@@ -1,6 +1,11 @@
 """
 LangGraph 워크플로우 정의 (운동 추천 에이전트 버전)
 """
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
 from langgraph.graph import StateGraph, END
 from .nodes import (
     AgentState,
@@ -11,6 +16,13 @@ from .nodes import (
     tennis_node,
     should_continue
 )
+from .weights import get_routing_counters
+from .utils import get_structured_supervisor_model
+from .metrics import instrument_node, WORKFLOW_DURATION
+from .structured_logging import get_logger
+
+logger = get_logger("workflow")
+result_logger = get_logger("result")
 
 # Langfuse observe decorator import
 try:
@@ -32,11 +44,11 @@ def create_sports_agent_graph():
     workflow = StateGraph(AgentState)
     
     # 노드 추가
-    workflow.add_node("supervisor", supervisor_node)
-    workflow.add_node("soccer", soccer_node)
-    workflow.add_node("basketball", basketball_node)
-    workflow.add_node("baseball", baseball_node)
-    workflow.add_node("tennis", tennis_node)
+    workflow.add_node("supervisor", instrument_node("supervisor", supervisor_node))
+    workflow.add_node("soccer", instrument_node("soccer", soccer_node))
+    workflow.add_node("basketball", instrument_node("basketball", basketball_node))
+    workflow.add_node("baseball", instrument_node("baseball", baseball_node))
+    workflow.add_node("tennis", instrument_node("tennis", tennis_node))
     
     # 시작점 설정
     workflow.set_entry_point("supervisor")
@@ -65,12 +77,63 @@ def create_sports_agent_graph():
     return app
 
 
+# 컴파일된 그래프 캐시 (프로세스당 1회 컴파일)
+_compiled_graph = None
+
+
+def get_compiled_graph():
+    """컴파일된 그래프 반환 (최초 호출 시 컴파일 후 재사용)"""
+    global _compiled_graph
+    if _compiled_graph is None:
+        _compiled_graph = create_sports_agent_graph()
+    return _compiled_graph
+
+
+async def warm_up_workflow() -> Dict[str, float]:
+    """
+    서버 시작 시 워밍업: 그래프 컴파일, 라우팅 집계 로드, 모델 클라이언트 초기화, executor 스레드 생성
+    단계별 소요 시간(ms)을 반환
+    """
+    timings = {}
+    loop = asyncio.get_running_loop()
+
+    start = time.perf_counter()
+    get_compiled_graph()
+    timings["graph_compile_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    await loop.run_in_executor(None, get_routing_counters)
+    timings["routing_counters_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    await loop.run_in_executor(None, get_structured_supervisor_model)
+    timings["model_client_ms"] = (time.perf_counter() - start) * 1000
+
+    # 동시에 블로킹 작업을 제출해 기본 executor의 스레드를 미리 생성
+    start = time.perf_counter()
+    thread_count = int(os.getenv("WARMUP_EXECUTOR_THREADS", "8"))
+    await asyncio.gather(*[
+        loop.run_in_executor(None, time.sleep, 0.01)
+        for _ in range(thread_count)
+    ])
+    timings["executor_threads_ms"] = (time.perf_counter() - start) * 1000
+
+    return timings
+
+
 @observe(name="multi_agent_system") if LANGFUSE_AVAILABLE else lambda x: x
-async def run_sports_agent_workflow(user_query: str):
-    """운동 추천 워크플로우 실행"""
+async def run_sports_agent_workflow(
+    user_query: str,
+    partition_key: Optional[str] = None,
+    prompt_mode: Optional[str] = None
+):
+    """
+    운동 추천 워크플로우 실행
+    partition_key: 파티션별 라우팅 비율 사용 시, prompt_mode: full | compact (없으면 SUPERVISOR_PROMPT_MODE)
+    """
     try:
-        # 그래프 생성
-        app = create_sports_agent_graph()
+        # 컴파일된 그래프 재사용
+        app = get_compiled_graph()
         
         # 초기 상태 설정 (딕셔너리로 설정)
         initial_state = {
@@ -78,14 +141,15 @@ async def run_sports_agent_workflow(user_query: str):
             "user_query": user_query,
             "selected_agent": "",
             "agent_response": {},
-            "routing_info": {}
+            "routing_info": {},
+            "partition_key": partition_key,
+            "prompt_mode": prompt_mode
         }
         
         # 워크플로우 실행
-        result = await app.ainvoke(initial_state)
-        print("--------------------------------")
-        print(result)
-        print("--------------------------------")
+        with WORKFLOW_DURATION.time():
+            result = await app.ainvoke(initial_state)
+        result_logger.info("워크플로우 결과", result=result)
         
         return {
             "success": True,
@@ -96,7 +160,7 @@ async def run_sports_agent_workflow(user_query: str):
         }
         
     except Exception as e:
-        print(f"❌ 워크플로우 실행 오류: {e}")
+        logger.error("❌ 워크플로우 실행 오류", user_query=user_query, error=str(e))
         return {
             "success": False,
             "error": str(e),
@@ -104,6 +168,71 @@ async def run_sports_agent_workflow(user_query: str):
         }
 
 
+async def stream_sports_agent_workflow(
+    user_query: str,
+    partition_key: Optional[str] = None,
+    prompt_mode: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    운동 추천 워크플로우 스트리밍 실행 (LangGraph astream, 노드 단위 업데이트)
+    (이벤트 이름, 데이터)를 순서대로 yield: routing → agent_response → summary
+    오류 시 error 이벤트를 내보내고 종료
+    """
+    app = get_compiled_graph()
+    initial_state = {
+        "messages": [],
+        "user_query": user_query,
+        "selected_agent": "",
+        "agent_response": {},
+        "routing_info": {},
+        "partition_key": partition_key,
+        "prompt_mode": prompt_mode
+    }
+    
+    started_at = time.perf_counter()
+    node_timings = {}
+    selected_agent = ""
+    last_event_at = started_at
+    
+    try:
+        with WORKFLOW_DURATION.time():
+            async for update in app.astream(initial_state, stream_mode="updates"):
+                now = time.perf_counter()
+                for node_name, node_output in update.items():
+                    node_timings[f"{node_name}_ms"] = round((now - last_event_at) * 1000, 2)
+                    node_output = node_output or {}
+                    
+                    if node_name == "supervisor":
+                        selected_agent = node_output.get("selected_agent", "")
+                        yield "routing", {
+                            "user_query": user_query,
+                            "selected_agent": selected_agent,
+                            "routing_info": node_output.get("routing_info", {}),
+                            "elapsed_ms": round((now - started_at) * 1000, 2)
+                        }
+                    else:
+                        yield "agent_response", {
+                            "selected_agent": selected_agent,
+                            "agent_response": node_output.get("agent_response", {}),
+                            "elapsed_ms": round((now - started_at) * 1000, 2)
+                        }
+                last_event_at = now
+    except Exception as e:
+        logger.error("❌ 워크플로우 스트리밍 오류", user_query=user_query, error=str(e))
+        yield "error", {"success": False, "error": str(e), "user_query": user_query}
+        return
+    
+    yield "summary", {
+        "success": True,
+        "user_query": user_query,
+        "selected_agent": selected_agent,
+        "timings": {
+            **node_timings,
+            "total_ms": round((time.perf_counter() - started_at) * 1000, 2)
+        }
+    }
+
+
 @observe(name="multi_agent_system_sync") if LANGFUSE_AVAILABLE else lambda x: x
 def run_multi_agent_system(user_query: str):
     """
@@ -0,0 +1,191 @@
+"""
+Gemini 호출 지연 제어 모듈 (시도별 마감 시간 + 전체 예산 + 헤지 요청)
+
+- 시도별 마감 시간(SUPERVISOR_ATTEMPT_TIMEOUT_MS): 한 번의 Gemini 호출이 이 시간을 넘으면 취소 후 재시도
+- 전체 예산(SUPERVISOR_TOTAL_BUDGET_MS): 대기 + 모든 시도의 합계 상한, 넘으면 폴백
+- 헤지 요청(SUPERVISOR_HEDGE_ENABLED): 첫 요청이 최근 성공 지연의 p95(SUPERVISOR_HEDGE_QUANTILE)를
+  넘도록 끝나지 않으면 같은 프롬프트로 두 번째 요청을 보내고 먼저 끝난 결과 사용
+  (헤지 비율은 SUPERVISOR_HEDGE_MAX_RATIO로 제한해 평균 상류 부하가 늘지 않도록 함)
+  헤지 요청도 동시 호출 세마포어 슬롯을 따로 잡으며, 빈 슬롯이 없으면 헤지하지 않음
+
+0 이하의 마감 시간/예산은 제한 없음을 의미합니다.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .metrics import REGISTRY
+
+SUPERVISOR_TIMEOUTS = REGISTRY.counter(
+    "sports_agent_supervisor_timeouts_total", "Gemini 호출 마감 초과 횟수 (kind: attempt, budget, queue)"
+)
+SUPERVISOR_HEDGES = REGISTRY.counter(
+    "sports_agent_supervisor_hedges_total",
+    "헤지 요청 수 (winner: primary, hedge, none / skipped: 동시 호출 슬롯이 없어 보내지 않음)"
+)
+
+
+class LatencyTracker:
+    """
+    최근 성공 호출 지연(초)의 슬라이딩 윈도우와 분위수
+    분위수는 refresh_every번 관측마다 한 번만 정렬해 다시 계산하고 그 사이에는 캐시 사용
+    """
+
+    def __init__(self, window: int = 1000, refresh_every: Optional[int] = None):
+        self._samples = deque(maxlen=window)
+        self.refresh_every = refresh_every or max(1, window // 100)
+        self._lock = threading.Lock()
+        self._quantiles: Dict[float, float] = {}
+        self._observed_since_refresh = 0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._observed_since_refresh += 1
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            if self._observed_since_refresh >= self.refresh_every:
+                self._quantiles.clear()
+                self._observed_since_refresh = 0
+            value = self._quantiles.get(q)
+            if value is None:
+                ordered = sorted(self._samples)
+                value = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+                self._quantiles[q] = value
+            return value
+
+
+class HedgePolicy:
+    """시도별 마감 시간, 전체 예산, 헤지 지연/비율 설정과 상태"""
+
+    def __init__(
+        self,
+        attempt_timeout_ms: float = 10000,
+        total_budget_ms: float = 25000,
+        hedge_enabled: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 50,
+        hedge_min_delay_ms: float = 50,
+        hedge_max_ratio: float = 0.1,
+        window: int = 1000
+    ):
+        self.attempt_timeout = attempt_timeout_ms / 1000 if attempt_timeout_ms > 0 else None
+        self.total_budget = total_budget_ms / 1000 if total_budget_ms > 0 else None
+        self.hedge_enabled = hedge_enabled
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay_ms / 1000
+        self.hedge_max_ratio = hedge_max_ratio
+        self.latencies = LatencyTracker(window)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._hedges = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """헤지 요청을 보낼 시점(초), 비활성이거나 표본이 부족하면 None"""
+        if not self.hedge_enabled or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, self.latencies.quantile(self.hedge_quantile))
+
+    def _try_acquire_hedge(self) -> bool:
+        """전체 호출 대비 헤지 비율이 상한 이내일 때만 헤지 허용"""
+        with self._lock:
+            if self._hedges + 1 > self.hedge_max_ratio * self._calls:
+                return False
+            self._hedges += 1
+            return True
+
+    async def call(
+        self, func: Callable[[], Awaitable[Any]], semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Tuple[Any, bool]:
+        """
+        func 호출 (헤지 지연이 지나도 끝나지 않으면 두 번째 호출을 보내 먼저 성공한 결과 사용)
+        semaphore가 있으면 헤지 요청도 슬롯을 하나 더 잡고, 빈 슬롯이 없으면 헤지하지 않음
+        (첫 요청의 슬롯은 호출한 쪽이 잡고 있어야 함 - 상류 동시 호출이 상한을 넘지 않도록)
+        반환: (결과, 헤지 요청이 이겼는지 여부)
+        """
+        with self._lock:
+            self._calls += 1
+        delay = self.hedge_delay()
+        if delay is None:
+            return await func(), False
+
+        primary = asyncio.ensure_future(func())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return await primary, False
+            if semaphore is not None and semaphore.locked():
+                SUPERVISOR_HEDGES.inc(winner="skipped")
+                return await primary, False
+            if not self._try_acquire_hedge():
+                return await primary, False
+
+            hedge = asyncio.ensure_future(func())
+            if semaphore is not None:
+                # 잠겨 있지 않으므로 대기 없이 바로 획득, 헤지가 끝나거나 취소되면 반환
+                await semaphore.acquire()
+                hedge.add_done_callback(lambda _: semaphore.release())
+            tasks.add(hedge)
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        SUPERVISOR_HEDGES.inc(winner="hedge" if task is hedge else "primary")
+                        return task.result(), task is hedge
+                    error = task.exception()
+            SUPERVISOR_HEDGES.inc(winner="none")
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict:
+        p95 = self.latencies.quantile(self.hedge_quantile)
+        delay = self.hedge_delay()
+        return {
+            "attempt_timeout_ms": self.attempt_timeout * 1000 if self.attempt_timeout else None,
+            "total_budget_ms": self.total_budget * 1000 if self.total_budget else None,
+            "hedge_enabled": self.hedge_enabled,
+            "hedge_delay_ms": round(delay * 1000, 2) if delay is not None else None,
+            "latency_quantile_ms": round(p95 * 1000, 2) if p95 is not None else None,
+            "latency_samples": len(self.latencies),
+            "calls": self._calls,
+            "hedges": self._hedges,
+            "timeouts": {
+                "attempt": int(SUPERVISOR_TIMEOUTS.value(kind="attempt")),
+                "budget": int(SUPERVISOR_TIMEOUTS.value(kind="budget")),
+                "queue": int(SUPERVISOR_TIMEOUTS.value(kind="queue"))
+            }
+        }
+
+
+_hedge_policy: Optional[HedgePolicy] = None
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """프로세스 공용 지연 제어 정책 반환 (환경변수 설정으로 최초 생성)"""
+    global _hedge_policy
+    if _hedge_policy is None:
+        _hedge_policy = HedgePolicy(
+            attempt_timeout_ms=float(os.getenv("SUPERVISOR_ATTEMPT_TIMEOUT_MS", "10000")),
+            total_budget_ms=float(os.getenv("SUPERVISOR_TOTAL_BUDGET_MS", "25000")),
+            hedge_enabled=os.getenv("SUPERVISOR_HEDGE_ENABLED", "false").lower() == "true",
+            hedge_quantile=float(os.getenv("SUPERVISOR_HEDGE_QUANTILE", "0.95")),
+            hedge_min_samples=int(os.getenv("SUPERVISOR_HEDGE_MIN_SAMPLES", "50")),
+            hedge_min_delay_ms=float(os.getenv("SUPERVISOR_HEDGE_MIN_DELAY_MS", "50")),
+            hedge_max_ratio=float(os.getenv("SUPERVISOR_HEDGE_MAX_RATIO", "0.1"))
+        )
+    return _hedge_policy
@@ -0,0 +1,395 @@
+"""
+라우팅 이력 저장소 모듈 (append-only JSONL 로그)
+
+한 줄에 한 레코드씩 추가만 하는 로그 형태로 이력을 저장합니다.
+- 활성 세그먼트가 일정 크기를 넘으면 번호가 붙은 세그먼트로 회전(rotation)
+- 보존 개수(retention)를 벗어난 오래된 세그먼트는 통째로 삭제(compaction)
+- 기존 JSON 배열 파일(routing_history.json)은 최초 사용 시 자동 마이그레이션
+"""
+import glob
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from .structured_logging import get_logger
+
+logger = get_logger("history")
+
+
+class JsonlHistoryStore:
+    """append-only JSONL 세그먼트 기반 이력 저장소"""
+
+    def __init__(
+        self,
+        path: str,
+        legacy_path: Optional[str] = None,
+        retention: int = 1000,
+        segment_max_bytes: int = 256 * 1024,
+    ):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.retention = retention
+        self.segment_max_bytes = segment_max_bytes
+
+        base, ext = os.path.splitext(path)
+        self._segment_prefix = base
+        self._segment_ext = ext or ".jsonl"
+        self._segment_pattern = re.compile(
+            re.escape(os.path.basename(base)) + r"\.(\d{6})" + re.escape(self._segment_ext) + r"$"
+        )
+
+        # 회전된 세그먼트는 불변이므로 레코드 수를 캐시
+        self._segment_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._migrated = False
+
+    # ------------------------------------------------------------------
+    # 파일/세그먼트 헬퍼
+    # ------------------------------------------------------------------
+    def _lock_path(self) -> str:
+        return self.path + ".lock"
+
+    def _acquire_file_lock(self):
+        """프로세스 간 쓰기 직렬화를 위한 파일 락 (fcntl 사용 가능 시)"""
+        if not FCNTL_AVAILABLE:
+            return None
+        lock_file = open(self._lock_path(), "a")
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        return lock_file
+
+    @staticmethod
+    def _release_file_lock(lock_file):
+        if lock_file is None:
+            return
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            lock_file.close()
+
+    def _rotated_segments(self) -> List[str]:
+        """회전된 세그먼트 목록 (오래된 순)"""
+        directory = os.path.dirname(self.path) or "."
+        prefix = os.path.basename(self._segment_prefix)
+        candidates = glob.glob(os.path.join(directory, glob.escape(prefix) + ".*" + self._segment_ext))
+
+        segments = []
+        for candidate in candidates:
+            match = self._segment_pattern.search(os.path.basename(candidate))
+            if match:
+                segments.append((int(match.group(1)), candidate))
+        segments.sort()
+        return [path for _, path in segments]
+
+    def _all_segments(self) -> List[str]:
+        """회전된 세그먼트 + 활성 세그먼트 (오래된 순)"""
+        segments = self._rotated_segments()
+        if os.path.exists(self.path):
+            segments.append(self.path)
+        return segments
+
+    def exists(self) -> bool:
+        """기록된 세그먼트가 있는지 (파일을 만들지 않음)"""
+        return bool(self._all_segments())
+
+    def _segment_index(self, segment: str) -> int:
+        """세그먼트 번호 (활성 세그먼트는 회전 시 받게 될 다음 번호)"""
+        match = self._segment_pattern.search(os.path.basename(segment))
+        if match:
+            return int(match.group(1))
+        segments = self._rotated_segments()
+        return (self._segment_index(segments[-1]) if segments else 0) + 1
+
+    def _next_segment_path(self) -> str:
+        segments = self._rotated_segments()
+        last_index = self._segment_index(segments[-1]) if segments else 0
+        return f"{self._segment_prefix}.{last_index + 1:06d}{self._segment_ext}"
+
+    @staticmethod
+    def _read_segment_lines(path: str) -> List[Tuple[int, Dict]]:
+        """(원본 줄 번호, 레코드) 목록 - 빈 줄/깨진 줄은 건너뛰어도 뒤쪽 줄 번호는 그대로 유지"""
+        records = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line_index, line in enumerate(f):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append((line_index, json.loads(line)))
+                    except json.JSONDecodeError:
+                        # 비정상 종료로 잘린 줄은 건너뜀
+                        continue
+        except FileNotFoundError:
+            pass
+        return records
+
+    @classmethod
+    def _read_segment(cls, path: str) -> List[Dict]:
+        return [record for _, record in cls._read_segment_lines(path)]
+
+    @staticmethod
+    def _count_lines(path: str) -> int:
+        try:
+            with open(path, "rb") as f:
+                return sum(1 for line in f if line.strip())
+        except FileNotFoundError:
+            return 0
+
+    # ------------------------------------------------------------------
+    # 마이그레이션
+    # ------------------------------------------------------------------
+    def migrate_legacy(self) -> int:
+        """
+        기존 JSON 배열 이력 파일을 JSONL 로그로 변환
+        로그가 이미 존재하면 아무것도 하지 않으며, 변환된 레코드 수를 반환
+        """
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return 0
+        if self._all_segments():
+            return 0
+
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                legacy_history = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            logger.warning("⚠️ 기존 이력 파일을 읽을 수 없어 마이그레이션을 건너뜁니다.", legacy_path=self.legacy_path)
+            return 0
+
+        if not isinstance(legacy_history, list):
+            return 0
+
+        legacy_history = legacy_history[-self.retention:]
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in legacy_history:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        os.replace(self.legacy_path, self.legacy_path + ".migrated")
+
+        logger.info("✅ 기존 이력을 JSONL 로그로 마이그레이션했습니다.", records=len(legacy_history), path=self.path)
+        return len(legacy_history)
+
+    def _ensure_migrated(self):
+        if self._migrated:
+            return
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            # 기존 파일이 없으면 락 파일도 만들지 않음
+            self._migrated = True
+            return
+        lock_file = self._acquire_file_lock()
+        try:
+            self.migrate_legacy()
+        finally:
+            self._release_file_lock(lock_file)
+        self._migrated = True
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    def load(self) -> List[Dict]:
+        """보존 범위 내 전체 이력 로드 (오래된 순)"""
+        with self._lock:
+            self._ensure_migrated()
+            records = []
+            for segment in self._all_segments():
+                records.extend(self._read_segment(segment))
+        return records[-self.retention:]
+
+    def append(self, record: Dict) -> None:
+        """레코드 한 줄 추가 (필요 시 세그먼트 회전 및 compaction)"""
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict]) -> None:
+        """여러 레코드를 한 번의 쓰기로 추가 (배치 group commit)"""
+        if not records:
+            return
+        payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+        with self._lock:
+            self._ensure_migrated()
+            lock_file = self._acquire_file_lock()
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(payload)
+                    f.flush()
+                    size = f.tell()
+
+                if size >= self.segment_max_bytes:
+                    self._rotate()
+                    self._compact()
+            finally:
+                self._release_file_lock(lock_file)
+
+    def count(self) -> int:
+        """보존 범위 내 레코드 수 (회전된 세그먼트는 캐시된 줄 수 사용)"""
+        with self._lock:
+            self._ensure_migrated()
+            total = 0
+            for segment in self._rotated_segments():
+                if segment not in self._segment_counts:
+                    self._segment_counts[segment] = self._count_lines(segment)
+                total += self._segment_counts[segment]
+            total += self._count_lines(self.path)
+        return min(total, self.retention)
+
+    def page(
+        self,
+        limit: int,
+        before: Optional[Tuple[int, int]] = None,
+        after: Optional[Tuple[int, int]] = None,
+        record_filter=None,
+        since: Optional[str] = None,
+    ) -> Tuple[List[Tuple[Tuple[int, int], Dict]], bool]:
+        """
+        커서 기반 페이지 조회 (최신 순)
+        - 위치는 (세그먼트 번호, 원본 줄 번호) - 회전하거나 깨진 줄을 건너뛰어도 바뀌지 않음
+        - before: 이 위치보다 오래된 레코드 / after: 이 위치보다 새로운 레코드 중 가장 오래된 limit개
+        - record_filter: 레코드 조건 함수, since: 이보다 오래된 timestamp를 만나면 탐색 중단
+        뒤쪽 세그먼트부터 필요한 만큼만 읽으며, ([(위치, 레코드)], 더 오래된 레코드 존재 여부) 반환
+        """
+        if limit <= 0:
+            return [], False
+        matched: List[Tuple[Tuple[int, int], Dict]] = []
+        has_more = False
+        with self._lock:
+            self._ensure_migrated()
+            for segment in reversed(self._all_segments()):
+                segment_index = self._segment_index(segment)
+                if before is not None and segment_index > before[0]:
+                    continue
+                if after is not None and segment_index < after[0]:
+                    break
+                for line_index, record in reversed(self._read_segment_lines(segment)):
+                    position = (segment_index, line_index)
+                    if before is not None and position >= before:
+                        continue
+                    if after is not None and position <= after:
+                        break
+                    if since is not None and record.get("timestamp", "") < since:
+                        break
+                    if record_filter is not None and not record_filter(record):
+                        continue
+                    if after is None and len(matched) >= limit:
+                        has_more = True
+                        break
+                    matched.append((position, record))
+                else:
+                    continue
+                break
+        if after is not None:
+            # after 방향: 커서 바로 다음의 limit개 (나머지는 다음 폴링에서)
+            has_more = len(matched) > limit
+            matched = matched[-limit:]
+        return matched, has_more
+
+    @staticmethod
+    def encode_cursor(position: Tuple[int, int]) -> str:
+        return f"{position[0]}.{position[1]}"
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[int, int]:
+        try:
+            segment_index, line_index = cursor.split(".")
+            return int(segment_index), int(line_index)
+        except ValueError:
+            raise ValueError(f"잘못된 커서: {cursor}")
+
+    def query(
+        self,
+        limit: int,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        agent: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        partition: Optional[str] = None,
+    ) -> Dict:
+        """필터 + 커서 페이지 조회 (history는 최신 순, 각 레코드에 cursor 포함)"""
+        def record_filter(record: Dict) -> bool:
+            if agent is not None and record.get("selected_agent") != agent:
+                return False
+            if until is not None and record.get("timestamp", "") >= until:
+                return False
+            if partition is not None and record.get("partition") != partition:
+                return False
+            return True
+
+        matched, has_more = self.page(
+            limit,
+            before=self.decode_cursor(before) if before else None,
+            after=self.decode_cursor(after) if after else None,
+            record_filter=record_filter,
+            since=since,
+        )
+        history = [{**record, "cursor": self.encode_cursor(position)} for position, record in matched]
+        return {
+            "history": history,
+            "next_cursor": history[-1]["cursor"] if history else before,
+            "prev_cursor": history[0]["cursor"] if history else after,
+            "has_more": has_more,
+        }
+
+    def compact(self) -> int:
+        """보존 범위를 벗어난 세그먼트 삭제, 삭제한 세그먼트 수 반환"""
+        with self._lock:
+            lock_file = self._acquire_file_lock()
+            try:
+                return self._compact()
+            finally:
+                self._release_file_lock(lock_file)
+
+    def clear(self) -> bool:
+        """모든 세그먼트 삭제, 삭제할 이력이 있었는지 여부 반환"""
+        with self._lock:
+            lock_file = self._acquire_file_lock()
+            try:
+                segments = self._all_segments()
+                for segment in segments:
+                    os.remove(segment)
+                self._segment_counts.clear()
+
+                legacy_existed = bool(self.legacy_path and os.path.exists(self.legacy_path))
+                if legacy_existed:
+                    os.remove(self.legacy_path)
+                return bool(segments) or legacy_existed
+            finally:
+                self._release_file_lock(lock_file)
+
+    # ------------------------------------------------------------------
+    # 내부 구현 (락을 잡은 상태에서 호출)
+    # ------------------------------------------------------------------
+    def _rotate(self):
+        if not os.path.exists(self.path):
+            return
+        rotated_path = self._next_segment_path()
+        os.replace(self.path, rotated_path)
+        self._segment_counts[rotated_path] = self._count_lines(rotated_path)
+
+    def _compact(self) -> int:
+        segments = self._rotated_segments()
+        counts = []
+        for segment in segments:
+            if segment not in self._segment_counts:
+                self._segment_counts[segment] = self._count_lines(segment)
+            counts.append(self._segment_counts[segment])
+
+        total = sum(counts) + self._count_lines(self.path)
+        removed = 0
+        # 가장 오래된 세그먼트를 지워도 보존 개수가 유지되면 삭제
+        # (세그먼트 번호가 커서로 쓰이므로 번호가 되돌아가지 않도록 마지막 회전 세그먼트는 유지)
+        for segment, count in zip(segments[:-1], counts):
+            if total - count < self.retention:
+                break
+            os.remove(segment)
+            self._segment_counts.pop(segment, None)
+            total -= count
+            removed += 1
+        return removed
@@ -0,0 +1,153 @@
+"""
+LLM 없는 로컬 라우터 모듈 (fast path)
+
+종목이 분명한 질문("축구 하고 싶어", "테니스 레슨")은 키워드 가중치 분류기로 판별하고,
+가중치를 적용(apply_weights_and_normalize)한 분포에서 바로 에이전트를 샘플링합니다.
+확신도가 임계값보다 낮은 애매한 질문("운동하고 싶어")만 Gemini 슈퍼바이저로 넘깁니다.
+
+환경변수:
+- LOCAL_ROUTER_ENABLED: true/false (기본 false)
+- LOCAL_ROUTER_THRESHOLD: 로컬 처리 확신도 임계값 (기본 0.8, 높을수록 Gemini로 더 많이 넘김)
+"""
+import os
+import random
+import re
+from typing import Dict, Optional, Tuple
+
+from .utils import AgentSelection
+from .metrics import REGISTRY
+from .weights import apply_weights_and_normalize
+
+
+# 에이전트별 키워드 가중치 (종목명 자체는 강한 신호, 기술/용어는 약한 신호)
+AGENT_KEYWORDS: Dict[str, Dict[str, float]] = {
+    "축구_에이전트": {
+        "축구": 3.0, "풋살": 3.0, "킥볼": 3.0, "프리킥": 2.0, "드리블": 2.0,
+        "월드컵": 2.0, "골키퍼": 2.0, "킥": 1.5, "골": 1.0
+    },
+    "농구_에이전트": {
+        "농구": 3.0, "덩크": 2.5, "리바운드": 2.0, "자유투": 2.0, "레이업": 2.0,
+        "3대3": 2.0, "3x3": 2.0, "nba": 2.0, "3점": 1.5, "슛": 1.0
+    },
+    "야구_에이전트": {
+        "야구": 3.0, "소프트볼": 3.0, "캐치볼": 2.5, "홈런": 2.5, "배팅": 2.0,
+        "타격": 2.0, "투수": 2.0, "kbo": 2.0, "글러브": 1.0
+    },
+    "테니스_에이전트": {
+        "테니스": 3.0, "배드민턴": 3.0, "스쿼시": 3.0, "탁구": 2.0, "라켓": 2.0,
+        "윔블던": 2.0, "서브": 1.0, "발리": 1.0
+    }
+}
+
+# 키워드가 하나뿐일 때 확신도를 낮추는 사전 질량
+PRIOR_MASS = 0.5
+
+LOCAL_ROUTER_DECISIONS = REGISTRY.counter(
+    "sports_agent_local_router_decisions_total", "로컬 라우터 판정 결과 (outcome: local, escalated)"
+)
+
+
+def classify_query(user_query: str) -> Tuple[Dict[str, float], float]:
+    """
+    키워드 가중치로 질문 분류
+    반환: (에이전트별 확률, 확신도) - 키워드가 없으면 ({}, 0.0)
+    """
+    query = re.sub(r"\s+", "", user_query.lower())
+    scores = {}
+    for agent, keywords in AGENT_KEYWORDS.items():
+        score = sum(weight for keyword, weight in keywords.items() if keyword in query)
+        if score > 0:
+            scores[agent] = score
+
+    if not scores:
+        return {}, 0.0
+
+    total = sum(scores.values())
+    probabilities = {agent: score / total for agent, score in scores.items()}
+    confidence = max(scores.values()) / (total + PRIOR_MASS)
+    return probabilities, confidence
+
+
+def sample_agent(ratios: Dict[str, float], rng: Optional[random.Random] = None) -> str:
+    """비율 분포에서 에이전트 샘플링 (분포가 비어 있으면 축구_에이전트)"""
+    agents = [agent for agent, ratio in ratios.items() if ratio > 0]
+    if not agents:
+        return "축구_에이전트"
+    rng = rng or random
+    return rng.choices(agents, weights=[ratios[agent] for agent in agents], k=1)[0]
+
+
+class LocalRouter:
+    """키워드 분류 + 가중치 샘플링 라우터"""
+
+    def __init__(self, enabled: bool = False, threshold: float = 0.8, seed: Optional[int] = None):
+        self.enabled = enabled
+        self.threshold = threshold
+        self._random = random.Random(seed)
+
+    def route(self, user_query: str, agent_weights: Dict[str, float]) -> Optional[AgentSelection]:
+        """확신도가 임계값 이상이면 AgentSelection, 아니면 None (Gemini로 escalate)"""
+        probabilities, confidence = classify_query(user_query)
+        if confidence < self.threshold:
+            LOCAL_ROUTER_DECISIONS.inc(outcome="escalated")
+            return None
+
+        weighted = apply_weights_and_normalize(probabilities, agent_weights)
+        selected_agent = sample_agent(weighted, self._random)
+        LOCAL_ROUTER_DECISIONS.inc(outcome="local")
+        return AgentSelection(
+            selected_agent=selected_agent,
+            reason=f"[local] 종목 키워드 분류 (확신도 {confidence:.2f})",
+            confidence=round(min(confidence, 1.0), 2)
+        )
+
+    def route_without_model(
+        self,
+        user_query: str,
+        normalized_ratios: Dict[str, float],
+        agent_weights: Dict[str, float],
+        reason: str
+    ) -> AgentSelection:
+        """
+        Gemini를 쓸 수 없을 때 항상 결정 (활성화 여부와 무관)
+        종목이 분명하면 키워드 분류, 아니면 가중치가 반영된 라우팅 비율에서 샘플링
+        """
+        probabilities, confidence = classify_query(user_query)
+        if confidence >= self.threshold:
+            selected_agent = sample_agent(apply_weights_and_normalize(probabilities, agent_weights), self._random)
+            detail = f"키워드 분류 (확신도 {confidence:.2f})"
+        else:
+            selected_agent = sample_agent(normalized_ratios, self._random)
+            confidence = normalized_ratios.get(selected_agent, 0.0)
+            detail = "라우팅 비율 샘플링"
+        return AgentSelection(
+            selected_agent=selected_agent,
+            reason=f"[{reason}] {detail}",
+            confidence=round(min(confidence, 1.0), 2)
+        )
+
+    def get_stats(self) -> Dict:
+        local = LOCAL_ROUTER_DECISIONS.value(outcome="local")
+        escalated = LOCAL_ROUTER_DECISIONS.value(outcome="escalated")
+        total = local + escalated
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "local": int(local),
+            "escalated": int(escalated),
+            "llm_skip_ratio": round(local / total, 4) if total else 0.0
+        }
+
+
+_local_router: Optional[LocalRouter] = None
+
+
+def get_local_router() -> LocalRouter:
+    """프로세스 공용 로컬 라우터 반환 (환경변수 설정으로 최초 생성)"""
+    global _local_router
+    if _local_router is None:
+        _local_router = LocalRouter(
+            enabled=os.getenv("LOCAL_ROUTER_ENABLED", "false").lower() == "true",
+            threshold=float(os.getenv("LOCAL_ROUTER_THRESHOLD", "0.8")),
+        )
+    return _local_router
@@ -0,0 +1,218 @@
+"""
+경량 메트릭 모듈 (Prometheus 텍스트 포맷)
+
+외부 의존성 없이 카운터/히스토그램/게이지를 메모리에 유지하고
+/metrics 엔드포인트에서 Prometheus exposition 포맷으로 출력합니다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    items = list(key) + list((extra or {}).items())
+    if not items:
+        return ""
+    escaped = [
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in items
+    ]
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (단위: 초)"""
+
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._series[key] = series
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """블록 실행 시간 측정"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, {'le': _format_value(bound)})} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, {'le': '+Inf'})} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class CallbackGauge:
+    """출력 시점에 콜백으로 값을 읽는 게이지 ({라벨 튜플: 값} 또는 단일 값 반환)"""
+
+    def __init__(self, name: str, documentation: str, callback: Callable, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.label_names = label_names
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        try:
+            values = self.callback()
+        except Exception:
+            return lines
+        if not isinstance(values, dict):
+            values = {(): values}
+        for label_values, value in values.items():
+            if not isinstance(label_values, tuple):
+                label_values = (label_values,)
+            key = tuple(zip(self.label_names, (str(v) for v in label_values)))
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 레지스트리 (이름 기준 중복 등록 시 기존 메트릭 반환)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, factory: Callable):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._register(name, lambda: Counter(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, documentation, buckets))
+
+    def gauge_callback(self, name: str, documentation: str, callback: Callable, label_names: Tuple[str, ...] = ()) -> CallbackGauge:
+        with self._lock:
+            gauge = CallbackGauge(name, documentation, callback, label_names)
+            self._metrics[name] = gauge
+            return gauge
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 공용 레지스트리
+REGISTRY = MetricsRegistry()
+
+# 그래프/슈퍼바이저 계측
+GRAPH_NODE_DURATION = REGISTRY.histogram(
+    "sports_agent_graph_node_duration_seconds", "그래프 노드별 실행 시간"
+)
+WORKFLOW_DURATION = REGISTRY.histogram(
+    "sports_agent_workflow_duration_seconds", "워크플로우 전체 실행 시간"
+)
+SUPERVISOR_ATTEMPT_DURATION = REGISTRY.histogram(
+    "sports_agent_supervisor_attempt_duration_seconds", "Gemini 호출 시도별 소요 시간 (outcome 라벨)"
+)
+SUPERVISOR_QUEUE_WAIT = REGISTRY.histogram(
+    "sports_agent_supervisor_queue_wait_seconds", "Gemini 동시 호출 제한 대기 시간"
+)
+PROMPT_BUILD_DURATION = REGISTRY.histogram(
+    "sports_agent_prompt_build_duration_seconds", "슈퍼바이저 프롬프트 생성 시간"
+)
+HISTORY_LOAD_DURATION = REGISTRY.histogram(
+    "sports_agent_history_load_duration_seconds", "라우팅 이력 로드 시간"
+)
+HISTORY_SAVE_DURATION = REGISTRY.histogram(
+    "sports_agent_history_save_duration_seconds", "라우팅 이력 저장 시간"
+)
+SUPERVISOR_RETRIES = REGISTRY.counter(
+    "sports_agent_supervisor_retries_total", "Gemini 호출 재시도 횟수"
+)
+SUPERVISOR_FALLBACKS = REGISTRY.counter(
+    "sports_agent_supervisor_fallbacks_total", "축구_에이전트 폴백 횟수 (reason 라벨)"
+)
+AGENT_SELECTIONS = REGISTRY.counter(
+    "sports_agent_selections_total", "에이전트별 선택 횟수"
+)
+
+
+def instrument_node(name: str, node_func: Callable) -> Callable:
+    """비동기 그래프 노드 실행 시간을 기록하는 래퍼"""
+    async def wrapper(state):
+        with GRAPH_NODE_DURATION.time(node=name):
+            return await node_func(state)
+
+    wrapper.__name__ = getattr(node_func, "__name__", name)
+    wrapper.__doc__ = node_func.__doc__
+    return wrapper
+
+
+def render_metrics() -> str:
+    """Prometheus 텍스트 포맷 출력"""
+    return REGISTRY.render()
@@ -2,13 +2,35 @@
 노드 정의 모듈 (운동 추천 에이전트 버전)
 """
 import asyncio
-from typing import Dict, Any, Annotated
+import os
+import time
+from typing import Dict, Any, Annotated, Callable, List, Optional
 from typing_extensions import TypedDict
 from langgraph.graph.message import add_messages
 from .agents import soccer_agent, basketball_agent, baseball_agent, tennis_agent
-from .weights import get_routing_data_with_history, get_default_agent_weights, apply_weights_and_normalize, save_routing_choice
-from .prompts import generate_supervisor_prompt
-from .utils import initialize_gemini_model, AgentSelection
+from .weights import build_routing_context, save_routing_choice, apply_weights_and_normalize
+from .prompts import build_supervisor_prompt, resolve_prompt_mode
+from .utils import get_structured_supervisor_model, AgentSelection
+from .decision_cache import get_decision_cache
+from .semantic_cache import get_semantic_cache
+from .local_router import get_local_router, sample_agent, classify_query
+from .single_flight import get_single_flight
+from .hedging import get_hedge_policy, SUPERVISOR_TIMEOUTS
+from .circuit_breaker import get_circuit_breaker
+from .structured_logging import get_logger
+from .metrics import (
+    PROMPT_BUILD_DURATION,
+    SUPERVISOR_ATTEMPT_DURATION,
+    SUPERVISOR_QUEUE_WAIT,
+    SUPERVISOR_RETRIES,
+    SUPERVISOR_FALLBACKS,
+    AGENT_SELECTIONS
+)
+
+
+logger = get_logger("supervisor")
+prompt_logger = get_logger("prompt")
+agent_logger = get_logger("agent")
 
 
 class AgentState(TypedDict):
@@ -18,6 +40,272 @@ class AgentState(TypedDict):
     selected_agent: str
     agent_response: Dict[str, Any]
     routing_info: Dict[str, Any]
+    partition_key: Optional[str]
+    prompt_mode: Optional[str]
+
+
+# 프로세스당 동시 Gemini 호출 상한
+SUPERVISOR_MAX_CONCURRENCY = int(os.getenv("SUPERVISOR_MAX_CONCURRENCY", "64"))
+
+# (이벤트 루프, 세마포어) - 루프가 바뀌면 새로 생성
+_supervisor_limiter = None
+
+
+def get_supervisor_semaphore() -> asyncio.Semaphore:
+    """현재 이벤트 루프용 Gemini 동시 호출 제한 세마포어 반환"""
+    global _supervisor_limiter
+    loop = asyncio.get_running_loop()
+    if _supervisor_limiter is None or _supervisor_limiter[0] is not loop:
+        _supervisor_limiter = (loop, asyncio.Semaphore(SUPERVISOR_MAX_CONCURRENCY))
+    return _supervisor_limiter[1]
+
+
+async def select_agent_with_model(
+    supervisor_prompt: str,
+    circuit_open_selection: Optional[Callable[[], AgentSelection]] = None
+) -> Dict[str, Any]:
+    """
+    Gemini 호출로 에이전트 선택 (최대 3회 시도, 모두 실패하거나 전체 예산 초과 시 축구_에이전트 폴백)
+    동시 호출 슬롯은 남은 전체 예산까지만 기다리고, 슬롯을 잡은 뒤부터 시도별 마감 시간을 적용
+    설정 시 p95를 넘긴 호출에는 헤지 요청을 보냄
+    실패 후 재시도는 지터가 있는 지수 백오프 뒤에 하며, 서킷 브레이커가 열려 있으면 Gemini를 호출하지 않고
+    circuit_open_selection(로컬 라우터) 결과 사용
+    반환: agent_selection, attempts, fallback 여부, 대기/모델 지연(ms), 헤지 승리 여부, 브레이커 차단 여부
+    """
+    # 캐시된 ChatVertexAI 구조화 출력 모델 재사용
+    structured_model = get_structured_supervisor_model()
+    
+    # 최대 3번 시도
+    max_attempts = 3
+    agent_selection = None
+    fallback = False
+    semaphore = get_supervisor_semaphore()
+    queue_wait_ms = 0.0
+    model_latency_ms = 0.0
+    hedged = False
+    circuit_open = False
+    policy = get_hedge_policy()
+    breaker = get_circuit_breaker()
+    budget_started_at = time.perf_counter()
+    
+    call_started_at = None
+    
+    def observe_attempt(outcome: str) -> Optional[float]:
+        """진행 중인 모델 호출의 지연 기록 (outcome: success, error, timeout, cancelled)"""
+        nonlocal call_started_at, model_latency_ms
+        if call_started_at is None:
+            return None
+        elapsed = time.perf_counter() - call_started_at
+        call_started_at = None
+        model_latency_ms += elapsed * 1000
+        SUPERVISOR_ATTEMPT_DURATION.observe(elapsed, outcome=outcome)
+        return elapsed
+    
+    async def attempt_call():
+        """(헤지 포함) 한 번 호출하고 모델 지연 측정 (동시 호출 슬롯은 호출한 쪽이 잡고 있어야 함)"""
+        nonlocal call_started_at
+        call_started_at = time.perf_counter()
+        try:
+            result = await policy.call(lambda: structured_model.ainvoke(supervisor_prompt), semaphore)
+        except asyncio.CancelledError:
+            # 마감 초과(timeout)인지 바깥 취소(cancelled)인지는 호출한 쪽에서 구분해 기록
+            raise
+        except Exception:
+            observe_attempt("error")
+            raise
+        policy.latencies.observe(observe_attempt("success"))
+        return result
+    
+    def remaining_budget() -> Optional[float]:
+        """남은 전체 예산(초), 예산이 없으면 None"""
+        if policy.total_budget is None:
+            return None
+        return policy.total_budget - (time.perf_counter() - budget_started_at)
+    
+    def budget_exhausted_selection(attempts: int) -> AgentSelection:
+        logger.error("💥 Gemini 전체 예산 초과. 축구_에이전트로 폴백합니다.", attempts=attempts)
+        SUPERVISOR_FALLBACKS.inc(reason="budget_exhausted")
+        return AgentSelection(
+            selected_agent="축구_에이전트",
+            reason="전체 지연 예산 초과로 인한 기본 선택",
+            confidence=0.5
+        )
+    
+    for attempt in range(1, max_attempts + 1):
+        logger.debug("🤖 Gemini 시도", attempt=attempt, max_attempts=max_attempts)
+        
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            SUPERVISOR_TIMEOUTS.inc(kind="budget")
+            agent_selection = budget_exhausted_selection(attempt - 1)
+            fallback = True
+            attempt -= 1
+            break
+        
+        # 브레이커가 열려 있으면 Gemini 호출 없이 로컬 라우터로 결정
+        if not breaker.allow_request():
+            # 차단 횟수는 CIRCUIT_REJECTIONS로 집계 (로컬 라우터 결정은 축구_에이전트 폴백이 아님)
+            logger.warning("🔌 서킷 브레이커 열림. Gemini 없이 로컬 라우터로 결정합니다.", attempts=attempt - 1)
+            if circuit_open_selection is not None:
+                agent_selection = circuit_open_selection()
+            else:
+                SUPERVISOR_FALLBACKS.inc(reason="circuit_open")
+                agent_selection = AgentSelection(
+                    selected_agent="축구_에이전트",
+                    reason="서킷 브레이커 열림으로 인한 기본 선택",
+                    confidence=0.5
+                )
+            fallback = True
+            circuit_open = True
+            attempt -= 1
+            break
+        
+        # 동시 호출 슬롯 대기 (남은 전체 예산까지만 기다리고, 시도별 마감 시간에는 포함하지 않음)
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), remaining)
+            acquired = True
+        except asyncio.TimeoutError:
+            acquired = False
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        waited = time.perf_counter() - queued_at
+        queue_wait_ms += waited * 1000
+        SUPERVISOR_QUEUE_WAIT.observe(waited)
+        if not acquired:
+            # 로컬 대기열에서 예산을 다 쓴 것이므로 브레이커 실패로 세지 않음
+            breaker.release()
+            SUPERVISOR_TIMEOUTS.inc(kind="queue")
+            agent_selection = budget_exhausted_selection(attempt - 1)
+            fallback = True
+            attempt -= 1
+            break
+        
+        # 시도별 마감 시간은 슬롯을 잡은 뒤부터 (남은 전체 예산 중 짧은 쪽)
+        timeout = policy.attempt_timeout
+        remaining = remaining_budget()
+        budget_capped = remaining is not None and (timeout is None or remaining < timeout)
+        if budget_capped:
+            timeout = remaining
+        
+        error = None
+        try:
+            agent_selection, hedged = await asyncio.wait_for(attempt_call(), timeout)
+        except asyncio.TimeoutError:
+            observe_attempt("timeout")
+            if budget_capped:
+                # 시도 마감 전에 전체 예산이 먼저 끝남 (상류 실패가 아니므로 브레이커에 반영하지 않음)
+                breaker.release()
+                SUPERVISOR_TIMEOUTS.inc(kind="budget")
+                agent_selection = budget_exhausted_selection(attempt)
+                fallback = True
+                break
+            SUPERVISOR_TIMEOUTS.inc(kind="attempt")
+            error = TimeoutError(f"Gemini 호출이 {timeout * 1000:.0f}ms 안에 끝나지 않았습니다")
+        except asyncio.CancelledError:
+            observe_attempt("cancelled")
+            breaker.release()
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            semaphore.release()
+        
+        if error is None:
+            breaker.record_success()
+            logger.debug(
+                "📝 Gemini 구조화된 응답",
+                attempt=attempt,
+                selected_agent=agent_selection.selected_agent,
+                reason=agent_selection.reason,
+                confidence=agent_selection.confidence
+            )
+            break
+        
+        # 상류 호출이 실패했거나 시도 마감을 넘긴 경우만 브레이커 실패로 기록
+        breaker.record_failure()
+        logger.warning("❌ Gemini 시도 실패", attempt=attempt, max_attempts=max_attempts, error=str(error))
+        if attempt == max_attempts:
+            logger.error("💥 모든 시도 실패. 축구_에이전트로 폴백합니다.", attempts=attempt)
+            SUPERVISOR_FALLBACKS.inc(reason="attempts_exhausted")
+            # 폴백용 AgentSelection 객체 생성
+            agent_selection = AgentSelection(
+                selected_agent="축구_에이전트",
+                reason="모든 시도 실패로 인한 기본 선택",
+                confidence=0.5
+            )
+            fallback = True
+            break
+        
+        SUPERVISOR_RETRIES.inc()
+        # 지터가 있는 지수 백오프 (남은 예산을 넘지 않도록, 대기 중에는 슬롯을 잡지 않음)
+        delay = breaker.retry_delay(attempt)
+        if policy.total_budget is not None:
+            delay = min(delay, max(0.0, remaining_budget()))
+        await asyncio.sleep(delay)
+    
+    return {
+        "agent_selection": agent_selection,
+        "attempts": attempt,
+        "max_attempts": max_attempts,
+        "fallback": fallback,
+        "queue_wait_ms": queue_wait_ms,
+        "model_latency_ms": model_latency_ms,
+        "hedged": hedged,
+        "circuit_open": circuit_open
+    }
+
+
+def coalesced_decision(
+    leader_decision: Dict[str, Any],
+    single_flight,
+    user_query: str,
+    agent_weights: Dict[str, float],
+    cached_samples: List[AgentSelection],
+    circuit_open_selection: Callable[[], AgentSelection],
+    waited_ms: float
+) -> Dict[str, Any]:
+    """
+    리더 결정으로 팔로워 결정 생성
+    - share: 리더 결정을 그대로 사용
+    - sample: 리더 결정이 나온 분포에서 샘플링
+      (같은 키의 결정 캐시 표본 → 가중치를 적용한 키워드 분류 확률 → 리더 결정 순)
+      브레이커가 열려 리더가 로컬 라우터로 결정했다면 팔로워도 로컬 라우터로 각자 결정
+    """
+    leader_selection = leader_decision["agent_selection"]
+    agent_selection = leader_selection
+    if single_flight.mode == "sample":
+        if leader_decision.get("circuit_open"):
+            agent_selection = circuit_open_selection()
+        elif len(cached_samples) > 1:
+            sampled = single_flight.random.choice(cached_samples)
+            agent_selection = AgentSelection(
+                selected_agent=sampled.selected_agent,
+                reason=f"[coalesced] 동시 요청 병합 - 결정 표본 샘플링 ({len(cached_samples)}개) {sampled.reason}",
+                confidence=sampled.confidence
+            )
+        else:
+            probabilities, _ = classify_query(user_query)
+            if probabilities:
+                agent_selection = AgentSelection(
+                    selected_agent=sample_agent(apply_weights_and_normalize(probabilities, agent_weights), single_flight.random),
+                    reason=f"[coalesced] 동시 요청 병합 - 키워드 분류 분포 샘플링 (리더 선택: {leader_selection.selected_agent})",
+                    confidence=leader_selection.confidence
+                )
+    
+    logger.debug("🔗 Gemini 호출 병합", mode=single_flight.mode, selected_agent=agent_selection.selected_agent)
+    return {
+        "agent_selection": agent_selection,
+        "attempts": 0,
+        "max_attempts": leader_decision["max_attempts"],
+        "fallback": leader_decision["fallback"],
+        "coalesced": True,
+        "hedged": leader_decision.get("hedged", False),
+        "circuit_open": leader_decision.get("circuit_open", False),
+        "queue_wait_ms": waited_ms,
+        "model_latency_ms": 0.0
+    }
 
 
 async def supervisor_node(state: AgentState) -> Dict[str, Any]:
@@ -25,76 +313,122 @@ async def supervisor_node(state: AgentState) -> Dict[str, Any]:
     슈퍼바이저 노드: Gemini를 통해 적절한 에이전트 선택 (Structured Output + 실제 이력)
     """
     try:
-        # 실제 과거 패턴 데이터 또는 mock 데이터 사용
-        base_ratios, total_traces = get_routing_data_with_history(state["user_query"])
-        
-        # 가중치 적용
-        agent_weights = get_default_agent_weights()
-        normalized_ratios = apply_weights_and_normalize(base_ratios, agent_weights)
-        
-        # 슈퍼바이저 프롬프트 생성
-        supervisor_prompt = generate_supervisor_prompt(
-            state["user_query"], 
-            normalized_ratios, 
-            total_traces
-        )
+        # 요청 단위 라우팅 컨텍스트 (이력 집계·가중치·비율을 한 번만 조회)
+        context = build_routing_context(state["user_query"], state.get("partition_key"))
+        normalized_ratios = context.normalized_ratios
+        total_traces = context.total_traces
+        agent_weights = context.agent_weights
+        prompt_mode = resolve_prompt_mode(state.get("prompt_mode"))
         
-        # 매번 프롬프트 출력
-        print(f"\n{'='*60}")
-        print("🔍 SUPERVISOR PROMPT")
-        print(f"{'='*60}")
-        print(supervisor_prompt)
-        print(f"{'='*60}")
+        # 종목이 분명한 질문은 LLM 없이 로컬 라우터로 처리
+        local_router = get_local_router()
+        cached_selection = None
+        cache_source = "local_router"
+        if local_router.enabled:
+            cached_selection = local_router.route(state["user_query"], agent_weights)
         
-        # ChatVertexAI 모델 초기화 및 구조화된 출력 설정
-        model = initialize_gemini_model()
-        structured_model = model.with_structured_output(AgentSelection)
+        # 결정 캐시 조회 (정규화 질문 + 양자화된 라우팅 상태)
+        decision_cache = get_decision_cache()
+        semantic_cache = get_semantic_cache()
+        cache_key = None
+        if cached_selection is None and decision_cache.enabled:
+            cache_key = decision_cache.make_key(state["user_query"], normalized_ratios, agent_weights) + (prompt_mode,)
+            cached_selection = decision_cache.get(cache_key)
+            cache_source = "cache"
         
-        # 최대 3번 시도
-        max_attempts = 3
-        agent_selection = None
+        # 정확히 일치하는 결정이 없으면 유사 질문의 결정 재사용
+        # (결정 캐시가 같은 키의 표본을 모으는 중이면 건너뜀 - 표본 수집을 시맨틱 캐시가 가로채지 않도록)
+        state_key = decision_cache.state_key(normalized_ratios, agent_weights) + (prompt_mode,)
+        if cached_selection is None and semantic_cache.enabled and not (
+            cache_key is not None and decision_cache.contains(cache_key)
+        ):
+            cached_selection = semantic_cache.lookup(state["user_query"], state_key)
+            cache_source = "semantic_cache"
         
-        for attempt in range(1, max_attempts + 1):
-            print(f"\n🤖 Gemini 시도 {attempt}/{max_attempts}")
-            
-            try:
-                # 비동기 처리를 위해 executor 사용
-                loop = asyncio.get_event_loop()
-                agent_selection = await loop.run_in_executor(
-                    None,
-                    lambda: structured_model.invoke(supervisor_prompt)
+        if cached_selection is not None:
+            logger.debug("⚡ Gemini 생략", source=cache_source, selected_agent=cached_selection.selected_agent)
+            decision = {
+                "agent_selection": cached_selection,
+                "attempts": 0,
+                "max_attempts": 0,
+                "fallback": False,
+                "queue_wait_ms": 0.0,
+                "model_latency_ms": 0.0
+            }
+            decision_source = cache_source
+        else:
+            def circuit_open_selection() -> AgentSelection:
+                return local_router.route_without_model(
+                    state["user_query"], normalized_ratios, agent_weights, "circuit_open"
                 )
+            
+            async def call_model() -> Dict[str, Any]:
+                # 슈퍼바이저 프롬프트 생성
+                with PROMPT_BUILD_DURATION.time():
+                    supervisor_prompt = build_supervisor_prompt(
+                        state["user_query"], 
+                        normalized_ratios, 
+                        total_traces,
+                        prompt_mode
+                    )
                 
-                print(f"\n📝 Gemini 구조화된 응답:")
-                print(f"   선택된 에이전트: {agent_selection.selected_agent}")
-                print(f"   선택 이유: {agent_selection.reason}")
-                print(f"   확신도: {agent_selection.confidence:.2f}")
+                # 프롬프트 전문 출력 (LOG_PROMPT=true일 때만)
+                prompt_logger.info(
+                    "🔍 SUPERVISOR PROMPT", user_query=state["user_query"], prompt_mode=prompt_mode, prompt=supervisor_prompt
+                )
                 
-                print(f"\n✅ 성공적으로 에이전트 선택: {agent_selection.selected_agent}")
-                break
+                model_decision = await select_agent_with_model(supervisor_prompt, circuit_open_selection)
                 
-            except Exception as e:
-                print(f"\n❌ 시도 {attempt} 실패: {e}")
-                if attempt == max_attempts:
-                    print(f"\n💥 모든 시도 실패. 축구_에이전트로 폴백합니다.")
-                    # 폴백용 AgentSelection 객체 생성
-                    agent_selection = AgentSelection(
-                        selected_agent="축구_에이전트",
-                        reason="모든 시도 실패로 인한 기본 선택",
-                        confidence=0.5
+                # 폴백이 아닌 실제 Gemini 결정만 캐시
+                if not model_decision["fallback"]:
+                    if cache_key is not None:
+                        decision_cache.put(cache_key, model_decision["agent_selection"])
+                    if semantic_cache.enabled:
+                        semantic_cache.insert(state["user_query"], state_key, model_decision["agent_selection"])
+                return model_decision
+            
+            # 같은 질문 + 같은 라우팅 상태로 진행 중인 Gemini 호출이 있으면 병합
+            single_flight = get_single_flight()
+            if single_flight.enabled:
+                flight_key = decision_cache.make_key(state["user_query"], normalized_ratios, agent_weights) + (prompt_mode,)
+                waited_at = time.perf_counter()
+                decision, is_leader = await single_flight.do(flight_key, call_model)
+                if not is_leader:
+                    decision = coalesced_decision(
+                        decision,
+                        single_flight,
+                        state["user_query"],
+                        agent_weights,
+                        decision_cache.samples(flight_key) if decision_cache.enabled else [],
+                        circuit_open_selection,
+                        (time.perf_counter() - waited_at) * 1000
                     )
-                    break
-                else:
-                    print(f"   🔄 {max_attempts - attempt}번 더 시도합니다...")
+            else:
+                decision = await call_model()
+            
+            # 브레이커가 열려 결정된 경우는 병합 여부와 관계없이 circuit_open으로 보고
+            if decision.get("circuit_open"):
+                decision_source = "circuit_open"
+            elif decision.get("coalesced"):
+                decision_source = "coalesced"
+            else:
+                decision_source = "fallback" if decision["fallback"] else "model"
+        
+        agent_selection = decision["agent_selection"]
+        attempt = decision["attempts"]
         
         # 🔄 선택 결과를 이력에 저장 (핵심!)
         save_routing_choice(
             user_query=state["user_query"],
             selected_agent=agent_selection.selected_agent,
             confidence=agent_selection.confidence,
-            reason=agent_selection.reason
+            reason=agent_selection.reason,
+            weights_version=context.weights_version,
+            partition_key=context.partition_key
         )
         
+        AGENT_SELECTIONS.inc(agent=agent_selection.selected_agent)
+        
         # 라우팅 정보
         routing_info = {
             "normalized_ratios": normalized_ratios,
@@ -105,16 +439,31 @@ async def supervisor_node(state: AgentState) -> Dict[str, Any]:
                 "confidence": agent_selection.confidence
             },
             "agent_weights": agent_weights,
+            "weights_version": context.weights_version,
+            "partition_key": context.partition_key,
+            "ratio_scope": context.ratio_scope,
+            "prompt_mode": prompt_mode,
             "attempts_made": attempt,
-            "using_real_history": total_traces >= 5  # 실제 이력 사용 여부
+            "decision_source": decision_source,
+            "timings": {
+                "queue_wait_ms": round(decision["queue_wait_ms"], 2),
+                "model_latency_ms": round(decision["model_latency_ms"], 2)
+            },
+            "hedged": decision.get("hedged", False),
+            "coalesced": decision.get("coalesced", False),
+            "using_real_history": context.using_real_history  # 실제 이력 사용 여부
         }
         
-        print(f"\n🎯 최종 선택된 에이전트: {agent_selection.selected_agent}")
-        print(f"   선택 이유: {agent_selection.reason}")
-        print(f"   확신도: {agent_selection.confidence:.2f}")
-        print(f"   시도 횟수: {attempt}/{max_attempts}")
-        print(f"   참고 데이터: {total_traces}회")
-        print(f"   🔄 선택 결과가 패턴에 반영됩니다!")
+        logger.info(
+            "🎯 최종 선택된 에이전트",
+            selected_agent=agent_selection.selected_agent,
+            reason=agent_selection.reason,
+            confidence=agent_selection.confidence,
+            attempts=attempt,
+            max_attempts=decision["max_attempts"],
+            decision_source=decision_source,
+            total_traces=total_traces
+        )
         
         return {
             "selected_agent": agent_selection.selected_agent,
@@ -122,7 +471,9 @@ async def supervisor_node(state: AgentState) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        print(f"❌ 슈퍼바이저 노드 치명적 오류: {e}")
+        logger.error("❌ 슈퍼바이저 노드 치명적 오류", error=str(e))
+        SUPERVISOR_FALLBACKS.inc(reason="supervisor_error")
+        AGENT_SELECTIONS.inc(agent="축구_에이전트")
         # 기본 에이전트로 폴백
         return {
             "selected_agent": "축구_에이전트",
@@ -141,7 +492,7 @@ async def soccer_node(state: AgentState) -> Dict[str, Any]:
         )
         return {"agent_response": response}
     except Exception as e:
-        print(f"❌ 축구 에이전트 오류: {e}")
+        agent_logger.error("❌ 축구 에이전트 오류", error=str(e))
         return {
             "agent_response": {
                 "agent": "축구_에이전트",
@@ -162,7 +513,7 @@ async def basketball_node(state: AgentState) -> Dict[str, Any]:
         )
         return {"agent_response": response}
     except Exception as e:
-        print(f"❌ 농구 에이전트 오류: {e}")
+        agent_logger.error("❌ 농구 에이전트 오류", error=str(e))
     return {
             "agent_response": {
                 "agent": "농구_에이전트",
@@ -183,7 +534,7 @@ async def baseball_node(state: AgentState) -> Dict[str, Any]:
         )
         return {"agent_response": response}
     except Exception as e:
-        print(f"❌ 야구 에이전트 오류: {e}")
+        agent_logger.error("❌ 야구 에이전트 오류", error=str(e))
     return {
             "agent_response": {
                 "agent": "야구_에이전트",
@@ -204,7 +555,7 @@ async def tennis_node(state: AgentState) -> Dict[str, Any]:
         )
         return {"agent_response": response}
     except Exception as e:
-        print(f"❌ 테니스 에이전트 오류: {e}")
+        agent_logger.error("❌ 테니스 에이전트 오류", error=str(e))
     return {
             "agent_response": {
                 "agent": "테니스_에이전트",
@@ -0,0 +1,178 @@
+"""
+파티션별 라우팅 이력/집계 모듈
+
+사용자·테넌트·질문 클러스터 등 파티션 키별로 이력을 별도 JSONL 세그먼트 파일에 기록하고,
+파티션별 집계(RoutingCounters)를 메모리에 LRU로 유지합니다.
+- 파티션 키 → 파일 경로가 결정적으로 매핑되므로 파티션 조회 시 전체 이력을 스캔하지 않음
+- 최근에 사용되지 않은 파티션 집계는 메모리에서 제거, 다시 필요하면 해당 파티션 파일만 읽어 재구성
+- 파일 추가와 집계 반영은 같은 락 안에서 수행하므로 재구성과 경합해도 이중 집계되지 않음
+"""
+import hashlib
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from .counters import RoutingCounters
+from .history_store import JsonlHistoryStore
+
+
+def partition_file_name(partition_key: str) -> str:
+    """파티션 키 → 파일 이름 (읽기 쉬운 접두어 + 충돌 방지 해시)"""
+    readable = re.sub(r"[^0-9A-Za-z_-]", "_", partition_key)[:40]
+    digest = hashlib.sha1(partition_key.encode("utf-8")).hexdigest()[:12]
+    return f"{readable}-{digest}.jsonl"
+
+
+class PartitionedRoutingHistory:
+    """파티션별 이력 저장소 + LRU 집계 캐시"""
+
+    def __init__(
+        self,
+        base_dir: str,
+        counters_factory: Callable[[int], RoutingCounters],
+        retention: int = 1000,
+        max_loaded: int = 256,
+        segment_max_bytes: int = 256 * 1024,
+    ):
+        self.base_dir = base_dir
+        self.counters_factory = counters_factory
+        self.retention = retention
+        self.max_loaded = max_loaded
+        self.segment_max_bytes = segment_max_bytes
+
+        self._counters: "OrderedDict[str, RoutingCounters]" = OrderedDict()
+        self._stores: Dict[str, JsonlHistoryStore] = {}
+        self._lock = threading.Lock()
+        self.stats = {"loads": 0, "evictions": 0}
+
+    def _make_store(self, partition_key: str) -> JsonlHistoryStore:
+        """파티션 저장소 (생성만으로는 디렉터리/파일을 만들지 않음)"""
+        return JsonlHistoryStore(
+            os.path.join(self.base_dir, partition_file_name(partition_key)),
+            retention=self.retention,
+            segment_max_bytes=self.segment_max_bytes,
+        )
+
+    def _store_locked(self, partition_key: str) -> JsonlHistoryStore:
+        """로드된 파티션은 보관 중인 저장소, 아니면 보관하지 않는 임시 저장소 (축출된 파티션을 되살리지 않음)"""
+        store = self._stores.get(partition_key)
+        if store is None:
+            store = self._make_store(partition_key)
+        return store
+
+    def _evict_locked(self) -> None:
+        while len(self._counters) > self.max_loaded:
+            evicted_key, _ = self._counters.popitem(last=False)
+            self._stores.pop(evicted_key, None)
+            self.stats["evictions"] += 1
+
+    def get_counters(self, partition_key: str) -> RoutingCounters:
+        """파티션 집계 반환 (메모리에 없으면 파티션 파일로 재구성)"""
+        with self._lock:
+            counters = self._counters.get(partition_key)
+            if counters is not None:
+                self._counters.move_to_end(partition_key)
+                return counters
+
+            counters = self._load_counters_locked(partition_key)
+            self._counters[partition_key] = counters
+            self.stats["loads"] += 1
+            self._evict_locked()
+            return counters
+
+    def find_counters(self, partition_key: str) -> Optional[RoutingCounters]:
+        """
+        조회 전용 파티션 집계 (통계 API용)
+        기록된 적 없는 파티션은 저장소·파일·LRU 항목을 만들지 않고 None 반환
+        """
+        with self._lock:
+            counters = self._counters.get(partition_key)
+            if counters is not None:
+                self._counters.move_to_end(partition_key)
+                return counters
+            if not self._make_store(partition_key).exists():
+                return None
+        return self.get_counters(partition_key)
+
+    def _load_counters_locked(self, partition_key: str) -> RoutingCounters:
+        """파티션 파일로 집계 재구성 (저장소는 집계와 함께 보관)"""
+        store = self._make_store(partition_key)
+        counters = self.counters_factory(self.retention)
+        counters.rebuild(store.load())
+        self._stores[partition_key] = store
+        return counters
+
+    def _write_locked(self, partition_key: str, records: List[Dict]) -> None:
+        os.makedirs(self.base_dir, exist_ok=True)
+        self._store_locked(partition_key).append_many(records)
+
+    def append_and_count(self, partition_key: str, records: List[Dict]) -> None:
+        """
+        파티션 파일에 레코드 추가 + 메모리 집계 반영 (한 락 안에서)
+        로드되지 않은 파티션은 파일에만 기록하고, 다음 로드 시 파일에서 집계
+        """
+        with self._lock:
+            self._write_locked(partition_key, records)
+            counters = self._counters.get(partition_key)
+            if counters is not None:
+                for record in records:
+                    counters.add(record["selected_agent"], record["confidence"])
+
+    def clear(self) -> bool:
+        """모든 파티션 이력/집계 삭제, 삭제할 이력이 있었는지 여부 반환"""
+        with self._lock:
+            self._counters.clear()
+            self._stores.clear()
+            existed = os.path.isdir(self.base_dir) and bool(os.listdir(self.base_dir))
+            if os.path.isdir(self.base_dir):
+                shutil.rmtree(self.base_dir)
+            return existed
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "loaded": len(self._counters),
+                "max_loaded": self.max_loaded,
+                **self.stats
+            }
+
+
+class StorePartitionedHistory(PartitionedRoutingHistory):
+    """
+    공유 이력 저장소(SQLite/공유 상태 백엔드)용 파티션 이력 (별도 파일 없음)
+    레코드는 전역 저장소에 partition 필드와 함께 이미 기록되므로, 파티션 집계는
+    load_counters(파티션 키)가 저장소에서 구함 (SQL 집계 또는 공유 레코드 재집계)
+    """
+
+    def __init__(
+        self,
+        load_counters: Callable[[str], RoutingCounters],
+        retention: int = 1000,
+        max_loaded: int = 256,
+    ):
+        super().__init__("", RoutingCounters, retention=retention, max_loaded=max_loaded)
+        self.load_counters = load_counters
+
+    def _load_counters_locked(self, partition_key: str) -> RoutingCounters:
+        return self.load_counters(partition_key)
+
+    def find_counters(self, partition_key: str) -> Optional[RoutingCounters]:
+        """조회 전용: 로드되지 않은 파티션은 LRU에 넣지 않고 저장소에서 바로 집계 (파일 없음)"""
+        with self._lock:
+            counters = self._counters.get(partition_key)
+            if counters is not None:
+                self._counters.move_to_end(partition_key)
+                return counters
+        return self.load_counters(partition_key)
+
+    def _write_locked(self, partition_key: str, records: List[Dict]) -> None:
+        """전역 저장소에 partition 필드와 함께 기록되었으므로 추가로 쓸 파일 없음"""
+
+    def clear(self) -> bool:
+        """메모리 집계만 비움 (레코드 삭제는 전역 저장소 clear가 담당)"""
+        with self._lock:
+            self._counters.clear()
+            return False
@@ -1,7 +1,37 @@
 """
 프롬프트 생성 모듈 (운동 추천 에이전트 버전)
+
+슈퍼바이저 프롬프트 모드 (SUPERVISOR_PROMPT_MODE 또는 요청별 prompt_mode):
+- full: 기존 상세 프롬프트 (기본)
+- compact: 정적 지시문을 고정 접두어로 두고, 요청마다 바뀌는 부분은 질문과 비율만 붙인 짧은 프롬프트
+  (에이전트명 제약은 AgentSelection 스키마의 enum이 보장하므로 목록 반복 생략,
+   접두어가 매 요청 동일하므로 모델 측 프롬프트 접두어 캐시에 유리)
 """
-from typing import Dict
+import os
+from typing import Dict, Optional
+
+from .structured_logging import get_logger
+
+SUPERVISOR_PROMPT_MODES = ("full", "compact")
+
+logger = get_logger("supervisor")
+
+
+def load_default_prompt_mode() -> str:
+    """SUPERVISOR_PROMPT_MODE 검증 (시작 시 1회, 잘못된 값은 경고 후 full)"""
+    mode = os.getenv("SUPERVISOR_PROMPT_MODE", "full")
+    if mode not in SUPERVISOR_PROMPT_MODES:
+        logger.warning(
+            "⚠️ 지원하지 않는 SUPERVISOR_PROMPT_MODE입니다. full을 사용합니다.",
+            value=mode, supported=list(SUPERVISOR_PROMPT_MODES)
+        )
+        return "full"
+    return mode
+
+
+DEFAULT_PROMPT_MODE = load_default_prompt_mode()
+
+PROMPT_AGENTS = ["축구_에이전트", "농구_에이전트", "야구_에이전트", "테니스_에이전트"]
 
 
 def generate_supervisor_prompt(user_query: str, normalized_ratios: Dict[str, float], total_traces: int) -> str:
@@ -47,6 +77,49 @@ def generate_supervisor_prompt(user_query: str, normalized_ratios: Dict[str, flo
 """
 
 
+# compact 모드의 정적 접두어 (요청과 무관하게 항상 동일해야 캐시 가능)
+COMPACT_SUPERVISOR_PREFIX = """운동 추천 라우터입니다. 사용자 질문에 맞는 에이전트 하나를 고르세요.
+- 축구_에이전트: 축구, 풋살, 킥볼
+- 농구_에이전트: 농구, 3x3, 슛팅
+- 야구_에이전트: 야구, 소프트볼, 타격
+- 테니스_에이전트: 테니스, 배드민턴, 라켓 스포츠
+규칙: 질문 키워드가 최우선입니다. 비율은 과거 선택 빈도(40% = 100번 중 40번)이며 참고용입니다.
+종목이 분명하지 않으면 목록 순서와 무관하게 비율을 확률로 삼아 고르세요.
+이유와 확신도(0.0~1.0)를 함께 답하세요.
+"""
+
+
+def generate_compact_supervisor_prompt(user_query: str, normalized_ratios: Dict[str, float], total_traces: int) -> str:
+    """정적 접두어 + 질문/비율만 담은 짧은 슈퍼바이저 프롬프트"""
+    ratios = ", ".join(f"{agent}: {normalized_ratios.get(agent, 0):.1%}" for agent in PROMPT_AGENTS)
+    return f"""{COMPACT_SUPERVISOR_PREFIX}
+과거 비율(총 {total_traces}회): {ratios}
+사용자 질문: "{user_query}"
+"""
+
+
+def resolve_prompt_mode(prompt_mode: Optional[str] = None) -> str:
+    """요청별 모드가 없거나 잘못되었으면 시작 시 검증한 기본 모드 사용 (요청 경로에서 예외 없음)"""
+    if prompt_mode is None:
+        return DEFAULT_PROMPT_MODE
+    if prompt_mode not in SUPERVISOR_PROMPT_MODES:
+        logger.warning("⚠️ 지원하지 않는 prompt_mode입니다. 기본 모드를 사용합니다.", value=prompt_mode, default=DEFAULT_PROMPT_MODE)
+        return DEFAULT_PROMPT_MODE
+    return prompt_mode
+
+
+def build_supervisor_prompt(
+    user_query: str,
+    normalized_ratios: Dict[str, float],
+    total_traces: int,
+    prompt_mode: str = "full"
+) -> str:
+    """프롬프트 모드에 맞는 슈퍼바이저 프롬프트 생성"""
+    if prompt_mode == "compact":
+        return generate_compact_supervisor_prompt(user_query, normalized_ratios, total_traces)
+    return generate_supervisor_prompt(user_query, normalized_ratios, total_traces)
+
+
 def get_welcome_message() -> str:
     """환영 메시지 반환"""
     return """======================================================================
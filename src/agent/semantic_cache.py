@@ -0,0 +1,324 @@
+"""
+시맨틱 라우팅 캐시 모듈 (CPU 전용 로컬 임베딩)
+
+한글을 자모 단위로 분해한 문자 n-gram 해싱 벡터로 질문을 임베딩하고, 같은 라우팅 상태
+(양자화된 비율/가중치)와 같은 종목 키워드 집합을 가진 과거 질문 중 코사인 유사도가 임계값 이상인
+질문의 AgentSelection을 재사용합니다.
+예) "운동하구 싶다", "운동하고 싶어" → 같은 결정 재사용 / "축구 하고 싶어", "농구 하고 싶어" → 재사용 안 함
+
+- numpy가 설치되어 있으면 고정 크기 행렬로 벡터화된 최근접 탐색, 없으면 희소 벡터 순회
+- 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목(LRU)부터 교체, TTL이 지난 항목은 조회 시 제거
+- 같은 질문 + 같은 상태는 한 슬롯에 결정 표본을 누적 (결정 캐시의 sample 모드를 따름:
+  표본이 samples_per_entry개 모이기 전에는 miss, 모인 뒤에는 표본 분포에서 샘플링)
+
+환경변수:
+- SEMANTIC_CACHE_ENABLED: true/false (기본 false)
+- SEMANTIC_CACHE_THRESHOLD: 재사용 유사도 임계값 (기본 0.6)
+- SEMANTIC_CACHE_MAX_ENTRIES: 최대 항목 수 (기본 2048)
+- SEMANTIC_CACHE_DIM: 해싱 벡터 차원 (기본 512)
+- SEMANTIC_CACHE_TTL_SECONDS: 항목 유효 시간 (기본 DECISION_CACHE_TTL_SECONDS)
+"""
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from .utils import AgentSelection
+from .metrics import REGISTRY
+from .decision_cache import normalize_query
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+SEMANTIC_CACHE_LOOKUP = REGISTRY.histogram(
+    "sports_agent_semantic_cache_lookup_seconds", "시맨틱 캐시 조회 시간",
+    buckets=(0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+)
+
+
+# 종목 키워드 (키워드 집합이 다른 질문끼리는 유사도와 무관하게 재사용하지 않음)
+SPORT_KEYWORDS = {
+    "축구": ["축구", "킥", "풋살"],
+    "농구": ["농구", "슛", "3점", "덩크"],
+    "야구": ["야구", "배팅", "홈런", "캐치볼"],
+    "테니스": ["테니스", "라켓", "서브", "배드민턴"]
+}
+
+
+def keyword_signature(query: str) -> Tuple[str, ...]:
+    """질문에 포함된 종목 키워드 집합"""
+    query = query.lower()
+    return tuple(
+        sport for sport, keywords in SPORT_KEYWORDS.items()
+        if any(keyword in query for keyword in keywords)
+    )
+
+
+def decompose_hangul(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 분해 ("하구" ≈ "하고"가 되도록)"""
+    decomposed = []
+    for char in text:
+        code = ord(char)
+        if 0xAC00 <= code <= 0xD7A3:
+            offset = code - 0xAC00
+            decomposed.append(chr(0x1100 + offset // 588))
+            decomposed.append(chr(0x1161 + (offset % 588) // 28))
+            if offset % 28:
+                decomposed.append(chr(0x11A7 + offset % 28))
+        else:
+            decomposed.append(char)
+    return "".join(decomposed)
+
+
+class NgramHashingEmbedder:
+    """자모 n-gram 해싱 임베더 (부호 있는 feature hashing + L2 정규화)"""
+
+    def __init__(self, dim: int = 512, ngram_range: Tuple[int, int] = (2, 4)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def ngrams(self, text: str) -> List[str]:
+        text = decompose_hangul(re.sub(r"[\s\W_]+", "", text.lower()))
+        grams = []
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+        return grams
+
+    def embed_sparse(self, text: str) -> Dict[int, float]:
+        """희소 벡터 {인덱스: 값} (L2 정규화)"""
+        vector: Dict[int, float] = {}
+        for gram in self.ngrams(text):
+            hashed = zlib.crc32(gram.encode("utf-8"))
+            index = hashed % self.dim
+            sign = 1.0 if (hashed >> 31) & 1 == 0 else -1.0
+            vector[index] = vector.get(index, 0.0) + sign
+
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        if norm == 0:
+            return {}
+        return {index: value / norm for index, value in vector.items() if value != 0}
+
+    def embed(self, text: str):
+        """밀집 벡터 (numpy 사용 가능 시)"""
+        dense = np.zeros(self.dim, dtype=np.float32)
+        for index, value in self.embed_sparse(text).items():
+            dense[index] = value
+        return dense
+
+
+class SemanticCache:
+    """고정 용량 시맨틱 캐시 (라우팅 상태별로 매칭)"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        threshold: float = 0.6,
+        max_entries: int = 2048,
+        dim: int = 512,
+        ttl_seconds: float = 300.0,
+        samples_per_entry: int = 1,
+        seed: Optional[int] = None
+    ):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.samples_per_entry = max(1, samples_per_entry)
+        self.embedder = NgramHashingEmbedder(dim=dim)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        # 슬롯 단위 저장소
+        self._selections: List[Optional[List[AgentSelection]]] = [None] * max_entries
+        self._state_keys: List[Optional[Hashable]] = [None] * max_entries
+        self._created_at: List[float] = [0.0] * max_entries
+        self._entry_keys: List[Optional[Tuple]] = [None] * max_entries
+        self._slot_by_key: Dict[Tuple, int] = {}  # (정규화 질문, 상태) → 슬롯
+        self._lru: "OrderedDict[int, None]" = OrderedDict()  # 사용 중인 슬롯 (오래된 순)
+        self._free_slots: List[int] = list(range(max_entries - 1, -1, -1))
+
+        if NUMPY_AVAILABLE:
+            self._matrix = np.zeros((max_entries, dim), dtype=np.float32)
+            self._state_ids = np.full(max_entries, -1, dtype=np.int64)
+            self._state_id_map: Dict[Hashable, int] = {}
+            self._state_refcounts: Dict[Hashable, int] = {}
+            self._next_state_id = 0
+        else:
+            self._sparse_vectors: List[Optional[Dict[int, float]]] = [None] * max_entries
+
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "inserts": 0}
+
+    @property
+    def _size(self) -> int:
+        return len(self._lru)
+
+    def _acquire_state_id(self, state_key: Hashable) -> int:
+        state_id = self._state_id_map.get(state_key)
+        if state_id is None:
+            state_id = self._next_state_id
+            self._next_state_id += 1
+            self._state_id_map[state_key] = state_id
+        self._state_refcounts[state_key] = self._state_refcounts.get(state_key, 0) + 1
+        return state_id
+
+    def _release_state_id(self, state_key: Hashable) -> None:
+        """마지막 슬롯이 빠지면 상태 id 매핑도 제거 (상태 수만큼 메모리가 늘지 않도록)"""
+        remaining = self._state_refcounts.get(state_key, 0) - 1
+        if remaining > 0:
+            self._state_refcounts[state_key] = remaining
+        else:
+            self._state_refcounts.pop(state_key, None)
+            self._state_id_map.pop(state_key, None)
+
+    def _free_slot(self, slot: int) -> None:
+        """슬롯 비우기 (락을 잡은 상태에서 호출)"""
+        self._slot_by_key.pop(self._entry_keys[slot], None)
+        self._lru.pop(slot, None)
+        if NUMPY_AVAILABLE:
+            self._release_state_id(self._state_keys[slot])
+            self._matrix[slot] = 0
+            self._state_ids[slot] = -1
+        else:
+            self._sparse_vectors[slot] = None
+        self._selections[slot] = None
+        self._state_keys[slot] = None
+        self._entry_keys[slot] = None
+        self._free_slots.append(slot)
+
+    def _candidates(self, query: str, state_key: Hashable) -> List[int]:
+        """같은 상태에서 유사도가 임계값 이상인 슬롯 (유사도 높은 순)"""
+        if self._size == 0:
+            return []
+
+        if NUMPY_AVAILABLE:
+            state_id = self._state_id_map.get(state_key)
+            if state_id is None:
+                return []
+            scores = self._matrix @ self.embedder.embed(query)
+            scores[self._state_ids != state_id] = -1.0
+            slots = np.flatnonzero(scores >= self.threshold)
+            return [int(slot) for slot in slots[np.argsort(-scores[slots], kind="stable")]]
+
+        vector = self.embedder.embed_sparse(query)
+        scored = []
+        for slot, candidate in enumerate(self._sparse_vectors):
+            if candidate is None or self._state_keys[slot] != state_key:
+                continue
+            score = sum(value * candidate.get(index, 0.0) for index, value in vector.items())
+            if score >= self.threshold:
+                scored.append((score, slot))
+        scored.sort(key=lambda item: -item[0])
+        return [slot for _, slot in scored]
+
+    def lookup(self, query: str, state_key: Hashable) -> Optional[AgentSelection]:
+        """
+        유사도 임계값 이상이고 표본이 충분한 과거 결정 반환 (표본이 여러 개면 그 분포에서 샘플링)
+        가장 유사한 슬롯이 만료되었거나 표본 수집 중이면 다음으로 유사한 슬롯 사용
+        """
+        start = time.perf_counter()
+        state_key = (state_key, keyword_signature(query))
+        selection = None
+        with self._lock:
+            now = time.monotonic()
+            for slot in self._candidates(query, state_key):
+                if now - self._created_at[slot] > self.ttl_seconds:
+                    self._free_slot(slot)
+                    self.stats["expirations"] += 1
+                elif len(self._selections[slot]) >= self.samples_per_entry:
+                    self._lru.move_to_end(slot)
+                    selection = self._random.choice(self._selections[slot])
+                    break
+            if selection is not None:
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+        SEMANTIC_CACHE_LOOKUP.observe(time.perf_counter() - start)
+        return selection
+
+    def insert(self, query: str, state_key: Hashable, selection: AgentSelection) -> None:
+        """결정 저장 (같은 질문/상태면 기존 슬롯에 표본 추가, 가득 차면 LRU 슬롯 교체)"""
+        state_key = (state_key, keyword_signature(query))
+        entry_key = (normalize_query(query), state_key)
+        with self._lock:
+            slot = self._slot_by_key.get(entry_key)
+            if slot is not None:
+                samples = self._selections[slot]
+                samples.append(selection)
+                if len(samples) > self.samples_per_entry:
+                    samples.pop(0)
+                self._lru.move_to_end(slot)
+                self.stats["inserts"] += 1
+                return
+
+            if not self._free_slots:
+                self._free_slot(next(iter(self._lru)))
+                self.stats["evictions"] += 1
+            slot = self._free_slots.pop()
+
+            self._selections[slot] = [selection]
+            self._state_keys[slot] = state_key
+            self._entry_keys[slot] = entry_key
+            self._created_at[slot] = time.monotonic()
+            self._slot_by_key[entry_key] = slot
+            self._lru[slot] = None
+
+            if NUMPY_AVAILABLE:
+                self._matrix[slot] = self.embedder.embed(query)
+                self._state_ids[slot] = self._acquire_state_id(state_key)
+            else:
+                self._sparse_vectors[slot] = self.embedder.embed_sparse(query)
+            self.stats["inserts"] += 1
+
+    def invalidate(self) -> None:
+        """전체 무효화 (가중치 변경 시)"""
+        with self._lock:
+            for slot in list(self._lru):
+                self._free_slot(slot)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "enabled": self.enabled,
+                "size": self._size,
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "samples_per_entry": self.samples_per_entry,
+                "states": len(self._state_id_map) if NUMPY_AVAILABLE else None,
+                "vectorized": NUMPY_AVAILABLE,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self.stats
+            }
+
+
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """프로세스 공용 시맨틱 캐시 반환 (환경변수 설정으로 최초 생성)"""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            enabled=os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true",
+            threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.6")),
+            max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "2048")),
+            dim=int(os.getenv("SEMANTIC_CACHE_DIM", "512")),
+            ttl_seconds=float(os.getenv(
+                "SEMANTIC_CACHE_TTL_SECONDS", os.getenv("DECISION_CACHE_TTL_SECONDS", "300")
+            )),
+            # 결정 캐시가 sample 모드면 같은 표본 수를 모은 뒤 분포에서 샘플링
+            samples_per_entry=(
+                int(os.getenv("DECISION_CACHE_SAMPLES", "5"))
+                if os.getenv("DECISION_CACHE_MODE", "off") == "sample" else 1
+            ),
+        )
+    return _semantic_cache
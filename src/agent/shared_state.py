@@ -0,0 +1,515 @@
+"""
+공유 상태 백엔드 모듈 (여러 uvicorn 워커/호스트 간 라우팅 상태 공유)
+
+라우팅 이력·집계·가중치를 프로세스 밖의 저장소에 두어 워커마다 비율과 가중치가
+갈라지지(split-brain) 않도록 합니다. 가중치 변경은 모든 워커에 알림으로 전달됩니다.
+
+백엔드 (SHARED_STATE_BACKEND):
+- none: 공유하지 않음 (기본, 단일 프로세스)
+- sqlite: 같은 호스트의 워커들이 하나의 SQLite(WAL) 파일을 공유 (이력/집계/가중치)
+- memory: 네트워크 키-값 저장소 인터페이스(KeyValueStore)의 프로세스 내 대체 구현
+          (Redis 등 실제 네트워크 저장소 어댑터를 붙이기 전 테스트용, 한 프로세스 안에서만 공유)
+
+모든 백엔드는 가중치(버전 + 알림), 이력 저장소(전역 + 파티션), 집계(routing_counters)를 제공하며
+파티션 이력도 별도 파일 없이 백엔드의 이력 저장소에서 집계합니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .counters import RoutingCounters, SharedRecordCounters
+from .structured_logging import get_logger
+
+logger = get_logger("weights")
+
+# (공유 버전, 가중치) 변경 알림 콜백
+WeightsListener = Callable[[int, Dict[str, float]], None]
+# 보존 개수 → 빈 집계 (window/decay)
+CountersFactory = Callable[[int], RoutingCounters]
+
+
+class SharedStateBackend(ABC):
+    """공유 상태 백엔드 인터페이스 (가중치 + 이력 저장소 + 집계)"""
+
+    name = "base"
+
+    @abstractmethod
+    def load_weights(self) -> Optional[Tuple[int, Dict[str, float]]]:
+        """공유된 (버전, 가중치), 아직 없으면 None"""
+
+    @abstractmethod
+    def publish_weights(self, weights: Dict[str, float]) -> int:
+        """가중치 저장 후 모든 워커에 알림, 새 공유 버전 반환"""
+
+    @abstractmethod
+    def subscribe_weights(self, listener: WeightsListener) -> None:
+        """다른 워커(자신 포함)의 가중치 변경 알림 구독"""
+
+    @abstractmethod
+    def history_store(self):
+        """
+        공유 이력 저장소 (load/append_many/count/query/clear/tail 제공)
+        레코드의 partition 필드로 파티션별 최근 레코드도 조회 가능해야 함
+        """
+
+    def routing_counters(
+        self,
+        counters_factory: CountersFactory,
+        window: int,
+        partition: Optional[str] = None,
+        ttl_seconds: float = 0.25
+    ) -> RoutingCounters:
+        """
+        공유 이력으로 구한 집계 (partition 지정 시 해당 파티션)
+        기본 구현은 이력 저장소의 최근 window개 레코드를 ttl_seconds마다 다시 집계
+        """
+        store = self.history_store()
+        return SharedRecordCounters(
+            lambda: store.tail(window, partition), counters_factory, window=window, ttl_seconds=ttl_seconds
+        )
+
+    def get_stats(self) -> Dict:
+        shared = self.load_weights()
+        return {
+            "backend": self.name,
+            "weights_version": shared[0] if shared else None,
+            "history_records": self.history_store().count()
+        }
+
+    def close(self) -> None:
+        pass
+
+
+# ----------------------------------------------------------------------
+# 로컬 구현: SQLite 공유 파일
+# ----------------------------------------------------------------------
+class SqliteSharedState(SharedStateBackend):
+    """
+    같은 호스트의 워커들이 SQLite 파일 하나를 공유
+    가중치 변경 알림은 버전 컬럼을 poll_interval_seconds마다 확인해 전달
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, retention: int = 1000, poll_interval_seconds: float = 1.0):
+        from .sqlite_history_store import SqliteHistoryStore
+
+        self.path = path
+        self.poll_interval_seconds = poll_interval_seconds
+        self._history_store = SqliteHistoryStore(path, retention=retention)
+        self._local = threading.local()
+        self._listeners: List[WeightsListener] = []
+        self._poll_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._seen_version = 0
+
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS shared_weights ("
+            "id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL, "
+            "weights TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def history_store(self):
+        return self._history_store
+
+    def load_weights(self) -> Optional[Tuple[int, Dict[str, float]]]:
+        row = self._connection().execute("SELECT version, weights FROM shared_weights WHERE id = 1").fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def publish_weights(self, weights: Dict[str, float]) -> int:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT version FROM shared_weights WHERE id = 1").fetchone()
+            version = (row[0] if row else 0) + 1
+            conn.execute(
+                "INSERT OR REPLACE INTO shared_weights (id, version, weights, updated_at) VALUES (1, ?, ?, ?)",
+                (version, json.dumps(weights, ensure_ascii=False), time.time())
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._dispatch(version, weights)
+        return version
+
+    def _dispatch(self, version: int, weights: Dict[str, float]) -> None:
+        if version <= self._seen_version:
+            return
+        self._seen_version = version
+        for listener in list(self._listeners):
+            try:
+                listener(version, dict(weights))
+            except Exception as e:
+                logger.error("❌ 공유 가중치 알림 처리 실패", error=str(e))
+
+    def subscribe_weights(self, listener: WeightsListener) -> None:
+        self._listeners.append(listener)
+        if self._poll_thread is None:
+            self._poll_thread = threading.Thread(target=self._poll, name="shared-weights-poller", daemon=True)
+            self._poll_thread.start()
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval_seconds):
+            try:
+                shared = self.load_weights()
+                if shared is not None:
+                    self._dispatch(*shared)
+            except Exception as e:
+                logger.error("❌ 공유 가중치 조회 실패", error=str(e))
+
+    def close(self) -> None:
+        self._stop.set()
+
+
+# ----------------------------------------------------------------------
+# 네트워크 저장소 인터페이스 + 프로세스 내 대체 구현
+# ----------------------------------------------------------------------
+class KeyValueStore(ABC):
+    """
+    네트워크 키-값 저장소 최소 인터페이스 (Redis 등 어댑터가 구현, 명령 의미는 Redis와 동일)
+    - 문자열: get/set/incrby (가중치, 버전·이력 순번)
+    - 리스트: rpush/lrange/ltrim/llen (이력, 인덱스는 음수 허용·stop 포함)
+    - 집합: sadd/smembers (파티션 목록)
+    - pub/sub: publish/subscribe (가중치 변경 알림)
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        pass
+
+    @abstractmethod
+    def incrby(self, key: str, amount: int) -> int:
+        pass
+
+    def incr(self, key: str) -> int:
+        return self.incrby(key, 1)
+
+    @abstractmethod
+    def delete(self, keys: List[str]) -> int:
+        """삭제한 키 수 반환"""
+
+    @abstractmethod
+    def rpush(self, key: str, values: List[str]) -> int:
+        """리스트 끝에 추가, 추가 후 길이 반환"""
+
+    @abstractmethod
+    def lrange(self, key: str, start: int, stop: int) -> List[str]:
+        pass
+
+    @abstractmethod
+    def ltrim(self, key: str, start: int, stop: int) -> None:
+        pass
+
+    @abstractmethod
+    def llen(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    def sadd(self, key: str, member: str) -> None:
+        pass
+
+    @abstractmethod
+    def smembers(self, key: str) -> Set[str]:
+        pass
+
+    @abstractmethod
+    def publish(self, channel: str, message: str) -> None:
+        pass
+
+    @abstractmethod
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        pass
+
+
+def _redis_slice(start: int, stop: int) -> slice:
+    """Redis 범위(stop 포함, 음수 허용) → 파이썬 slice"""
+    return slice(start, None if stop == -1 else stop + 1)
+
+
+class InMemoryKeyValueStore(KeyValueStore):
+    """같은 프로세스 안에서 KeyValueStore 계약을 만족하는 대체 구현 (테스트용)"""
+
+    def __init__(self):
+        self._data: Dict[str, str] = {}
+        self._lists: Dict[str, List[str]] = {}
+        self._sets: Dict[str, Set[str]] = {}
+        self._subscribers: Dict[str, List[Callable[[str], None]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+
+    def incrby(self, key: str, amount: int) -> int:
+        with self._lock:
+            value = int(self._data.get(key, "0")) + amount
+            self._data[key] = str(value)
+            return value
+
+    def delete(self, keys: List[str]) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                for container in (self._data, self._lists, self._sets):
+                    if container.pop(key, None) is not None:
+                        removed += 1
+            return removed
+
+    def rpush(self, key: str, values: List[str]) -> int:
+        with self._lock:
+            items = self._lists.setdefault(key, [])
+            items.extend(values)
+            return len(items)
+
+    def lrange(self, key: str, start: int, stop: int) -> List[str]:
+        with self._lock:
+            return list(self._lists.get(key, [])[_redis_slice(start, stop)])
+
+    def ltrim(self, key: str, start: int, stop: int) -> None:
+        with self._lock:
+            if key in self._lists:
+                self._lists[key] = self._lists[key][_redis_slice(start, stop)]
+
+    def llen(self, key: str) -> int:
+        with self._lock:
+            return len(self._lists.get(key, []))
+
+    def sadd(self, key: str, member: str) -> None:
+        with self._lock:
+            self._sets.setdefault(key, set()).add(member)
+
+    def smembers(self, key: str) -> Set[str]:
+        with self._lock:
+            return set(self._sets.get(key, set()))
+
+    def publish(self, channel: str, message: str) -> None:
+        with self._lock:
+            handlers = list(self._subscribers.get(channel, []))
+        for handler in handlers:
+            handler(message)
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(handler)
+
+
+class KeyValueHistoryStore:
+    """
+    KeyValueStore 리스트 기반 공유 이력 저장소 (SqliteHistoryStore와 같은 인터페이스)
+    - 레코드마다 incrby로 발급한 순번(id)을 붙여 전역 리스트와 파티션 리스트에 rpush
+    - 추가할 때마다 보존 개수(retention / partition_retention)로 ltrim
+    - 커서는 순번 문자열 (before: 더 오래된 / after: 더 새로운)
+    """
+
+    def __init__(self, store: KeyValueStore, retention: int = 1000, partition_retention: int = 1000,
+                 prefix: str = "sports_agent:history"):
+        self.store = store
+        self.retention = retention
+        self.partition_retention = partition_retention
+        self.prefix = prefix
+        self.sequence_key = f"{prefix}:seq"
+        self.records_key = f"{prefix}:records"
+        self.partitions_key = f"{prefix}:partitions"
+
+    def _partition_key(self, partition: str) -> str:
+        return f"{self.prefix}:partition:{partition}"
+
+    def _entries(self, partition: Optional[str] = None, limit: Optional[int] = None) -> List[Tuple[int, Dict]]:
+        """(순번, 레코드) 목록 (오래된 순)"""
+        if partition is None:
+            key, keep = self.records_key, self.retention
+        else:
+            key, keep = self._partition_key(partition), self.partition_retention
+        limit = keep if limit is None else min(limit, keep)
+        if limit <= 0:
+            return []
+        entries = [json.loads(raw) for raw in self.store.lrange(key, -limit, -1)]
+        # 여러 워커가 번갈아 rpush하면 리스트 순서와 순번이 어긋날 수 있으므로 순번으로 정렬
+        entries.sort(key=lambda entry: entry["id"])
+        return [(entry["id"], entry["record"]) for entry in entries]
+
+    def load(self) -> List[Dict]:
+        return [record for _, record in self._entries()]
+
+    def tail(self, limit: int, partition: Optional[str] = None) -> List[Dict]:
+        """최근 limit개 레코드 (오래된 순, partition 지정 시 파티션 리스트)"""
+        return [record for _, record in self._entries(partition, limit)]
+
+    def append(self, record: Dict) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict]) -> None:
+        if not records:
+            return
+        first_id = self.store.incrby(self.sequence_key, len(records)) - len(records) + 1
+        entries = [
+            json.dumps({"id": first_id + offset, "record": record}, ensure_ascii=False)
+            for offset, record in enumerate(records)
+        ]
+        self.store.rpush(self.records_key, entries)
+        self.store.ltrim(self.records_key, -self.retention, -1)
+
+        by_partition: Dict[str, List[str]] = {}
+        for entry, record in zip(entries, records):
+            if record.get("partition"):
+                by_partition.setdefault(record["partition"], []).append(entry)
+        for partition, partition_entries in by_partition.items():
+            key = self._partition_key(partition)
+            self.store.sadd(self.partitions_key, partition)
+            self.store.rpush(key, partition_entries)
+            self.store.ltrim(key, -self.partition_retention, -1)
+
+    def count(self) -> int:
+        return min(self.store.llen(self.records_key), self.retention)
+
+    def compact(self) -> int:
+        """보존 범위를 벗어난 항목 제거 (추가 시 이미 ltrim하므로 보통 0)"""
+        before = self.store.llen(self.records_key)
+        self.store.ltrim(self.records_key, -self.retention, -1)
+        return before - self.store.llen(self.records_key)
+
+    def clear(self) -> bool:
+        """전역/파티션 이력 삭제 (순번은 유지해 기존 커서와 겹치지 않도록), 삭제할 이력이 있었는지 여부 반환"""
+        partitions = self.store.smembers(self.partitions_key)
+        keys = [self.records_key, self.partitions_key] + [self._partition_key(p) for p in partitions]
+        return self.store.delete(keys) > 0
+
+    def query(
+        self,
+        limit: int,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        agent: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        partition: Optional[str] = None,
+    ) -> Dict:
+        """필터 + 커서(순번) 페이지 조회 (history는 최신 순, 각 레코드에 cursor 포함)"""
+        try:
+            before_id = int(before) if before else None
+            after_id = int(after) if after else None
+        except ValueError:
+            raise ValueError(f"잘못된 커서: {before or after}")
+
+        matched = [
+            (entry_id, record) for entry_id, record in self._entries(partition)
+            if (before_id is None or entry_id < before_id)
+            and (after_id is None or entry_id > after_id)
+            and (agent is None or record.get("selected_agent") == agent)
+            and (since is None or record.get("timestamp", "") >= since)
+            and (until is None or record.get("timestamp", "") < until)
+        ]
+        if after_id is not None:
+            # after 방향: 커서 바로 다음의 limit개 (나머지는 다음 폴링에서)
+            has_more = len(matched) > limit
+            matched = matched[:limit]
+        else:
+            has_more = len(matched) > limit
+            matched = matched[-limit:] if limit > 0 else []
+        matched.reverse()
+
+        history = [{**record, "cursor": str(entry_id)} for entry_id, record in matched]
+        return {
+            "history": history,
+            "next_cursor": history[-1]["cursor"] if history else before,
+            "prev_cursor": history[0]["cursor"] if history else after,
+            "has_more": has_more,
+        }
+
+
+class KeyValueSharedState(SharedStateBackend):
+    """
+    KeyValueStore 기반 공유 상태
+    - 가중치: 버전은 원자적 incr, 변경은 pub/sub로 알림
+    - 이력/집계: KeyValueHistoryStore 리스트 (집계는 최근 레코드를 TTL마다 다시 집계)
+    """
+
+    name = "keyvalue"
+
+    WEIGHTS_KEY = "sports_agent:weights"
+    VERSION_KEY = "sports_agent:weights:version"
+    CHANNEL = "sports_agent:weights:changed"
+
+    def __init__(self, store: KeyValueStore, retention: int = 1000, partition_retention: int = 1000):
+        self.store = store
+        self._history_store = KeyValueHistoryStore(store, retention=retention, partition_retention=partition_retention)
+
+    def history_store(self):
+        return self._history_store
+
+    def load_weights(self) -> Optional[Tuple[int, Dict[str, float]]]:
+        raw = self.store.get(self.WEIGHTS_KEY)
+        if raw is None:
+            return None
+        payload = json.loads(raw)
+        return payload["version"], payload["weights"]
+
+    def publish_weights(self, weights: Dict[str, float]) -> int:
+        version = self.store.incr(self.VERSION_KEY)
+        message = json.dumps({"version": version, "weights": weights}, ensure_ascii=False)
+        self.store.set(self.WEIGHTS_KEY, message)
+        self.store.publish(self.CHANNEL, message)
+        return version
+
+    def subscribe_weights(self, listener: WeightsListener) -> None:
+        def handle(message: str) -> None:
+            payload = json.loads(message)
+            listener(payload["version"], payload["weights"])
+
+        self.store.subscribe(self.CHANNEL, handle)
+
+
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "none")
+
+_shared_state: Optional[SharedStateBackend] = None
+_shared_state_lock = threading.Lock()
+
+
+def get_shared_state() -> Optional[SharedStateBackend]:
+    """프로세스 공용 공유 상태 백엔드 (SHARED_STATE_BACKEND=none이면 None)"""
+    global _shared_state
+    backend = SHARED_STATE_BACKEND
+    if backend == "none":
+        return None
+    if _shared_state is None:
+        with _shared_state_lock:
+            if _shared_state is None:
+                if backend == "sqlite":
+                    _shared_state = SqliteSharedState(
+                        os.getenv("SHARED_STATE_DB_FILE", os.getenv("ROUTING_HISTORY_DB_FILE", "routing_history.db")),
+                        retention=int(os.getenv("ROUTING_HISTORY_RETENTION", "1000")),
+                        poll_interval_seconds=float(os.getenv("SHARED_STATE_POLL_INTERVAL_SECONDS", "1.0")),
+                    )
+                elif backend == "memory":
+                    _shared_state = KeyValueSharedState(
+                        InMemoryKeyValueStore(),
+                        retention=int(os.getenv("ROUTING_HISTORY_RETENTION", "1000")),
+                        partition_retention=int(os.getenv("ROUTING_PARTITION_RETENTION", "1000")),
+                    )
+                else:
+                    raise ValueError(f"지원하지 않는 SHARED_STATE_BACKEND: {backend}")
+    return _shared_state
@@ -0,0 +1,109 @@
+"""
+단일 비행(single-flight) 모듈 - 동일한 진행 중 라우팅 요청 병합
+
+같은 정규화 질문 + 같은 라우팅 상태(양자화된 비율/가중치)로 동시에 들어온 요청은
+첫 요청(리더)만 Gemini를 호출하고, 나머지(팔로워)는 리더의 결과를 기다렸다가 사용합니다.
+이력은 요청마다 각자 기록되므로 피드백 루프는 그대로 유지됩니다.
+
+모드 (SINGLE_FLIGHT_MODE):
+- off: 병합하지 않음 (기본)
+- share: 팔로워가 리더의 AgentSelection을 그대로 사용
+- sample: 팔로워가 리더 결정이 나온 분포(같은 키의 결정 캐시 표본, 없으면 키워드 분류 확률)에서 각자 샘플링 (버스트가 한 에이전트로 쏠리지 않도록)
+"""
+import asyncio
+import os
+import random
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .metrics import REGISTRY
+
+SINGLE_FLIGHT_REQUESTS = REGISTRY.counter(
+    "sports_agent_single_flight_requests_total", "단일 비행 병합 요청 수 (role: leader, follower)"
+)
+
+
+class SingleFlight:
+    """이벤트 루프 단위 진행 중 요청 병합기"""
+
+    def __init__(self, mode: str = "off", seed: Optional[int] = None):
+        if mode not in ("off", "share", "sample"):
+            raise ValueError(f"지원하지 않는 SINGLE_FLIGHT_MODE: {mode}")
+        self.mode = mode
+        self.random = random.Random(seed)
+        self._loop = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def _inflight_for_loop(self) -> Dict[Hashable, asyncio.Future]:
+        """현재 이벤트 루프의 진행 중 요청 테이블 (루프가 바뀌면 초기화)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._inflight = {}
+        return self._inflight
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        key가 같은 진행 중 호출이 있으면 그 결과를 기다리고, 없으면 func 실행
+        반환: (결과, 리더 여부)
+        """
+        inflight = self._inflight_for_loop()
+        while True:
+            future = inflight.get(key)
+            if future is None:
+                break
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 리더가 취소된 경우에만 재시도 (자신이 취소된 경우는 전파)
+                if future.cancelled():
+                    continue
+                raise
+            SINGLE_FLIGHT_REQUESTS.inc(role="follower")
+            return result, False
+
+        future = asyncio.get_running_loop().create_future()
+        inflight[key] = future
+        SINGLE_FLIGHT_REQUESTS.inc(role="leader")
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 팔로워가 없을 때 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, True
+        finally:
+            if inflight.get(key) is future:
+                del inflight[key]
+
+    def get_stats(self) -> Dict:
+        leaders = SINGLE_FLIGHT_REQUESTS.value(role="leader")
+        followers = SINGLE_FLIGHT_REQUESTS.value(role="follower")
+        total = leaders + followers
+        return {
+            "mode": self.mode,
+            "in_flight": len(self._inflight),
+            "leaders": int(leaders),
+            "followers": int(followers),
+            "coalesced_ratio": round(followers / total, 4) if total else 0.0
+        }
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """프로세스 공용 단일 비행 병합기 반환 (환경변수 설정으로 최초 생성)"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight(mode=os.getenv("SINGLE_FLIGHT_MODE", "off"))
+    return _single_flight
@@ -0,0 +1,325 @@
+"""
+라우팅 이력 저장소 모듈 (SQLite WAL 백엔드)
+
+JsonlHistoryStore와 같은 인터페이스(load/append/append_many/compact/clear/count/query)와 tail을 제공하며,
+추가로 인덱스를 이용한 SQL 집계(aggregate, 파티션별 포함)를 지원합니다.
+- WAL 모드 + busy_timeout으로 여러 uvicorn 워커가 동시에 안전하게 기록
+- timestamp, selected_agent, partition 인덱스
+- 보존 개수(retention)를 넘는 오래된 행은 주기적으로 PK 범위 삭제
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .counters import RoutingCounters
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS routing_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    selected_agent TEXT NOT NULL,
+    confidence REAL NOT NULL DEFAULT 0.0,
+    partition TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_routing_history_timestamp ON routing_history (timestamp);
+CREATE INDEX IF NOT EXISTS idx_routing_history_agent ON routing_history (selected_agent, id);
+CREATE INDEX IF NOT EXISTS idx_routing_history_partition ON routing_history (partition, id);
+"""
+
+
+class SqliteHistoryStore:
+    """SQLite(WAL) 기반 이력 저장소"""
+
+    def __init__(self, path: str, retention: int = 1000, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.retention = retention
+        self.busy_timeout_ms = busy_timeout_ms
+        # 보존 범위를 이만큼 넘을 때마다 한 번씩 오래된 행 삭제
+        self.compact_every = max(1, retention // 10)
+
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self._last_compacted_id = 0
+
+    # ------------------------------------------------------------------
+    # 연결 관리 (스레드별 연결)
+    # ------------------------------------------------------------------
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def _min_live_id(self, conn: sqlite3.Connection) -> int:
+        """보존 범위에 속하는 가장 오래된 행 id"""
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM routing_history").fetchone()[0]
+        return max_id - self.retention + 1
+
+    @staticmethod
+    def _row(record: Dict) -> Tuple:
+        return (
+            record.get("timestamp", ""),
+            record["selected_agent"],
+            record.get("confidence") or 0.0,
+            record.get("partition"),
+            json.dumps(record, ensure_ascii=False),
+        )
+
+    # ------------------------------------------------------------------
+    # 공개 API (JsonlHistoryStore 호환)
+    # ------------------------------------------------------------------
+    def load(self) -> List[Dict]:
+        """보존 범위 내 전체 이력 로드 (오래된 순)"""
+        conn = self._connection()
+        rows = conn.execute(
+            "SELECT record FROM routing_history WHERE id >= ? ORDER BY id",
+            (self._min_live_id(conn),)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def append(self, record: Dict) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict]) -> None:
+        """여러 레코드를 한 트랜잭션으로 추가"""
+        if not records:
+            return
+        rows = [self._row(record) for record in records]
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO routing_history (timestamp, selected_agent, confidence, partition, record) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if last_id - self._last_compacted_id >= self.retention + self.compact_every:
+            self.compact()
+
+    def migrate_from(self, load_records) -> int:
+        """
+        테이블이 비어 있을 때만 기존 이력(load_records() 결과)을 가져옴
+        여러 워커가 동시에 시작해도 한 번만 가져오도록 쓰기 트랜잭션 안에서 확인
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM routing_history LIMIT 1").fetchone() is not None:
+                conn.execute("COMMIT")
+                return 0
+            records = load_records()[-self.retention:]
+            conn.executemany(
+                "INSERT INTO routing_history (timestamp, selected_agent, confidence, partition, record) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [self._row(record) for record in records]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(records)
+
+    def compact(self) -> int:
+        """보존 범위를 벗어난 행 삭제, 삭제한 행 수 반환"""
+        conn = self._connection()
+        min_live_id = self._min_live_id(conn)
+        cursor = conn.execute("DELETE FROM routing_history WHERE id < ?", (min_live_id,))
+        self._last_compacted_id = max(min_live_id - 1, 0)
+        return cursor.rowcount
+
+    def clear(self) -> bool:
+        """모든 이력 삭제, 삭제할 이력이 있었는지 여부 반환"""
+        conn = self._connection()
+        cursor = conn.execute("DELETE FROM routing_history")
+        self._last_compacted_id = 0
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        """보존 범위 내 레코드 수"""
+        conn = self._connection()
+        return conn.execute(
+            "SELECT COUNT(*) FROM routing_history WHERE id >= ?", (self._min_live_id(conn),)
+        ).fetchone()[0]
+
+    def query(
+        self,
+        limit: int,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        agent: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        partition: Optional[str] = None,
+    ) -> Dict:
+        """
+        필터 + 커서(id) 페이지 조회 (history는 최신 순, 각 레코드에 cursor 포함)
+        before: 이 id보다 오래된 레코드 / after: 이 id보다 새로운 레코드 중 가장 오래된 limit개
+        """
+        try:
+            before_id = int(before) if before else None
+            after_id = int(after) if after else None
+        except ValueError:
+            raise ValueError(f"잘못된 커서: {before or after}")
+
+        conn = self._connection()
+        conditions = ["id >= ?"]
+        params: List = [self._min_live_id(conn)]
+        for condition, value in (
+            ("id < ?", before_id),
+            ("id > ?", after_id),
+            ("selected_agent = ?", agent),
+            ("timestamp >= ?", since),
+            ("timestamp < ?", until),
+            ("partition = ?", partition),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+
+        order = "ASC" if after_id is not None else "DESC"
+        rows = conn.execute(
+            f"SELECT id, record FROM routing_history WHERE {' AND '.join(conditions)} "
+            f"ORDER BY id {order} LIMIT ?",
+            params + [limit + 1]
+        ).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if after_id is not None:
+            rows.reverse()
+
+        history = [{**json.loads(record), "cursor": str(row_id)} for row_id, record in rows]
+        return {
+            "history": history,
+            "next_cursor": history[-1]["cursor"] if history else before,
+            "prev_cursor": history[0]["cursor"] if history else after,
+            "has_more": has_more,
+        }
+
+    def tail(self, limit: int, partition: Optional[str] = None) -> List[Dict]:
+        """최근 limit개 레코드 (오래된 순, partition 지정 시 partition 인덱스 사용)"""
+        conn = self._connection()
+        if partition is None:
+            rows = conn.execute(
+                "SELECT record FROM routing_history WHERE id >= ? ORDER BY id DESC LIMIT ?",
+                (self._min_live_id(conn), limit)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT record FROM routing_history WHERE partition = ? AND id >= ? ORDER BY id DESC LIMIT ?",
+                (partition, self._min_live_id(conn), limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def aggregate(
+        self, partition: Optional[str] = None, limit: Optional[int] = None
+    ) -> Tuple[Dict[str, int], Dict[str, float], int]:
+        """
+        보존 범위 내 에이전트별 (횟수, 확신도 합계, 총 횟수) SQL 집계
+        partition 지정 시 해당 파티션의 최근 limit개 행만 집계 (partition 인덱스 사용)
+        """
+        conn = self._connection()
+        params: List = [self._min_live_id(conn)]
+        if partition is None:
+            query = (
+                "SELECT selected_agent, COUNT(*), SUM(confidence) FROM routing_history "
+                "WHERE id >= ? GROUP BY selected_agent"
+            )
+        else:
+            query = (
+                "SELECT selected_agent, COUNT(*), SUM(confidence) FROM ("
+                "SELECT selected_agent, confidence FROM routing_history "
+                "WHERE partition = ? AND id >= ? ORDER BY id DESC LIMIT ?"
+                ") GROUP BY selected_agent"
+            )
+            params = [partition] + params + [limit if limit is not None else self.retention]
+
+        counts, confidence_sums = {}, {}
+        for agent, count, confidence_sum in conn.execute(query, params):
+            counts[agent] = count
+            confidence_sums[agent] = confidence_sum or 0.0
+        return counts, confidence_sums, sum(counts.values())
+
+
+class SqlAggregateCounters(RoutingCounters):
+    """
+    SQLite 집계 기반 라우팅 카운터 (여러 워커가 같은 비율을 공유)
+
+    스냅샷은 SQL 집계를 ttl_seconds 동안 캐시하고, 이 프로세스에서 추가된 선택은 캐시된 집계에
+    정수로 더합니다. 재집계는 TTL 만료 시에만 일어나며, 그때 다른 워커의 기록과 보존 범위 밖으로
+    밀려난 행이 반영됩니다.
+    partition 지정 시 해당 파티션의 최근 window개 행만 집계합니다.
+    """
+
+    def __init__(
+        self,
+        store: SqliteHistoryStore,
+        ttl_seconds: float = 0.25,
+        partition: Optional[str] = None,
+        window: Optional[int] = None
+    ):
+        super().__init__(window=window or store.retention)
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.partition = partition
+        self._cached: Optional[Tuple[Dict[str, int], Dict[str, float], int]] = None
+        self._cached_at = 0.0
+
+    def _refresh_locked(self) -> Tuple[Dict[str, int], Dict[str, float], int]:
+        now = time.monotonic()
+        if self._cached is None or now - self._cached_at > self.ttl_seconds:
+            self._cached = self.store.aggregate(self.partition, self.window)
+            self._cached_at = now
+        return self._cached
+
+    def rebuild(self, records=None) -> None:
+        """다음 조회 시 SQL로 다시 집계 (records는 사용하지 않음)"""
+        with self._lock:
+            self._cached = None
+
+    def add(self, selected_agent: str, confidence: float) -> None:
+        """
+        이미 기록된 선택을 캐시된 집계에 더함 (요청마다 GROUP BY를 다시 돌리지 않음)
+        보존 범위 밖으로 밀려난 행은 다음 TTL 재집계 때 빠집니다.
+        """
+        with self._lock:
+            if self._cached is None:
+                return
+            counts, confidence_sums, total = self._cached
+            counts[selected_agent] = counts.get(selected_agent, 0) + 1
+            confidence_sums[selected_agent] = confidence_sums.get(selected_agent, 0.0) + confidence
+            self._cached = (counts, confidence_sums, total + 1)
+
+    @property
+    def total(self) -> int:
+        return self.snapshot()[2]
+
+    def snapshot(self) -> Tuple[Dict[str, int], Dict[str, float], int]:
+        with self._lock:
+            counts, confidence_sums, total = self._refresh_locked()
+            return dict(counts), dict(confidence_sums), total
+
+    def window_snapshot(self) -> Tuple[Dict[str, int], Dict[str, float], int]:
+        return self.snapshot()
@@ -0,0 +1,180 @@
+"""
+구조화 로깅 모듈 (큐 기반 비동기 출력, JSON lines)
+
+요청 처리 경로에서는 로그 레코드를 큐에 넣기만 하고, 포맷팅과 stdout 쓰기는
+별도 리스너 스레드(QueueListener)가 처리하므로 이벤트 루프가 로그 I/O로 막히지 않습니다.
+
+환경변수:
+- LOG_LEVEL: 숫자(10=DEBUG, 20=INFO, ...) 또는 이름(DEBUG, INFO, ...) (기본 20)
+- LOG_FORMAT: json | text (기본 json, text는 사람이 읽기 쉬운 한 줄 형식)
+- LOG_<카테고리>: 카테고리별 출력 토글 (true/false)
+  - LOG_PROMPT: 슈퍼바이저 프롬프트 전문 (기본 false)
+  - LOG_HISTORY: 이력 저장/로드 이벤트 (기본 true)
+  - LOG_WEIGHTS: 가중치/라우팅 패턴 상세 (기본 false)
+  - LOG_RESULT: 워크플로우 결과 전체 (기본 false)
+  - 그 외 카테고리(supervisor, workflow, api, model 등)는 기본 true
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+# 로거가 utils보다 먼저 import될 수 있으므로 여기서도 .env 로드
+load_dotenv()
+
+# 기본값이 꺼져 있는 카테고리 (대용량 또는 요청마다 반복되는 출력)
+DEFAULT_CATEGORY_TOGGLES: Dict[str, bool] = {
+    "prompt": False,
+    "history": True,
+    "weights": False,
+    "result": False,
+}
+
+ROOT_LOGGER_NAME = "sports_agent"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configure_lock = threading.Lock()
+
+
+class JsonLineFormatter(logging.Formatter):
+    """레코드를 JSON 한 줄로 포맷팅 (fields는 최상위 키로 병합)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "category": getattr(record, "category", record.name),
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextLineFormatter(logging.Formatter):
+    """사람이 읽기 쉬운 한 줄 형식 (메시지 + key=value)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", None) or {}
+        extras = " ".join(f"{key}={value}" for key, value in fields.items())
+        line = f"[{record.levelname}] {getattr(record, 'category', record.name)}: {record.getMessage()}"
+        if extras:
+            line = f"{line} {extras}"
+        if record.exc_info:
+            line = f"{line}\n{self.formatException(record.exc_info)}"
+        return line
+
+
+class _FieldPreservingQueueHandler(logging.handlers.QueueHandler):
+    """포맷팅을 리스너 스레드로 미루는 QueueHandler (메시지 인자만 미리 병합)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def parse_log_level(value: str) -> int:
+    """LOG_LEVEL 해석 (숫자 또는 레벨 이름, 잘못된 값은 INFO)"""
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def configure_logging() -> None:
+    """큐 핸들러/리스너 구성 (여러 번 호출해도 1회만 적용)"""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler(sys.stdout)
+        if os.getenv("LOG_FORMAT", "json").lower() == "text":
+            stream_handler.setFormatter(TextLineFormatter())
+        else:
+            stream_handler.setFormatter(JsonLineFormatter())
+
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.setLevel(parse_log_level(os.getenv("LOG_LEVEL", "20")))
+        root.propagate = False
+        root.handlers = [_FieldPreservingQueueHandler(log_queue)]
+
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _listener.start()
+        # 종료 시 큐에 남은 로그 flush
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """리스너 중지 (큐에 남은 레코드를 모두 출력한 뒤 종료)"""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def category_enabled(category: str) -> bool:
+    """카테고리 출력 토글 (LOG_<CATEGORY> 환경변수, 미설정 시 기본값)"""
+    default = DEFAULT_CATEGORY_TOGGLES.get(category, True)
+    value = os.getenv(f"LOG_{category.upper()}")
+    if value is None:
+        return default
+    return value.lower() == "true"
+
+
+class StructuredLogger:
+    """카테고리 단위 로거 (message + 키워드 필드)"""
+
+    def __init__(self, category: str):
+        configure_logging()
+        self.category = category
+        self.enabled = category_enabled(category)
+        self._logger = logging.getLogger(f"{ROOT_LOGGER_NAME}.{category}")
+
+    def is_enabled_for(self, level: int) -> bool:
+        """출력 여부 (비싼 메시지를 만들기 전에 확인)"""
+        return self.enabled and self._logger.isEnabledFor(level)
+
+    def _log(self, level: int, message: str, exc_info=None, **fields) -> None:
+        if not self.is_enabled_for(level):
+            return
+        self._logger.log(
+            level, message, exc_info=exc_info,
+            extra={"category": self.category, "fields": fields}
+        )
+
+    def debug(self, message: str, **fields) -> None:
+        self._log(logging.DEBUG, message, **fields)
+
+    def info(self, message: str, **fields) -> None:
+        self._log(logging.INFO, message, **fields)
+
+    def warning(self, message: str, **fields) -> None:
+        self._log(logging.WARNING, message, **fields)
+
+    def error(self, message: str, exc_info=None, **fields) -> None:
+        self._log(logging.ERROR, message, exc_info=exc_info, **fields)
+
+
+_loggers: Dict[str, StructuredLogger] = {}
+
+
+def get_logger(category: str) -> StructuredLogger:
+    """카테고리별 공용 로거 반환"""
+    logger = _loggers.get(category)
+    if logger is None:
+        logger = _loggers.setdefault(category, StructuredLogger(category))
+    return logger
@@ -3,7 +3,8 @@
 """
 import os
 import re
-from typing import Dict, Any, Optional, Literal
+import threading
+from typing import Dict, Any, Optional, Literal, Tuple
 from dotenv import load_dotenv
 import vertexai
 from vertexai.generative_models import GenerativeModel
@@ -16,8 +17,19 @@ from pydantic import BaseModel, Field
 load_dotenv()
 
 # 전역 모델 캐시 (성능 최적화)
-_cached_gemini_model: Optional[ChatVertexAI] = None
+# 키: (모델명, 로케이션, temperature) → 프로세스 전체에서 클라이언트/전송 상태 재사용
+_cached_gemini_models: Dict[Tuple[str, str, float], ChatVertexAI] = {}
+_cached_structured_models: Dict[Tuple[str, str, float], Any] = {}
 _cached_langfuse_client: Optional[Langfuse] = None
+_model_cache_lock = threading.Lock()
+
+# 클라이언트 재사용/재생성 카운터 (부하 상황에서 재사용 여부 확인용)
+_model_client_stats = {
+    "client_builds": 0,
+    "client_reuses": 0,
+    "structured_builds": 0,
+    "structured_reuses": 0
+}
 
 
 class AgentSelection(BaseModel):
@@ -37,8 +49,12 @@ class AgentSelection(BaseModel):
 
 def initialize_langfuse() -> tuple[Optional[Langfuse], Optional[Any]]:
     """
-    Langfuse 초기화 (선택적)
+    Langfuse 초기화 (선택적, 생성된 클라이언트는 재사용)
     """
+    global _cached_langfuse_client
+    if _cached_langfuse_client is not None:
+        return _cached_langfuse_client, None
+    
     try:
         from langfuse import Langfuse
         
@@ -47,11 +63,12 @@ def initialize_langfuse() -> tuple[Optional[Langfuse], Optional[Any]]:
         host = os.getenv("LANGFUSE_HOST")
         
         if public_key and secret_key:
-            return Langfuse(
+            _cached_langfuse_client = Langfuse(
                 public_key=public_key,
                 secret_key=secret_key,
                 host=host
-            ), None
+            )
+            return _cached_langfuse_client, None
         else:
             print("⚠️ Langfuse 환경변수가 설정되지 않았습니다. 추적 기능을 사용할 수 없습니다.")
             return None, None
@@ -79,13 +96,29 @@ def initialize_vertexai():
         raise
 
 
-def initialize_gemini_model():
-    """Gemini 모델 초기화 (LangChain ChatVertexAI)"""
+def get_supervisor_model_key() -> Tuple[str, str, float]:
+    """환경변수 기준 슈퍼바이저 모델 캐시 키 (모델명, 로케이션, temperature)"""
+    return (
+        os.getenv("SUPERVISOR_MODEL", "gemini-1.5-flash"),
+        os.getenv("GCP_VERTEXAI_LOCATION", "us-central1"),
+        0.1  # 일관성을 위해 낮은 temperature
+    )
+
+
+def initialize_gemini_model(model_name: Optional[str] = None, location: Optional[str] = None, temperature: Optional[float] = None):
+    """Gemini 모델 초기화 (LangChain ChatVertexAI, 호출할 때마다 새로 생성)"""
     try:
         # 환경변수 읽기
+        default_model, default_location, default_temperature = get_supervisor_model_key()
         project_id = os.getenv("GCP_PROJECT_ID")
-        location = os.getenv("GCP_VERTEXAI_LOCATION", "us-central1")
-        model_name = os.getenv("SUPERVISOR_MODEL", "gemini-1.5-flash")
+        location = location or default_location
+        model_name = model_name or default_model
+        temperature = default_temperature if temperature is None else temperature
+        
+        # 오프라인 테스트용 가짜 백엔드
+        if model_name == "fake":
+            from .fake_model import create_fake_model_from_env
+            return create_fake_model_from_env()
         
         if not project_id:
             raise ValueError("GCP_PROJECT_ID 환경변수가 설정되지 않았습니다.")
@@ -95,7 +128,7 @@ def initialize_gemini_model():
             model=model_name,
             project=project_id,
             location=location,
-            temperature=0.1,  # 일관성을 위해 낮은 temperature
+            temperature=temperature,
         )
         print(f"✅ ChatVertexAI 모델 초기화 완료: {model_name} (Project: {project_id})")
         
@@ -105,6 +138,74 @@ def initialize_gemini_model():
         raise
 
 
+def get_gemini_model(model_name: Optional[str] = None, location: Optional[str] = None, temperature: Optional[float] = None):
+    """캐시된 Gemini 모델 반환 (키별로 프로세스당 1회 생성)"""
+    default_model, default_location, default_temperature = get_supervisor_model_key()
+    key = (
+        model_name or default_model,
+        location or default_location,
+        default_temperature if temperature is None else temperature
+    )
+    
+    with _model_cache_lock:
+        model = _cached_gemini_models.get(key)
+        if model is not None:
+            _model_client_stats["client_reuses"] += 1
+            return model
+        
+        model = initialize_gemini_model(*key)
+        _cached_gemini_models[key] = model
+        _model_client_stats["client_builds"] += 1
+        return model
+
+
+def get_structured_supervisor_model(model_name: Optional[str] = None, location: Optional[str] = None, temperature: Optional[float] = None):
+    """캐시된 with_structured_output(AgentSelection) 래퍼 반환"""
+    default_model, default_location, default_temperature = get_supervisor_model_key()
+    key = (
+        model_name or default_model,
+        location or default_location,
+        default_temperature if temperature is None else temperature
+    )
+    
+    with _model_cache_lock:
+        structured_model = _cached_structured_models.get(key)
+        if structured_model is not None:
+            _model_client_stats["structured_reuses"] += 1
+            return structured_model
+    
+    model = get_gemini_model(*key)
+    
+    with _model_cache_lock:
+        structured_model = _cached_structured_models.get(key)
+        if structured_model is None:
+            structured_model = model.with_structured_output(AgentSelection)
+            _cached_structured_models[key] = structured_model
+            _model_client_stats["structured_builds"] += 1
+        else:
+            _model_client_stats["structured_reuses"] += 1
+        return structured_model
+
+
+def get_model_client_stats() -> Dict[str, Any]:
+    """모델 클라이언트 재사용/재생성 통계"""
+    with _model_cache_lock:
+        return {
+            **_model_client_stats,
+            "cached_clients": [
+                {"model": key[0], "location": key[1], "temperature": key[2]}
+                for key in _cached_gemini_models
+            ]
+        }
+
+
+def clear_model_cache():
+    """모델 캐시 초기화 (다음 호출 시 재생성)"""
+    with _model_cache_lock:
+        _cached_gemini_models.clear()
+        _cached_structured_models.clear()
+
+
 def extract_agent_name(llm_response: str) -> str:
     """
     LLM 응답에서 에이전트 이름 추출 (운동 추천 에이전트)
@@ -153,6 +254,10 @@ def validate_environment():
     required_vars = ["GCP_PROJECT_ID"]
     missing_vars = []
     
+    # 가짜 백엔드는 GCP 설정 없이 실행 가능
+    if os.getenv("SUPERVISOR_MODEL") == "fake":
+        return True
+    
     for var in required_vars:
         if not os.getenv(var):
             missing_vars.append(var)
@@ -0,0 +1,265 @@
+"""
+에이전트 가중치 저장소 모듈 (버전 관리 + 원자적 교체)
+
+가중치를 불변(immutable) 스냅샷으로 메모리에 보관하고, 변경 시 새 버전의 스냅샷을
+만들어 참조를 한 번에 교체합니다. 요청 경로에서는 환경변수를 다시 읽거나 파싱하지 않습니다.
+- 업데이트는 .env 파일에 한 번의 쓰기(임시 파일 + os.replace)로 저장
+- WEIGHTS_WATCH_INTERVAL_SECONDS > 0이면 .env 파일의 외부 수정을 감지해 자동 반영
+- 변경 시 등록된 리스너(캐시 무효화 등)에 새 스냅샷을 전달
+- 공유 상태 백엔드(shared_state)가 있으면 버전/가중치를 백엔드에 게시하고,
+  다른 워커의 변경 알림을 받아 같은 버전으로 교체
+
+환경변수:
+- WEIGHT_<에이전트명>: 초기 가중치 (기본 1.0)
+- WEIGHTS_ENV_FILE: 가중치를 저장할 .env 경로 (기본 src/.env)
+- WEIGHTS_WATCH_INTERVAL_SECONDS: 파일 감시 주기 (기본 0, 감시 안 함)
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional
+
+from dotenv import dotenv_values
+
+from .shared_state import get_shared_state
+from .structured_logging import get_logger
+
+SPORTS_AGENTS = ["축구_에이전트", "농구_에이전트", "야구_에이전트", "테니스_에이전트"]
+
+DEFAULT_ENV_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+
+logger = get_logger("weights")
+
+
+def weight_env_key(agent: str) -> str:
+    return f"WEIGHT_{agent}"
+
+
+@dataclass(frozen=True)
+class WeightsSnapshot:
+    """불변 가중치 스냅샷"""
+    version: int
+    weights: Mapping[str, float]
+    updated_at: float
+    source: str  # env | api | file | shared
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self.weights)
+
+
+def parse_weights(values: Mapping[str, Optional[str]], agents: List[str]) -> Dict[str, float]:
+    """환경변수/파일 값에서 가중치 파싱 (잘못된 값은 1.0)"""
+    weights = {}
+    for agent in agents:
+        env_key = weight_env_key(agent)
+        try:
+            weights[agent] = float(values.get(env_key) or "1.0")
+        except (ValueError, TypeError):
+            logger.warning("⚠️ 가중치 환경변수가 잘못된 형태입니다. 기본값 1.0을 사용합니다.", env_key=env_key)
+            weights[agent] = 1.0
+    return weights
+
+
+class WeightStore:
+    """버전 관리되는 가중치 저장소"""
+
+    def __init__(self, env_file: str = DEFAULT_ENV_FILE, agents: Optional[List[str]] = None, shared=None):
+        self.env_file = env_file
+        self.agents = list(agents or SPORTS_AGENTS)
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[WeightsSnapshot], None]] = []
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+        # 이 스레드가 게시 중인 변경의 출처 (게시 중 돌아오는 자기 알림에 사용)
+        self._publishing = threading.local()
+        self._file_mtime = self._current_mtime()
+        self._snapshot = self._make_snapshot(1, parse_weights(os.environ, self.agents), "env")
+        if shared is not None:
+            self._attach_shared(shared)
+
+    def _attach_shared(self, shared) -> None:
+        """공유 가중치가 있으면 그 버전으로 시작, 없으면 현재 가중치를 최초 게시"""
+        current = shared.load_weights()
+        if current is None:
+            version = shared.publish_weights(self._snapshot.as_dict())
+            current = (version, self._snapshot.as_dict())
+        version, weights = current
+        with self._lock:
+            self._swap({agent: float(weights.get(agent, 1.0)) for agent in self.agents}, "shared", version)
+        shared.subscribe_weights(self._on_shared_change)
+
+    def _on_shared_change(self, version: int, weights: Dict[str, float]) -> None:
+        """공유 백엔드 알림 처리 (이미 반영한 버전이면 무시, 자신이 게시한 변경은 원래 출처 유지)"""
+        self._apply_version(version, weights, getattr(self._publishing, "source", None) or "shared")
+
+    def _publish(self, weights: Dict[str, float], source: str) -> WeightsSnapshot:
+        """공유 백엔드에 게시하고 발급된 버전으로 반영 (게시 중 동기 알림도 source로 기록)"""
+        self._publishing.source = source
+        try:
+            version = self.shared.publish_weights(weights)
+        finally:
+            self._publishing.source = None
+        self._apply_version(version, weights, source)
+        return self._snapshot
+
+    def _apply_version(self, version: int, weights: Dict[str, float], source: str) -> Optional[WeightsSnapshot]:
+        with self._lock:
+            if version <= self._snapshot.version:
+                return None
+            snapshot = self._swap(weights, source, version)
+        logger.info("🔄 가중치 반영", version=snapshot.version, source=source, weights=snapshot.as_dict())
+        self._notify(snapshot)
+        return snapshot
+
+    @staticmethod
+    def _make_snapshot(version: int, weights: Dict[str, float], source: str) -> WeightsSnapshot:
+        return WeightsSnapshot(
+            version=version,
+            weights=MappingProxyType(dict(weights)),
+            updated_at=time.time(),
+            source=source
+        )
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.env_file).st_mtime
+        except OSError:
+            return None
+
+    # ------------------------------------------------------------------
+    # 조회 / 변경
+    # ------------------------------------------------------------------
+    def current(self) -> WeightsSnapshot:
+        """현재 스냅샷 (참조 읽기만 하므로 락 불필요)"""
+        return self._snapshot
+
+    def subscribe(self, listener: Callable[[WeightsSnapshot], None]) -> None:
+        """가중치 변경 리스너 등록"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _swap(self, weights: Dict[str, float], source: str, version: Optional[int] = None) -> WeightsSnapshot:
+        """새 버전 스냅샷으로 교체 (락을 잡은 상태에서 호출, version 미지정 시 +1)"""
+        if version is None:
+            version = self._snapshot.version + 1
+        snapshot = self._make_snapshot(version, weights, source)
+        self._snapshot = snapshot
+        # 기존 코드 호환: os.environ에도 반영
+        for agent, weight in snapshot.weights.items():
+            os.environ[weight_env_key(agent)] = str(weight)
+        return snapshot
+
+    def _notify(self, snapshot: WeightsSnapshot) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error("❌ 가중치 변경 리스너 오류", error=str(e))
+
+    def update(self, updates: Dict[str, float], persist: bool = True) -> WeightsSnapshot:
+        """
+        일부 또는 전체 가중치 변경 → 새 버전 스냅샷으로 원자적 교체
+        persist=True이면 .env 파일에 한 번에 저장
+        """
+        with self._lock:
+            weights = self._snapshot.as_dict()
+            weights.update(updates)
+            if persist:
+                self._persist(weights)
+            if self.shared is None:
+                snapshot = self._swap(weights, "api")
+        
+        if self.shared is not None:
+            # 공유 버전을 발급받아 반영 (다른 워커는 알림으로 같은 버전을 반영)
+            return self._publish(weights, "api")
+        
+        logger.info("⚖️ 가중치 업데이트", version=snapshot.version, weights=snapshot.as_dict())
+        self._notify(snapshot)
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # 파일 저장 / 감시
+    # ------------------------------------------------------------------
+    def _persist(self, weights: Dict[str, float]) -> None:
+        """.env의 WEIGHT_ 줄만 교체해 임시 파일에 쓴 뒤 os.replace (한 번의 쓰기)"""
+        try:
+            with open(self.env_file, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+
+        pending = {weight_env_key(agent): weight for agent, weight in weights.items()}
+        output = []
+        for line in lines:
+            key = line.split("=", 1)[0].strip()
+            if key.startswith("export "):
+                key = key[len("export "):].strip()
+            if key in pending:
+                output.append(f"{key}={pending.pop(key)}")
+            else:
+                output.append(line)
+        output.extend(f"{key}={value}" for key, value in pending.items())
+
+        tmp_path = self.env_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(output) + "\n")
+        os.replace(tmp_path, self.env_file)
+        # 자신이 쓴 변경은 감시 대상에서 제외
+        self._file_mtime = self._current_mtime()
+
+    def reload_from_file(self) -> Optional[WeightsSnapshot]:
+        """.env 파일의 가중치가 현재와 다르면 새 버전으로 교체, 변경 없으면 None"""
+        with self._lock:
+            self._file_mtime = self._current_mtime()
+            if self._file_mtime is None:
+                return None
+            weights = parse_weights(dotenv_values(self.env_file), self.agents)
+            if weights == self._snapshot.as_dict():
+                return None
+            if self.shared is None:
+                snapshot = self._swap(weights, "file")
+        
+        if self.shared is not None:
+            return self._publish(weights, "file")
+
+        logger.info("🔄 .env 가중치 변경 감지", version=snapshot.version, weights=snapshot.as_dict())
+        self._notify(snapshot)
+        return snapshot
+
+    def start_watching(self, interval_seconds: float) -> None:
+        """백그라운드 스레드에서 .env 파일 mtime을 주기적으로 확인"""
+        if interval_seconds <= 0 or self._watch_thread is not None:
+            return
+
+        def watch():
+            while not self._watch_stop.wait(interval_seconds):
+                if self._current_mtime() != self._file_mtime:
+                    try:
+                        self.reload_from_file()
+                    except Exception as e:
+                        logger.error("❌ 가중치 파일 반영 실패", error=str(e))
+
+        self._watch_thread = threading.Thread(target=watch, name="weights-watcher", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        self._watch_stop.set()
+
+
+_weight_store: Optional[WeightStore] = None
+_weight_store_lock = threading.Lock()
+
+
+def get_weight_store() -> WeightStore:
+    """프로세스 공용 가중치 저장소 반환 (최초 호출 시 환경변수로 생성)"""
+    global _weight_store
+    if _weight_store is None:
+        with _weight_store_lock:
+            if _weight_store is None:
+                store = WeightStore(os.getenv("WEIGHTS_ENV_FILE", DEFAULT_ENV_FILE), shared=get_shared_state())
+                store.start_watching(float(os.getenv("WEIGHTS_WATCH_INTERVAL_SECONDS", "0")))
+                _weight_store = store
+    return _weight_store
@@ -1,105 +1,393 @@
 """
 가중치 및 라우팅 패턴 관리 모듈 (운동 추천 에이전트 버전)
 """
-import json
 import os
+import random
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Tuple
-from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Union
 
+from .history_store import JsonlHistoryStore
+from .sqlite_history_store import SqliteHistoryStore, SqlAggregateCounters
+from .counters import RoutingCounters, DecayedRoutingCounters, SharedRecordCounters
+from .metrics import HISTORY_LOAD_DURATION, HISTORY_SAVE_DURATION
+from .structured_logging import get_logger
+from .weight_store import get_weight_store
+from .partitions import PartitionedRoutingHistory, StorePartitionedHistory
+from .shared_state import get_shared_state, KeyValueHistoryStore
 
-# 선택 이력 파일 경로
+history_logger = get_logger("history")
+weights_logger = get_logger("weights")
+
+
+# 선택 이력 파일 경로 (기존 JSON 배열 파일, 마이그레이션 원본)
 ROUTING_HISTORY_FILE = "routing_history.json"
 
+# append-only 이력 로그 경로 및 설정
+ROUTING_HISTORY_LOG_FILE = os.getenv("ROUTING_HISTORY_LOG_FILE", "routing_history.jsonl")
+ROUTING_HISTORY_RETENTION = int(os.getenv("ROUTING_HISTORY_RETENTION", "1000"))
+ROUTING_HISTORY_SEGMENT_BYTES = int(os.getenv("ROUTING_HISTORY_SEGMENT_BYTES", str(256 * 1024)))
+
+# 이력 저장소 백엔드 (file: JSONL 로그, sqlite: SQLite WAL + 인덱스 집계)
+ROUTING_HISTORY_BACKEND = os.getenv("ROUTING_HISTORY_BACKEND", "file")
+ROUTING_HISTORY_DB_FILE = os.getenv("ROUTING_HISTORY_DB_FILE", "routing_history.db")
+# sqlite 백엔드에서 SQL 집계 결과를 재사용하는 시간 (다른 워커 기록이 반영되는 최대 지연)
+ROUTING_SQLITE_AGGREGATE_TTL_MS = float(os.getenv("ROUTING_SQLITE_AGGREGATE_TTL_MS", "250"))
+
+# 라우팅 비율 계산 방식 (window: 최근 N개 동일 가중치, decay: 반감기 기반 시간 감쇠)
+ROUTING_RATIO_MODE = os.getenv("ROUTING_RATIO_MODE", "window")
+ROUTING_DECAY_HALF_LIFE_SECONDS = float(os.getenv("ROUTING_DECAY_HALF_LIFE_SECONDS", "300"))
+
+# 파티션(사용자/테넌트/질문 클러스터)별 이력 설정
+ROUTING_PARTITION_DIR = os.getenv("ROUTING_PARTITION_DIR", "routing_history_partitions")
+ROUTING_PARTITION_RETENTION = int(os.getenv("ROUTING_PARTITION_RETENTION", "1000"))
+ROUTING_PARTITION_MAX_LOADED = int(os.getenv("ROUTING_PARTITION_MAX_LOADED", "256"))
+# 파티션 이력이 이 개수보다 적으면 전역 비율 사용
+ROUTING_PARTITION_MIN_RECORDS = int(os.getenv("ROUTING_PARTITION_MIN_RECORDS", "20"))
+
+# (에이전트별 횟수, 에이전트별 확신도 합계, 총 횟수) - decay 모드의 횟수는 총 횟수 기준으로 환산한 유효 횟수
+CountersSnapshot = Tuple[Dict[str, float], Dict[str, float], int]
+
+HistoryStore = Union[JsonlHistoryStore, SqliteHistoryStore, KeyValueHistoryStore]
+
+_history_store: HistoryStore = None
+
+# 배치 요청 중에는 이력 레코드를 모아 두었다가 묶어서 기록 (group commit)
+BATCH_HISTORY_CHUNK_SIZE = int(os.getenv("BATCH_HISTORY_CHUNK_SIZE", "100"))
+_pending_history_writes: ContextVar[Optional["HistoryWriteBatch"]] = ContextVar("pending_history_writes", default=None)
+_routing_counters: RoutingCounters = None
+_partitioned_history: PartitionedRoutingHistory = None
+
+
+def _create_file_history_store() -> JsonlHistoryStore:
+    return JsonlHistoryStore(
+        ROUTING_HISTORY_LOG_FILE,
+        legacy_path=ROUTING_HISTORY_FILE,
+        retention=ROUTING_HISTORY_RETENTION,
+        segment_max_bytes=ROUTING_HISTORY_SEGMENT_BYTES,
+    )
+
+
+def get_history_store() -> HistoryStore:
+    """프로세스 공용 이력 저장소 반환 (최초 호출 시 ROUTING_HISTORY_BACKEND에 맞게 생성)"""
+    global _history_store
+    if _history_store is None:
+        shared = get_shared_state()
+        if shared is not None:
+            # 공유 상태 백엔드의 이력 저장소 사용 (워커/노드 간 공유)
+            shared_store = shared.history_store()
+            migrated = 0
+            if isinstance(shared_store, SqliteHistoryStore):
+                migrated = shared_store.migrate_from(_create_file_history_store().load)
+            if migrated:
+                history_logger.info("✅ 파일 이력을 공유 저장소로 마이그레이션했습니다", records=migrated)
+            _history_store = shared_store
+        elif ROUTING_HISTORY_BACKEND == "sqlite":
+            store = SqliteHistoryStore(ROUTING_HISTORY_DB_FILE, retention=ROUTING_HISTORY_RETENTION)
+            # 비어 있는 DB는 기존 파일 이력(JSONL/JSON)으로 채움
+            migrated = store.migrate_from(_create_file_history_store().load)
+            if migrated:
+                history_logger.info("✅ 파일 이력을 SQLite로 마이그레이션했습니다", records=migrated)
+            _history_store = store
+        elif ROUTING_HISTORY_BACKEND == "file":
+            _history_store = _create_file_history_store()
+        else:
+            raise ValueError(f"지원하지 않는 ROUTING_HISTORY_BACKEND: {ROUTING_HISTORY_BACKEND}")
+    return _history_store
+
+
+def get_routing_counters() -> RoutingCounters:
+    """프로세스 공용 라우팅 집계 반환 (최초 호출 시 디스크 이력으로 재구성)"""
+    global _routing_counters
+    if _routing_counters is None:
+        counters = create_shared_counters(ROUTING_HISTORY_RETENTION)
+        if counters is None:
+            counters = create_routing_counters(ROUTING_HISTORY_RETENTION)
+            counters.rebuild(load_routing_history())
+        _routing_counters = counters
+    return _routing_counters
+
+
+def create_shared_counters(window: int, partition_key: Optional[str] = None) -> Optional[RoutingCounters]:
+    """
+    이력 저장소를 여러 워커가 공유하면(SQLite 또는 공유 상태 백엔드) 저장소에서 다시 집계하는 카운터,
+    프로세스 로컬 파일 이력이면 None (partition_key 지정 시 해당 파티션 집계)
+    """
+    store = get_history_store()
+    ttl_seconds = ROUTING_SQLITE_AGGREGATE_TTL_MS / 1000
+    if isinstance(store, SqliteHistoryStore) and ROUTING_RATIO_MODE == "window":
+        # 워커 간 공유되는 인덱스 SQL 집계
+        return SqlAggregateCounters(store, ttl_seconds=ttl_seconds, partition=partition_key, window=window)
+    shared = get_shared_state()
+    if shared is not None:
+        return shared.routing_counters(create_routing_counters, window, partition_key, ttl_seconds)
+    if isinstance(store, SqliteHistoryStore):
+        # decay 모드: 공유 SQLite의 최근 레코드로 주기적으로 다시 집계
+        return SharedRecordCounters(
+            lambda: store.tail(window, partition_key), create_routing_counters, window=window, ttl_seconds=ttl_seconds
+        )
+    return None
+
+
+def create_routing_counters(window: int) -> RoutingCounters:
+    """ROUTING_RATIO_MODE에 맞는 빈 집계 생성 (전역/파티션 공통)"""
+    if ROUTING_RATIO_MODE == "decay":
+        return DecayedRoutingCounters(window=window, half_life_seconds=ROUTING_DECAY_HALF_LIFE_SECONDS)
+    if ROUTING_RATIO_MODE == "window":
+        return RoutingCounters(window=window)
+    raise ValueError(f"지원하지 않는 ROUTING_RATIO_MODE: {ROUTING_RATIO_MODE}")
+
+
+def get_partitioned_history() -> PartitionedRoutingHistory:
+    """
+    프로세스 공용 파티션 이력 반환 (최초 호출 시 생성)
+    공유 이력 저장소(SQLite/공유 상태 백엔드)면 파티션 파일 없이 저장소에서 파티션별로 집계
+    """
+    global _partitioned_history
+    if _partitioned_history is None:
+        if isinstance(get_history_store(), SqliteHistoryStore) or get_shared_state() is not None:
+            _partitioned_history = StorePartitionedHistory(
+                lambda partition_key: create_shared_counters(ROUTING_PARTITION_RETENTION, partition_key),
+                retention=ROUTING_PARTITION_RETENTION,
+                max_loaded=ROUTING_PARTITION_MAX_LOADED,
+            )
+        else:
+            _partitioned_history = PartitionedRoutingHistory(
+                ROUTING_PARTITION_DIR,
+                counters_factory=create_routing_counters,
+                retention=ROUTING_PARTITION_RETENTION,
+                max_loaded=ROUTING_PARTITION_MAX_LOADED,
+                segment_max_bytes=ROUTING_HISTORY_SEGMENT_BYTES,
+            )
+    return _partitioned_history
+
 
 def load_routing_history() -> List[Dict]:
     """선택 이력 로드"""
-    if not os.path.exists(ROUTING_HISTORY_FILE):
-        return []
-    
     try:
-        with open(ROUTING_HISTORY_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        print("⚠️ 선택 이력 파일을 읽을 수 없어 새로 시작합니다.")
+        with HISTORY_LOAD_DURATION.time():
+            return get_history_store().load()
+    except OSError as e:
+        history_logger.warning("⚠️ 선택 이력 파일을 읽을 수 없어 새로 시작합니다", error=str(e))
         return []
 
 
-def save_routing_choice(user_query: str, selected_agent: str, confidence: float, reason: str):
-    """선택 결과를 이력에 저장"""
-    history = load_routing_history()
-    
+def save_routing_choice(
+    user_query: str,
+    selected_agent: str,
+    confidence: float,
+    reason: str,
+    weights_version: Optional[int] = None,
+    partition_key: Optional[str] = None
+):
+    """
+    선택 결과를 이력에 저장 (로그에 한 줄 추가, 결정에 사용된 가중치 버전 포함)
+    partition_key가 있으면 전역 이력과 함께 파티션 이력에도 기록
+    """
     new_record = {
         "timestamp": datetime.now().isoformat(),
         "user_query": user_query,
         "selected_agent": selected_agent,
         "confidence": confidence,
-        "reason": reason
+        "reason": reason,
+        "weights_version": weights_version if weights_version is not None else get_weight_store().current().version
     }
+    if partition_key:
+        new_record["partition"] = partition_key
     
-    history.append(new_record)
-    
-    # 최근 1000개만 유지 (메모리 관리)
-    if len(history) > 1000:
-        history = history[-1000:]
+    pending = _pending_history_writes.get()
+    if pending is not None:
+        # 배치 중: 버퍼에 모았다가 묶어서 기록 (집계도 기록할 때 함께 반영)
+        pending.add(new_record)
+        return
     
     try:
-        with open(ROUTING_HISTORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
-        print(f"✅ 선택 이력 저장 완료: {selected_agent} (총 {len(history)}개)")
+        persist_routing_records([new_record])
+        history_logger.info("✅ 선택 이력 저장 완료", selected_agent=selected_agent, total=get_routing_counters().total)
     except Exception as e:
-        print(f"❌ 선택 이력 저장 실패: {e}")
+        history_logger.error("❌ 선택 이력 저장 실패", error=str(e))
 
 
-def get_real_routing_patterns() -> Tuple[Dict[str, float], int]:
-    """실제 선택 이력에서 패턴 계산"""
-    history = load_routing_history()
-    
-    if not history:
-        print("📊 선택 이력이 없어 기본 패턴을 사용합니다.")
+def persist_routing_records(records: List[Dict]) -> None:
+    """레코드를 이력(전역 + 파티션)에 한 번에 기록한 뒤 집계에 반영 (기록된 레코드만 집계)"""
+    # 집계를 먼저 준비해야 최초 생성 시 디스크에서 다시 읽은 레코드를 한 번 더 더하지 않음
+    counters = get_routing_counters()
+    with HISTORY_SAVE_DURATION.time():
+        get_history_store().append_many(records)
+        write_partition_records(records)
+    for record in records:
+        counters.add(record["selected_agent"], record["confidence"])
+
+
+class HistoryWriteBatch:
+    """
+    배치 요청의 이력 버퍼 (chunk_size개가 모일 때마다 한 번에 기록, 남은 것은 flush로 기록)
+    ContextVar가 아닌 객체로 들고 다니므로 스트리밍 응답이 다른 컨텍스트에서 정리되어도 flush 가능
+    """
+
+    def __init__(self, chunk_size: int = BATCH_HISTORY_CHUNK_SIZE):
+        self.chunk_size = max(1, chunk_size)
+        self.written = 0
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict) -> None:
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) < self.chunk_size:
+                return
+            records, self._buffer = self._buffer, []
+        self._write(records)
+
+    def flush(self) -> None:
+        with self._lock:
+            records, self._buffer = self._buffer, []
+        self._write(records)
+
+    def _write(self, records: List[Dict]) -> None:
+        if not records:
+            return
+        try:
+            persist_routing_records(records)
+            self.written += len(records)
+            history_logger.info("✅ 배치 이력 일괄 저장 완료", records=len(records))
+        except Exception as e:
+            history_logger.error("❌ 배치 이력 저장 실패", records=len(records), error=str(e))
+
+
+@contextmanager
+def history_batch_scope(batch: HistoryWriteBatch):
+    """
+    현재 컨텍스트(보통 배치의 개별 asyncio 태스크 안)에서 저장되는 이력을 batch에 모음
+    같은 태스크 안에서 set/reset하므로 컨텍스트가 어긋나지 않음
+    """
+    token = _pending_history_writes.set(batch)
+    try:
+        yield batch
+    finally:
+        _pending_history_writes.reset(token)
+
+
+def query_routing_history(limit: int, **filters) -> Dict:
+    """
+    커서 기반 이력 페이지 조회 (before/after 커서, agent/since/until/partition 필터)
+    file 백엔드는 로그 끝부분 세그먼트만, sqlite 백엔드는 인덱스만 읽음
+    """
+    return get_history_store().query(min(limit, ROUTING_HISTORY_RETENTION), **filters)
+
+
+def write_partition_records(records: List[Dict]) -> None:
+    """레코드를 파티션별로 묶어 파티션당 한 번에 기록 (파티션 집계도 함께 반영)"""
+    by_partition: Dict[str, List[Dict]] = {}
+    for record in records:
+        if record.get("partition"):
+            by_partition.setdefault(record["partition"], []).append(record)
+    partitioned_history = get_partitioned_history()
+    for partition_key, partition_records in by_partition.items():
+        partitioned_history.append_and_count(partition_key, partition_records)
+
+
+def clear_routing_history() -> bool:
+    """선택 이력 초기화 (파티션 이력 포함), 삭제할 이력이 있었는지 여부 반환"""
+    cleared = get_history_store().clear()
+    partitions_cleared = get_partitioned_history().clear()
+    get_routing_counters().clear()
+    return cleared or partitions_cleared
+
+
+def get_real_routing_patterns(snapshot: Optional[CountersSnapshot] = None) -> Tuple[Dict[str, float], int]:
+    """실제 선택 이력에서 패턴 계산 (메모리 집계 사용, snapshot 지정 시 해당 시점 기준)"""
+    if snapshot is None:
+        snapshot = get_routing_counters().snapshot()
+    agent_counts, _, total_count = snapshot
+    
+    if total_count == 0:
+        weights_logger.debug("📊 선택 이력이 없어 기본 패턴을 사용합니다.")
         return get_mock_routing_data("기본")
     
-    # 에이전트별 선택 횟수 계산
-    agent_counts = defaultdict(int)
-    total_count = len(history)
-    
-    for record in history:
-        agent_counts[record["selected_agent"]] += 1
-    
-    # 비율 계산
-    agent_ratios = {}
     sports_agents = ["축구_에이전트", "농구_에이전트", "야구_에이전트", "테니스_에이전트"]
+    agent_ratios = {
+        agent: agent_counts.get(agent, 0) / total_count
+        for agent in sports_agents
+    }
     
-    for agent in sports_agents:
-        agent_ratios[agent] = agent_counts[agent] / total_count if total_count > 0 else 0.0
-    
-    print(f"📊 실제 패턴 (총 {total_count}회):")
-    for agent, ratio in agent_ratios.items():
-        count = agent_counts[agent]
-        print(f"   {agent}: {ratio:.1%} ({count}회)")
+    weights_logger.debug("📊 실제 패턴", total=total_count, ratios=agent_ratios)
     
     return agent_ratios, total_count
 
 
-def get_routing_data_with_history(user_query: str) -> Tuple[Dict[str, float], int]:
+def get_routing_data_with_history(user_query: str, snapshot: Optional[CountersSnapshot] = None) -> Tuple[Dict[str, float], int]:
     """
     선택 이력이 있으면 실제 패턴, 없으면 mock 데이터 반환
     """
-    history = load_routing_history()
+    if snapshot is None:
+        snapshot = get_routing_counters().snapshot()
+    total_count = snapshot[2]
     
-    if len(history) >= 5:  # 최소 5개 이력이 있으면 실제 패턴 사용
-        return get_real_routing_patterns()
+    if total_count >= 5:  # 최소 5개 이력이 있으면 실제 패턴 사용
+        return get_real_routing_patterns(snapshot)
     else:
-        print(f"📊 이력이 부족해 mock 데이터 사용 (현재: {len(history)}개, 필요: 5개)")
+        weights_logger.debug("📊 이력이 부족해 mock 데이터 사용", total=total_count, required=5)
         return get_mock_routing_data(user_query)
 
 
+@dataclass
+class RoutingContext:
+    """요청 단위 라우팅 컨텍스트 (이력 집계·가중치·비율을 한 번만 읽어 공유)"""
+    user_query: str
+    snapshot: CountersSnapshot
+    base_ratios: Dict[str, float]
+    total_traces: int
+    agent_weights: Dict[str, float]
+    normalized_ratios: Dict[str, float] = field(default_factory=dict)
+    weights_version: int = 0
+    partition_key: Optional[str] = None
+    ratio_scope: str = "global"  # global | partition
+
+    @property
+    def using_real_history(self) -> bool:
+        """실제 이력 기반 패턴 사용 여부"""
+        return self.snapshot[2] >= 5
+
+
+def build_routing_context(user_query: str, partition_key: Optional[str] = None) -> RoutingContext:
+    """
+    이력 집계 스냅샷, 가중치, 정규화 비율을 한 번에 구성
+    partition_key가 있고 파티션 이력이 충분하면 파티션 비율, 아니면 전역 비율 사용
+    """
+    snapshot = None
+    ratio_scope = "global"
+    if partition_key:
+        partition_snapshot = get_partitioned_history().get_counters(partition_key).snapshot()
+        if partition_snapshot[2] >= ROUTING_PARTITION_MIN_RECORDS:
+            snapshot = partition_snapshot
+            ratio_scope = "partition"
+    if snapshot is None:
+        snapshot = get_routing_counters().snapshot()
+    base_ratios, total_traces = get_routing_data_with_history(user_query, snapshot)
+    weights_snapshot = get_weight_store().current()
+    agent_weights = weights_snapshot.as_dict()
+    
+    return RoutingContext(
+        user_query=user_query,
+        snapshot=snapshot,
+        base_ratios=base_ratios,
+        total_traces=total_traces,
+        agent_weights=agent_weights,
+        normalized_ratios=apply_weights_and_normalize(base_ratios, agent_weights),
+        weights_version=weights_snapshot.version,
+        partition_key=partition_key,
+        ratio_scope=ratio_scope
+    )
+
+
 def get_mock_routing_data(user_query: str) -> Tuple[Dict[str, float], int]:
     """
     Mock 과거 라우팅 패턴 데이터 생성 (운동 추천 에이전트 버전)
     """
-    import random
-    
     # 기본 패턴들
     patterns = {
         "균등": {"축구_에이전트": 0.25, "농구_에이전트": 0.25, "야구_에이전트": 0.25, "테니스_에이전트": 0.25},
@@ -128,24 +416,9 @@ def get_mock_routing_data(user_query: str) -> Tuple[Dict[str, float], int]:
 
 
 def get_default_agent_weights() -> Dict[str, float]:
-    """환경변수에서 에이전트 가중치 로드"""
-    sports_agents = ["축구_에이전트", "농구_에이전트", "야구_에이전트", "테니스_에이전트"]
-    weights = {}
-    
-    for agent in sports_agents:
-        # 환경변수에서 가중치 읽기 (기본값: 1.0)
-        env_key = f"WEIGHT_{agent}"
-        try:
-            weight_value = float(os.getenv(env_key, "1.0"))
-            weights[agent] = weight_value
-        except (ValueError, TypeError):
-            print(f"⚠️ {env_key} 환경변수가 잘못된 형태입니다. 기본값 1.0을 사용합니다.")
-            weights[agent] = 1.0
-    
-    print(f"📊 현재 에이전트 가중치:")
-    for agent, weight in weights.items():
-        print(f"   {agent}: {weight}")
-    
+    """현재 에이전트 가중치 (가중치 저장소의 최신 스냅샷 복사본)"""
+    weights = get_weight_store().current().as_dict()
+    weights_logger.debug("📊 현재 에이전트 가중치", weights=weights)
     return weights
 
 
@@ -165,31 +438,51 @@ def apply_weights_and_normalize(base_ratios: Dict[str, float], weights: Dict[str
     return weighted_ratios
 
 
-def get_routing_statistics() -> Dict:
-    """라우팅 통계 반환"""
-    history = load_routing_history()
-    
-    if not history:
-        return {"total_requests": 0, "agents": {}}
-    
-    agent_stats = defaultdict(lambda: {"count": 0, "avg_confidence": 0.0})
-    total_count = len(history)
-    
-    for record in history:
-        agent = record["selected_agent"]
-        agent_stats[agent]["count"] += 1
-        agent_stats[agent]["avg_confidence"] += record.get("confidence", 0.0)
-    
-    # 평균 확신도 계산
-    for agent in agent_stats:
-        if agent_stats[agent]["count"] > 0:
-            agent_stats[agent]["avg_confidence"] /= agent_stats[agent]["count"]
-        agent_stats[agent]["percentage"] = agent_stats[agent]["count"] / total_count * 100
+def get_routing_statistics(snapshot: Optional[CountersSnapshot] = None, partition_key: Optional[str] = None) -> Dict:
+    """
+    라우팅 통계 반환 (메모리 집계 사용, 횟수는 감쇠 없이 윈도우 기준)
+    partition_key 지정 시 해당 파티션 집계 기준
+    """
+    if partition_key:
+        # 조회만으로 파티션 파일/LRU 항목이 생기지 않도록 기록된 파티션만 집계
+        counters = get_partitioned_history().find_counters(partition_key)
+        if counters is None:
+            return {"total_requests": 0, "agents": {}, "ratio_mode": ROUTING_RATIO_MODE}
+    else:
+        counters = get_routing_counters()
+    if isinstance(counters, SharedRecordCounters):
+        counters = counters.current()
+    if snapshot is None:
+        snapshot = counters.window_snapshot()
+    agent_counts, confidence_sums, total_count = snapshot
+    
+    if total_count == 0:
+        return {"total_requests": 0, "agents": {}, "ratio_mode": ROUTING_RATIO_MODE}
+    
+    agent_stats = {}
+    for agent, count in agent_counts.items():
+        agent_stats[agent] = {
+            "count": count,
+            "avg_confidence": confidence_sums[agent] / count if count > 0 else 0.0,
+            "percentage": count / total_count * 100
+        }
     
-    return {
+    statistics = {
         "total_requests": total_count,
-        "agents": dict(agent_stats)
+        "agents": agent_stats,
+        "ratio_mode": ROUTING_RATIO_MODE
     }
+    
+    # decay 모드: 라우팅에 실제로 쓰이는 감쇠 비율도 함께 노출 (window 모드와 수렴 속도 비교용)
+    if isinstance(counters, DecayedRoutingCounters):
+        decayed_counts, _, decayed_total = counters.snapshot()
+        statistics["half_life_seconds"] = counters.half_life_seconds
+        statistics["effective_total"] = round(counters.effective_total, 2)
+        statistics["decayed_percentages"] = {
+            agent: count / decayed_total * 100 for agent, count in decayed_counts.items()
+        } if decayed_total else {}
+    
+    return statistics
 
 def get_ab_test_weights(test_variant: str = "default") -> Dict[str, float]:
     """A/B 테스트용 가중치 설정"""
@@ -234,9 +527,6 @@ def simple_supervisor_routing(user_query: str, agent_weights: Dict[str, float] =
     # 가중치 적용 및 정규화
     normalized_ratios = apply_weights_and_normalize(base_ratios, agent_weights)
     
-    # 매번 다른 랜덤 시드 사용
-    random.seed(int(time.time() * 1000000) % 1000000)
-    
     # 가중치 기반 랜덤 선택
     agents = list(normalized_ratios.keys())
     weights = list(normalized_ratios.values())
@@ -8,15 +8,29 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))  # run_dir 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # src 추가
 
 import asyncio
+import json
+import time
+from collections import deque
 import uvicorn
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, List, Literal, Optional
 
-from agent.graph import run_sports_agent_workflow
-from agent.utils import validate_environment
+from agent.graph import run_sports_agent_workflow, stream_sports_agent_workflow, warm_up_workflow
+from agent.utils import validate_environment, get_model_client_stats
 from agent.prompts import get_welcome_message
-from agent.weights import get_routing_statistics, load_routing_history, get_default_agent_weights
+from agent.metrics import REGISTRY, render_metrics
+from agent.decision_cache import get_decision_cache
+from agent.semantic_cache import get_semantic_cache
+from agent.local_router import get_local_router
+from agent.single_flight import get_single_flight
+from agent.hedging import get_hedge_policy
+from agent.circuit_breaker import get_circuit_breaker
+from agent.structured_logging import get_logger
+from agent.weight_store import get_weight_store
+from agent.shared_state import get_shared_state, SHARED_STATE_BACKEND
+from agent.weights import get_routing_statistics, query_routing_history, get_history_store, clear_routing_history, HistoryWriteBatch, history_batch_scope, get_partitioned_history
 
 # 환경 변수 검증
 if not validate_environment():
@@ -28,9 +42,103 @@ app = FastAPI(
     version="1.0.0"
 )
 
+logger = get_logger("api")
+
+
+def invalidate_routing_caches(snapshot) -> None:
+    """가중치가 바뀌면 캐시된 결정은 더 이상 유효하지 않음 (API 업데이트/파일 변경 공통)"""
+    get_decision_cache().invalidate()
+    get_semantic_cache().invalidate()
+
+
+get_weight_store().subscribe(invalidate_routing_caches)
+
+# 모델 클라이언트 재사용 통계를 메트릭으로 노출
+REGISTRY.gauge_callback(
+    "sports_agent_model_client_events",
+    "모델 클라이언트 생성/재사용 횟수 (event 라벨)",
+    lambda: {
+        (key,): value
+        for key, value in get_model_client_stats().items()
+        if isinstance(value, int)
+    },
+    label_names=("event",)
+)
+
+# 결정 캐시 통계를 메트릭으로 노출
+REGISTRY.gauge_callback(
+    "sports_agent_decision_cache",
+    "라우팅 결정 캐시 통계 (stat 라벨: hits, misses, evictions, expirations, invalidations, size)",
+    lambda: {
+        (key,): value
+        for key, value in get_decision_cache().get_stats().items()
+        if key in ("hits", "misses", "evictions", "expirations", "invalidations", "size")
+    },
+    label_names=("stat",)
+)
+
+REGISTRY.gauge_callback(
+    "sports_agent_semantic_cache",
+    "시맨틱 캐시 통계 (stat 라벨: hits, misses, evictions, expirations, inserts, size)",
+    lambda: {
+        (key,): value
+        for key, value in get_semantic_cache().get_stats().items()
+        if key in ("hits", "misses", "evictions", "expirations", "inserts", "size")
+    },
+    label_names=("stat",)
+)
+
+REGISTRY.gauge_callback(
+    "sports_agent_local_router_llm_skip_ratio",
+    "로컬 라우터가 Gemini 없이 처리한 트래픽 비율",
+    lambda: get_local_router().get_stats()["llm_skip_ratio"]
+)
+
+REGISTRY.gauge_callback(
+    "sports_agent_circuit_breaker_state",
+    "슈퍼바이저 서킷 브레이커 상태 (0=closed, 1=half_open, 2=open)",
+    lambda: get_circuit_breaker().state_value
+)
+
+# 워밍업 상태 (/ready 엔드포인트에서 사용)
+warmup_state: Dict[str, Any] = {
+    "status": "pending",  # pending → warming → ready | failed
+    "started_at": None,
+    "completed_at": None,
+    "timings_ms": {},
+    "error": None
+}
+_warmup_task = None
+
+
+async def run_warmup():
+    """그래프/모델 클라이언트/executor 스레드 워밍업"""
+    warmup_state["status"] = "warming"
+    warmup_state["started_at"] = time.time()
+    try:
+        warmup_state["timings_ms"] = await warm_up_workflow()
+        warmup_state["status"] = "ready"
+        logger.info("🔥 워밍업 완료", timings_ms=warmup_state["timings_ms"])
+    except Exception as e:
+        warmup_state["status"] = "failed"
+        warmup_state["error"] = str(e)
+        logger.error("❌ 워밍업 실패", error=str(e))
+    finally:
+        warmup_state["completed_at"] = time.time()
+
+
+@app.on_event("startup")
+async def startup_warmup():
+    """서버 시작 시 백그라운드로 워밍업 실행 (완료 여부는 /ready로 확인)"""
+    global _warmup_task
+    _warmup_task = asyncio.create_task(run_warmup())
+
+
 class QueryRequest(BaseModel):
     query: str
     user_query: str = None  # 이전 버전 호환성
+    partition_key: Optional[str] = None  # 사용자 ID, 테넌트, 질문 클러스터 등 (파티션별 라우팅 비율)
+    prompt_mode: Optional[Literal["full", "compact"]] = None  # 기본값: SUPERVISOR_PROMPT_MODE
 
 class QueryResponse(BaseModel):
     success: bool
@@ -40,6 +148,18 @@ class QueryResponse(BaseModel):
     routing_info: Dict[str, Any] = None
     error: str = None
 
+# 배치 라우팅 설정
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "10000"))
+BATCH_STREAM_THRESHOLD = int(os.getenv("BATCH_STREAM_THRESHOLD", "100"))
+
+class BatchQueryRequest(BaseModel):
+    queries: List[str]
+    concurrency: Optional[int] = None  # 기본값: BATCH_MAX_CONCURRENCY
+    stream: Optional[bool] = None  # None이면 BATCH_STREAM_THRESHOLD 초과 시 NDJSON 스트리밍
+    partition_key: Optional[str] = None  # 배치 전체에 적용할 파티션 키
+    prompt_mode: Optional[Literal["full", "compact"]] = None  # 배치 전체에 적용할 프롬프트 모드
+
 class WeightUpdateRequest(BaseModel):
     weights: Dict[str, float]
     
@@ -64,11 +184,15 @@ async def root():
         "description": "Vertex AI Gemini 기반 운동 추천 시스템",
         "endpoints": {
             "/sports-agent-route": "POST - 운동 추천 라우팅",
+            "/sports-agent-route/stream": "POST - 스트리밍 라우팅 (SSE: routing → agent_response → summary)",
+            "/sports-agent-route/batch": "POST - 배치 라우팅 (대량 요청은 NDJSON 스트리밍)",
             "/query": "POST - 호환성 엔드포인트",
-            "/routing-stats": "GET - 라우팅 통계 조회",
-            "/routing-history": "GET - 최근 라우팅 이력 조회 (limit 파라미터 가능)",
+            "/routing-stats": "GET - 라우팅 통계 조회 (partition_key 파라미터 가능)",
+            "/routing-history": "GET - 라우팅 이력 조회 (limit, before/after 커서, agent, since/until, partition_key)",
             "/routing-history": "DELETE - 라우팅 이력 초기화",
             "/health": "GET - 헬스체크",
+            "/ready": "GET - 워밍업 완료 여부 (준비 전 503)",
+            "/metrics": "GET - Prometheus 메트릭",
             "/agent-weights": "GET - 현재 에이전트 가중치 조회",
             "/agent-weights": "POST - 에이전트 가중치 업데이트"
         },
@@ -90,10 +214,10 @@ async def sports_agent_route(request: QueryRequest):
         if not user_query:
             raise HTTPException(status_code=400, detail="query 또는 user_query 필드가 필요합니다.")
         
-        print(f"\n🏃 운동 추천 요청: {user_query}")
+        logger.info("🏃 운동 추천 요청", user_query=user_query)
         
         # 멀티 에이전트 워크플로우 실행
-        result = await run_sports_agent_workflow(user_query)
+        result = await run_sports_agent_workflow(user_query, request.partition_key, request.prompt_mode)
         
         if result.get("success"):
             return QueryResponse(
@@ -111,7 +235,104 @@ async def sports_agent_route(request: QueryRequest):
             )
             
     except Exception as e:
-        print(f"❌ API 오류: {e}")
+        logger.error("❌ API 오류", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/sports-agent-route/stream")
+async def sports_agent_route_stream(request: QueryRequest):
+    """
+    운동 추천 스트리밍 라우팅 (Server-Sent Events)
+    슈퍼바이저가 끝나는 즉시 routing 이벤트, 이후 agent_response, 마지막에 summary 이벤트 전송
+    """
+    user_query = request.query or request.user_query
+    if not user_query:
+        raise HTTPException(status_code=400, detail="query 또는 user_query 필드가 필요합니다.")
+    
+    logger.info("🏃 운동 추천 스트리밍 요청", user_query=user_query)
+    
+    async def event_stream():
+        async for event, data in stream_sports_agent_workflow(user_query, request.partition_key, request.prompt_mode):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def run_batch_workflows(
+    queries: List[str],
+    concurrency: int,
+    partition_key: Optional[str] = None,
+    prompt_mode: Optional[str] = None
+):
+    """
+    질문 목록을 동시성 상한 내에서 실행하고, 입력 순서대로 결과를 yield
+    - 태스크는 최대 concurrency x 2개까지만 미리 만들고, 앞선 결과를 내보낼 때마다 다음 질문을 투입
+    - 이력은 HistoryWriteBatch로 BATCH_HISTORY_CHUNK_SIZE개씩 묶어 기록하고, 종료(클라이언트 연결 끊김 포함) 시 남은 것 기록
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    batch = HistoryWriteBatch()
+    
+    async def run_one(index: int, user_query: str) -> Dict[str, Any]:
+        async with semaphore:
+            with history_batch_scope(batch):
+                result = await run_sports_agent_workflow(user_query, partition_key, prompt_mode)
+        return {"index": index, **result}
+    
+    pending_queries = iter(enumerate(queries))
+    window: "deque[asyncio.Task]" = deque()
+    
+    def fill_window():
+        while len(window) < concurrency * 2:
+            item = next(pending_queries, None)
+            if item is None:
+                return
+            window.append(asyncio.create_task(run_one(*item)))
+    
+    try:
+        fill_window()
+        while window:
+            result = await window.popleft()
+            fill_window()
+            yield result
+    finally:
+        for task in window:
+            task.cancel()
+        batch.flush()
+
+@app.post("/sports-agent-route/batch")
+async def sports_agent_route_batch(request: BatchQueryRequest):
+    """배치 라우팅: 동시 실행, 입력 순서 유지, 이력은 청크 단위로 묶어서 기록"""
+    queries = request.queries
+    if not queries:
+        raise HTTPException(status_code=400, detail="queries 필드가 비어 있습니다.")
+    if len(queries) > BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=400, detail=f"배치 최대 크기는 {BATCH_MAX_QUERIES}개입니다.")
+    
+    concurrency = max(1, min(request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    stream = request.stream if request.stream is not None else len(queries) > BATCH_STREAM_THRESHOLD
+    
+    logger.info("📦 배치 라우팅 요청", queries=len(queries), concurrency=concurrency, stream=stream)
+    
+    if stream:
+        async def ndjson_stream():
+            async for result in run_batch_workflows(queries, concurrency, request.partition_key, request.prompt_mode):
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        
+        return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+    
+    try:
+        results = [result async for result in run_batch_workflows(queries, concurrency, request.partition_key, request.prompt_mode)]
+        
+        return {
+            "success": True,
+            "count": len(results),
+            "succeeded": sum(1 for result in results if result.get("success")),
+            "results": results
+        }
+    except Exception as e:
+        logger.error("❌ 배치 API 오류", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/query", response_model=QueryResponse)
@@ -122,15 +343,42 @@ async def query_endpoint(request: QueryRequest):
 @app.get("/health")
 async def health_check():
     """헬스체크 엔드포인트"""
-    return {"status": "healthy", "service": "sports-agent-api"}
+    return {
+        "status": "healthy",
+        "service": "sports-agent-api",
+        "model_client": get_model_client_stats(),
+        "decision_cache": get_decision_cache().get_stats(),
+        "semantic_cache": get_semantic_cache().get_stats(),
+        "local_router": get_local_router().get_stats(),
+        "single_flight": get_single_flight().get_stats(),
+        "supervisor_latency": get_hedge_policy().get_stats(),
+        "circuit_breaker": get_circuit_breaker().get_stats(),
+        "partitions": get_partitioned_history().get_stats(),
+        "shared_state": get_shared_state().get_stats() if get_shared_state() is not None else {"backend": "none"}
+    }
+
+@app.get("/ready")
+async def readiness_check():
+    """레디니스 엔드포인트: 워밍업이 끝나야 200 반환"""
+    ready = warmup_state["status"] == "ready"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, **warmup_state}
+    )
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus 텍스트 포맷 메트릭"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 @app.get("/routing-stats")
-async def get_routing_stats():
-    """라우팅 통계 조회"""
+async def get_routing_stats(partition_key: Optional[str] = None):
+    """라우팅 통계 조회 (partition_key 지정 시 해당 파티션 기준)"""
     try:
-        stats = get_routing_statistics()
+        stats = get_routing_statistics(partition_key=partition_key)
         return {
             "success": True,
+            "partition_key": partition_key,
             "statistics": stats,
             "message": f"총 {stats['total_requests']}번의 라우팅 기록"
         }
@@ -138,33 +386,52 @@ async def get_routing_stats():
         raise HTTPException(status_code=500, detail=f"통계 조회 실패: {str(e)}")
 
 @app.get("/routing-history")
-async def get_routing_history_endpoint(limit: int = 10):
-    """최근 라우팅 이력 조회"""
+async def get_routing_history_endpoint(
+    limit: int = 10,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    agent: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    partition_key: Optional[str] = None
+):
+    """
+    라우팅 이력 조회 (최신 순, 커서 기반 페이지네이션)
+    - before=<next_cursor>: 더 오래된 페이지 / after=<prev_cursor>: 그 이후 새로 쌓인 이력 (폴링용)
+    - agent, since/until(ISO 시각), partition_key 필터
+    """
+    if limit <= 0:
+        raise HTTPException(status_code=400, detail="limit은 1 이상이어야 합니다.")
+    if before and after:
+        raise HTTPException(status_code=400, detail="before와 after는 동시에 사용할 수 없습니다.")
     try:
-        history = load_routing_history()
-        
-        # 최신 순으로 제한된 개수만 반환
-        recent_history = history[-limit:] if history else []
-        recent_history.reverse()  # 최신 순으로 정렬
-        
-        return {
-            "success": True,
-            "history": recent_history,
-            "total_count": len(history),
-            "showing": len(recent_history)
-        }
+        page = query_routing_history(
+            limit,
+            before=before,
+            after=after,
+            agent=agent,
+            since=since,
+            until=until,
+            partition=partition_key
+        )
+        total_count = get_history_store().count()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"이력 조회 실패: {str(e)}")
+    
+    return {
+        "success": True,
+        **page,
+        "total_count": total_count,
+        "showing": len(page["history"])
+    }
 
 @app.delete("/routing-history")
-async def clear_routing_history():
+async def clear_routing_history_endpoint():
     """라우팅 이력 초기화"""
     try:
-        import os
-        from agent.weights import ROUTING_HISTORY_FILE
-        
-        if os.path.exists(ROUTING_HISTORY_FILE):
-            os.remove(ROUTING_HISTORY_FILE)
+        if clear_routing_history():
             return {"success": True, "message": "라우팅 이력이 초기화되었습니다."}
         else:
             return {"success": True, "message": "이미 이력이 비어있습니다."}
@@ -175,10 +442,13 @@ async def clear_routing_history():
 async def get_agent_weights():
     """현재 에이전트 가중치 조회"""
     try:
-        weights = get_default_agent_weights()
+        snapshot = get_weight_store().current()
         return {
             "success": True,
-            "weights": weights,
+            "weights": snapshot.as_dict(),
+            "version": snapshot.version,
+            "updated_at": snapshot.updated_at,
+            "source": snapshot.source,
             "message": "현재 에이전트 가중치"
         }
     except Exception as e:
@@ -186,11 +456,8 @@ async def get_agent_weights():
 
 @app.post("/agent-weights")
 async def update_agent_weights(request: WeightUpdateRequest):
-    """에이전트 가중치 업데이트 (환경변수 업데이트)"""
+    """에이전트 가중치 업데이트 (새 버전 스냅샷으로 원자적 교체 + .env 한 번에 저장)"""
     try:
-        import os
-        from dotenv import set_key
-        
         # 유효한 에이전트 목록
         valid_agents = ["축구_에이전트", "농구_에이전트", "야구_에이전트", "테니스_에이전트"]
         
@@ -201,20 +468,16 @@ async def update_agent_weights(request: WeightUpdateRequest):
             if not isinstance(weight, (int, float)) or weight <= 0:
                 raise HTTPException(status_code=400, detail=f"가중치는 양수여야 합니다: {agent}={weight}")
         
-        # .env 파일 경로
-        env_file = os.path.join(os.path.dirname(__file__), "..", ".env")
-        
-        # 환경변수 업데이트
-        updated_weights = {}
-        for agent, weight in request.weights.items():
-            env_key = f"WEIGHT_{agent}"
-            set_key(env_file, env_key, str(weight))
-            os.environ[env_key] = str(weight)  # 현재 세션에도 반영
-            updated_weights[agent] = weight
+        # 가중치 저장소 업데이트 (캐시 무효화는 변경 리스너가 처리)
+        updated_weights = dict(request.weights)
+        snapshot = await asyncio.get_running_loop().run_in_executor(
+            None, get_weight_store().update, updated_weights
+        )
         
         return {
             "success": True,
             "updated_weights": updated_weights,
+            "version": snapshot.version,
             "message": f"{len(updated_weights)}개 에이전트의 가중치가 업데이트되었습니다."
         }
     except Exception as e:
@@ -224,9 +487,22 @@ if __name__ == "__main__":
     print("🏃 운동 추천 멀티 에이전트 API 서버를 시작합니다...")
     print(get_welcome_message())
     
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-        log_level="info"
-    )
\ No newline at end of file
+    workers = int(os.getenv("API_WORKERS", "1"))
+    if workers > 1:
+        # 멀티 워커는 import 문자열로 실행 (워커마다 앱을 새로 로드)
+        if SHARED_STATE_BACKEND == "none":
+            logger.warning("⚠️ SHARED_STATE_BACKEND=none: 워커마다 라우팅 비율/가중치가 따로 관리됩니다", workers=workers)
+        uvicorn.run(
+            "run_api:app",
+            host="0.0.0.0",
+            port=8000,
+            log_level="info",
+            workers=workers
+        )
+    else:
+        uvicorn.run(
+            app,
+            host="0.0.0.0",
+            port=8000,
+            log_level="info"
+        )
\ No newline at end of file
@@ -20,49 +20,18 @@ echo "========================================"
 # 결과 디렉토리 생성
 mkdir -p "$OUTPUT_DIR"
 
-# 단일 테스트 함수
-run_single_test() {
-    local test_id=$1
-    local result_file="$OUTPUT_DIR/test_${test_id}.json"
-    
-    # curl 실행 및 결과 저장
-    curl -s -X POST "$API_URL" \
-         -H "Content-Type: application/json" \
-         -d "{\"query\": \"$TEST_QUERY\"}" \
-         > "$result_file" 2>/dev/null
-    
-    # 성공 여부 확인
-    if [ $? -eq 0 ] && [ -s "$result_file" ]; then
-        echo "✅ Test $test_id completed"
-    else
-        echo "❌ Test $test_id failed"
-        echo "{\"error\": \"request_failed\", \"test_id\": $test_id}" > "$result_file"
-    fi
-}
-
-# export 함수 (병렬 실행을 위해)
-export -f run_single_test
-export API_URL TEST_QUERY OUTPUT_DIR
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 
 echo "🚀 테스트 실행 중..."
-start_time=$(date +%s)
-
-# GNU parallel이 있으면 사용, 없으면 xargs 사용
-if command -v parallel >/dev/null 2>&1; then
-    echo "Using GNU parallel for faster execution..."
-    seq 1 $TOTAL_TESTS | parallel -j $CONCURRENT_JOBS run_single_test {}
-else
-    echo "Using xargs for parallel execution..."
-    seq 1 $TOTAL_TESTS | xargs -n 1 -P $CONCURRENT_JOBS -I {} bash -c 'run_single_test {}'
-fi
-
-end_time=$(date +%s)
-execution_time=$((end_time - start_time))
-
-echo "⏱️  실행 시간: ${execution_time}초"
-echo "📊 결과 분석 시작..."
-
-# Python 분석 스크립트 호출 (같은 디렉토리에서)
-python3 "$(dirname "$0")/analyze_results.py" "$OUTPUT_DIR" "$TEST_QUERY" "$TOTAL_TESTS" "$execution_time"
 
-echo "🎉 테스트 완료! 결과는 $OUTPUT_DIR 디렉토리에 저장되었습니다." 
\ No newline at end of file
+# asyncio 부하 생성기로 동시 요청 실행 (지연 백분위/처리량/분포 리포트 포함)
+python3 "$SCRIPT_DIR/scripts/load_generator.py" \
+    --url "$API_URL" \
+    --mode closed \
+    --concurrency $CONCURRENT_JOBS \
+    --requests $TOTAL_TESTS \
+    --query "$TEST_QUERY" \
+    --save-responses "$OUTPUT_DIR" \
+    --output "$OUTPUT_DIR/report.json"
+
+echo "🎉 테스트 완료! 결과는 $OUTPUT_DIR 디렉토리에 저장되었습니다. (리포트: $OUTPUT_DIR/report.json)"
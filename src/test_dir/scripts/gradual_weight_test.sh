@@ -77,19 +77,15 @@ run_phase_test() {
     echo "🧪 테스트 실행 중... ($TESTS_PER_PHASE 회)"
     start_time=$(date +%s)
     
-    for ((i=1; i<=TESTS_PER_PHASE; i++)); do
-        result_file="$phase_dir/test_${i}.json"
-        
-        curl -s -X POST "$API_URL" \
-             -H "Content-Type: application/json" \
-             -d "{\"query\": \"$TEST_QUERY\"}" \
-             > "$result_file" 2>/dev/null
-        
-        if [ $((i % 5)) -eq 0 ]; then
-            echo -n "."
-        fi
-    done
-    echo ""
+    # 순차 요청 (이력 피드백이 반영되도록 동시성 1), 응답은 test_N.json으로 저장
+    python3 "$(dirname "$0")/load_generator.py" \
+        --url "$API_URL" \
+        --mode closed \
+        --concurrency 1 \
+        --requests $TESTS_PER_PHASE \
+        --query "$TEST_QUERY" \
+        --save-responses "$phase_dir" \
+        --output "$phase_dir/load_report.json" > /dev/null
     
     end_time=$(date +%s)
     duration=$((end_time - start_time))
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+asyncio 기반 부하 생성기
+/sports-agent-route 엔드포인트에 오픈 루프(고정 도착률) 또는 클로즈드 루프(고정 동시성)로 요청을 보내고
+지연 백분위(p50/p90/p99/max), 처리량, 오류율, 에이전트 분포를 하나의 JSON 리포트로 출력합니다.
+
+오픈 루프 모드의 지연은 '예정된 전송 시각'부터 측정하므로 coordinated omission이 보정됩니다.
+(서버가 느려져 전송이 밀리더라도 밀린 시간이 지연에 포함됨)
+
+사용 예:
+    python3 load_generator.py --rate 50 --duration 30 --query "운동하고 싶어"
+    python3 load_generator.py --mode closed --concurrency 20 --requests 100 --query "운동하구 싶다"
+    python3 load_generator.py --rate 20 --requests 200 --query-mix mix.json --output report.json
+    python3 load_generator.py --mode closed --concurrency 1 --requests 15 --save-responses phase_dir
+
+표준 라이브러리만 사용합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+AGENTS = ["축구_에이전트", "농구_에이전트", "야구_에이전트", "테니스_에이전트"]
+
+
+# ----------------------------------------------------------------------
+# 최소 HTTP/1.1 클라이언트 (요청당 연결 1개)
+# ----------------------------------------------------------------------
+def _decode_chunked(body: bytes) -> bytes:
+    decoded = b""
+    while body:
+        size_line, _, rest = body.partition(b"\r\n")
+        size = int(size_line.split(b";")[0], 16)
+        if size == 0:
+            break
+        decoded += rest[:size]
+        body = rest[size + 2:]
+    return decoded
+
+
+async def post_json(url: str, payload: Dict, timeout: float) -> Tuple[int, bytes]:
+    """JSON POST 요청을 보내고 (상태 코드, 본문) 반환"""
+    parsed = urlparse(url)
+    host = parsed.hostname
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    path = parsed.path or "/"
+    if parsed.query:
+        path += "?" + parsed.query
+
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    request = (
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode("utf-8") + body
+
+    async def _send():
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=(parsed.scheme == "https") or None
+        )
+        try:
+            writer.write(request)
+            await writer.drain()
+            raw = await reader.read(-1)
+        finally:
+            writer.close()
+        return raw
+
+    raw = await asyncio.wait_for(_send(), timeout=timeout)
+    head, _, response_body = raw.partition(b"\r\n\r\n")
+    lines = head.split(b"\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        key, _, value = line.partition(b":")
+        headers[key.strip().lower()] = value.strip().lower()
+    if headers.get(b"transfer-encoding") == b"chunked":
+        response_body = _decode_chunked(response_body)
+    return status, response_body
+
+
+# ----------------------------------------------------------------------
+# 통계
+# ----------------------------------------------------------------------
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """nearest-rank 백분위"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize_latencies(values_ms: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(values_ms)
+    if not values:
+        return {"count": 0, "mean": None, "p50": None, "p90": None, "p99": None, "max": None}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 2),
+        "p50": round(percentile(values, 50), 2),
+        "p90": round(percentile(values, 90), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(values[-1], 2)
+    }
+
+
+# ----------------------------------------------------------------------
+# 부하 생성
+# ----------------------------------------------------------------------
+class LoadGenerator:
+    def __init__(self, args):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.queries, self.query_weights = self._load_query_mix()
+        self.results: List[Dict] = []
+
+    def _load_query_mix(self) -> Tuple[List[str], List[float]]:
+        if self.args.query_mix:
+            with open(self.args.query_mix, "r", encoding="utf-8") as f:
+                mix = json.load(f)
+            if isinstance(mix, list):
+                return mix, [1.0] * len(mix)
+            return list(mix.keys()), [float(weight) for weight in mix.values()]
+        queries = self.args.query or ["운동하고 싶어"]
+        return queries, [1.0] * len(queries)
+
+    def _pick_query(self) -> str:
+        return self.random.choices(self.queries, weights=self.query_weights, k=1)[0]
+
+    def _total_requests(self) -> Optional[int]:
+        if self.args.requests:
+            return self.args.requests
+        if self.args.mode == "open" and self.args.duration:
+            return int(self.args.rate * self.args.duration)
+        return None
+
+    def _schedule(self, count: int) -> List[float]:
+        """오픈 루프 전송 예정 시각 (시작 기준 초)"""
+        offsets = []
+        t = 0.0
+        for _ in range(count):
+            offsets.append(t)
+            if self.args.arrival == "poisson":
+                t += self.random.expovariate(self.args.rate)
+            else:
+                t += 1.0 / self.args.rate
+        return offsets
+
+    async def _run_one(self, index: int, intended_start: float):
+        query = self._pick_query()
+        actual_start = time.perf_counter()
+        result = {
+            "index": index,
+            "query": query,
+            "status": None,
+            "selected_agent": None,
+            "error": None
+        }
+        try:
+            status, body = await post_json(self.args.url, {"query": query}, self.args.timeout)
+            result["status"] = status
+            if status == 200:
+                data = json.loads(body.decode("utf-8"))
+                result["selected_agent"] = data.get("selected_agent")
+                if not data.get("success", True):
+                    result["error"] = data.get("error", "success=false")
+                if self.args.save_responses:
+                    self._save_response(index, data)
+            else:
+                result["error"] = f"http_{status}"
+        except asyncio.TimeoutError:
+            result["error"] = "timeout"
+        except Exception as e:
+            result["error"] = type(e).__name__
+
+        end = time.perf_counter()
+        result["latency_ms"] = (end - intended_start) * 1000
+        result["service_ms"] = (end - actual_start) * 1000
+        self.results.append(result)
+
+    def _save_response(self, index: int, data: Dict):
+        """기존 셸 스크립트와 같은 형식(test_N.json)으로 응답 저장"""
+        path = os.path.join(self.args.save_responses, f"test_{index}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    async def run_open_loop(self):
+        count = self._total_requests()
+        if not count:
+            raise SystemExit("오픈 루프 모드에는 --requests 또는 --duration이 필요합니다.")
+
+        offsets = self._schedule(count)
+        start = time.perf_counter()
+        tasks = []
+        for index, offset in enumerate(offsets, 1):
+            intended = start + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._run_one(index, intended)))
+        await asyncio.gather(*tasks)
+
+    async def run_closed_loop(self):
+        count = self._total_requests()
+        deadline = time.perf_counter() + self.args.duration if self.args.duration else None
+        counter = iter(range(1, (count or sys.maxsize) + 1))
+
+        async def worker():
+            for index in counter:
+                if deadline and time.perf_counter() >= deadline:
+                    return
+                await self._run_one(index, time.perf_counter())
+
+        await asyncio.gather(*[worker() for _ in range(self.args.concurrency)])
+
+    async def run(self) -> Dict:
+        if self.args.save_responses:
+            os.makedirs(self.args.save_responses, exist_ok=True)
+
+        started_at = datetime.now().isoformat()
+        start = time.perf_counter()
+        if self.args.mode == "open":
+            await self.run_open_loop()
+        else:
+            await self.run_closed_loop()
+        elapsed = time.perf_counter() - start
+        return self.build_report(started_at, elapsed)
+
+    def build_report(self, started_at: str, elapsed: float) -> Dict:
+        ok = [r for r in self.results if r["error"] is None]
+        errors = Counter(r["error"] for r in self.results if r["error"] is not None)
+        agent_counts = Counter(r["selected_agent"] for r in ok if r["selected_agent"])
+        total = len(self.results)
+
+        report = {
+            "started_at": started_at,
+            "config": {
+                "url": self.args.url,
+                "mode": self.args.mode,
+                "rate": self.args.rate if self.args.mode == "open" else None,
+                "arrival": self.args.arrival if self.args.mode == "open" else None,
+                "concurrency": self.args.concurrency if self.args.mode == "closed" else None,
+                "queries": dict(zip(self.queries, self.query_weights))
+            },
+            "requests": total,
+            "succeeded": len(ok),
+            "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+            "errors": dict(errors),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(ok) / elapsed, 2) if elapsed > 0 else 0.0,
+            # 오픈 루프: 예정 전송 시각 기준(coordinated omission 보정), 클로즈드 루프: 실제 전송 기준
+            "latency_ms": summarize_latencies([r["latency_ms"] for r in ok]),
+            "service_latency_ms": summarize_latencies([r["service_ms"] for r in ok]),
+            "agent_distribution": {
+                agent: {
+                    "count": agent_counts.get(agent, 0),
+                    "ratio": round(agent_counts.get(agent, 0) / len(ok), 4) if ok else 0.0
+                }
+                for agent in AGENTS
+            }
+        }
+
+        if self.args.expect_distribution:
+            report["distribution_check"] = self.check_distribution(report["agent_distribution"])
+        return report
+
+    def check_distribution(self, distribution: Dict) -> Dict:
+        """기대 분포와 실제 분포 비교 (허용 오차 내인지)"""
+        expected = json.loads(self.args.expect_distribution)
+        total = sum(expected.values())
+        deviations = {}
+        passed = True
+        for agent in AGENTS:
+            expected_ratio = expected.get(agent, 0) / total if total else 0.0
+            actual_ratio = distribution[agent]["ratio"]
+            deviation = round(actual_ratio - expected_ratio, 4)
+            deviations[agent] = {"expected": round(expected_ratio, 4), "actual": actual_ratio, "deviation": deviation}
+            if abs(deviation) > self.args.tolerance:
+                passed = False
+        return {"passed": passed, "tolerance": self.args.tolerance, "agents": deviations}
+
+
+def print_summary(report: Dict):
+    latency = report["latency_ms"]
+    print("📊 부하 테스트 결과")
+    print("=" * 50)
+    print(f"요청: {report['requests']} / 성공: {report['succeeded']} / 오류율: {report['error_rate']:.2%}")
+    print(f"소요 시간: {report['elapsed_s']}초 / 처리량: {report['throughput_rps']} req/s")
+    print(f"지연(ms): p50={latency['p50']} p90={latency['p90']} p99={latency['p99']} max={latency['max']}")
+    if report["errors"]:
+        print(f"오류: {report['errors']}")
+    print("에이전트 분포:")
+    for agent, stats in report["agent_distribution"].items():
+        print(f"   {agent}: {stats['count']}회 ({stats['ratio']:.1%})")
+    if "distribution_check" in report:
+        mark = "✅" if report["distribution_check"]["passed"] else "❌"
+        print(f"{mark} 분포 검증 (허용 오차 ±{report['distribution_check']['tolerance']:.0%})")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="운동 추천 라우터 부하 생성기")
+    parser.add_argument("--url", default="http://localhost:8000/sports-agent-route")
+    parser.add_argument("--mode", choices=["open", "closed"], default="open",
+                        help="open: 고정 도착률, closed: 고정 동시성")
+    parser.add_argument("--rate", type=float, default=10.0, help="오픈 루프 도착률 (req/s)")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="poisson")
+    parser.add_argument("--concurrency", type=int, default=10, help="클로즈드 루프 동시 요청 수")
+    parser.add_argument("--requests", type=int, help="총 요청 수")
+    parser.add_argument("--duration", type=float, help="테스트 시간 (초)")
+    parser.add_argument("--query", action="append", help="테스트 질문 (여러 번 지정 가능)")
+    parser.add_argument("--query-mix", help='질문 비중 JSON 파일 ({"질문": 비중} 또는 ["질문", ...])')
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--seed", type=int, help="난수 시드")
+    parser.add_argument("--output", help="JSON 리포트 저장 경로 (기본: stdout 요약만)")
+    parser.add_argument("--save-responses", help="요청별 응답을 test_N.json으로 저장할 디렉토리")
+    parser.add_argument("--expect-distribution", help='기대 분포 JSON (예: {"축구_에이전트": 1, "농구_에이전트": 1})')
+    parser.add_argument("--tolerance", type=float, default=0.1, help="분포 검증 허용 오차 (비율)")
+    parser.add_argument("--json", action="store_true", help="요약 대신 JSON 리포트를 stdout으로 출력")
+    args = parser.parse_args(argv)
+
+    if not args.requests and not args.duration:
+        parser.error("--requests 또는 --duration 중 하나는 필요합니다.")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(LoadGenerator(args).run())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_summary(report)
+        if args.output:
+            print(f"💾 리포트 저장: {args.output}")
+
+    check = report.get("distribution_check")
+    return 1 if check and not check["passed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
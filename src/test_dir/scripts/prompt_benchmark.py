@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+슈퍼바이저 프롬프트 모드 벤치마크 (full vs compact)
+프롬프트 모드별 입력 토큰 수와, 같은 질문/비율에서의 에이전트 선택 분포가 얼마나 같은지(parity)를 측정합니다.
+
+- 토큰 수: --token-counter model이면 Gemini get_num_tokens, 기본값 estimate는 UTF-8 바이트/4 근사
+- 분포 비교: 시나리오(비율)마다 모드별로 같은 질문을 --samples회씩 모델에 보내 선택 분포를 집계하고
+  모드 간 총변동거리(TVD)와 질문별 최빈 선택 일치율을 보고 (TVD가 --tolerance를 넘으면 종료 코드 1)
+
+사용 예:
+    SUPERVISOR_MODEL=fake python3 prompt_benchmark.py --samples 200
+    python3 prompt_benchmark.py --samples 30 --query "축구 하고 싶어" --query "심심해" --token-counter model
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agent.prompts import COMPACT_SUPERVISOR_PREFIX, PROMPT_AGENTS, SUPERVISOR_PROMPT_MODES, build_supervisor_prompt  # noqa: E402
+
+
+DEFAULT_QUERIES = ["축구 하고 싶어", "농구장 어디 있어?", "야구 배우고 싶어", "테니스 레슨 받고 싶어", "심심해", "운동하고 싶어"]
+
+DEFAULT_SCENARIOS = {
+    "uniform": {agent: 0.25 for agent in PROMPT_AGENTS},
+    "skewed": {"축구_에이전트": 0.55, "농구_에이전트": 0.25, "야구_에이전트": 0.15, "테니스_에이전트": 0.05},
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text.encode("utf-8")) / 4)
+
+
+def make_token_counter(kind: str):
+    if kind == "model":
+        from agent.utils import get_gemini_model
+        model = get_gemini_model()
+        return model.get_num_tokens
+    return estimate_tokens
+
+
+def measure_tokens(queries: List[str], scenarios: Dict[str, Dict[str, float]], count_tokens) -> Dict:
+    """모드별 프롬프트 길이 (질문 x 시나리오 평균)"""
+    report = {}
+    for mode in SUPERVISOR_PROMPT_MODES:
+        tokens, chars = [], []
+        for ratios in scenarios.values():
+            for query in queries:
+                prompt = build_supervisor_prompt(query, ratios, 1000, mode)
+                tokens.append(count_tokens(prompt))
+                chars.append(len(prompt))
+        report[mode] = {
+            "avg_tokens": round(sum(tokens) / len(tokens), 1),
+            "avg_chars": round(sum(chars) / len(chars), 1),
+        }
+    report["compact"]["static_prefix_tokens"] = count_tokens(COMPACT_SUPERVISOR_PREFIX)
+    report["token_reduction"] = round(1 - report["compact"]["avg_tokens"] / report["full"]["avg_tokens"], 3)
+    return report
+
+
+def total_variation(a: Counter, b: Counter) -> float:
+    total_a, total_b = sum(a.values()) or 1, sum(b.values()) or 1
+    return 0.5 * sum(abs(a[agent] / total_a - b[agent] / total_b) for agent in PROMPT_AGENTS)
+
+
+async def sample_decisions(queries: List[str], ratios: Dict[str, float], mode: str, samples: int, concurrency: int) -> Dict:
+    """같은 질문/비율로 모델을 samples회 호출해 질문별 선택 분포와 지연을 집계"""
+    from agent.nodes import select_agent_with_model
+
+    semaphore = asyncio.Semaphore(concurrency)
+    per_query = {query: Counter() for query in queries}
+    latencies, fallbacks = [], 0
+
+    async def run_one(query: str):
+        nonlocal fallbacks
+        prompt = build_supervisor_prompt(query, ratios, 1000, mode)
+        async with semaphore:
+            decision = await select_agent_with_model(prompt)
+        latencies.append(decision["model_latency_ms"])
+        if decision["fallback"]:
+            fallbacks += 1
+        per_query[query][decision["agent_selection"].selected_agent] += 1
+
+    await asyncio.gather(*[run_one(query) for query in queries for _ in range(samples)])
+    overall = sum(per_query.values(), Counter())
+    latencies.sort()
+    return {
+        "per_query": per_query,
+        "overall": overall,
+        "fallbacks": fallbacks,
+        "model_latency_p50_ms": round(latencies[len(latencies) // 2], 2) if latencies else 0.0,
+    }
+
+
+async def measure_parity(queries, scenarios, samples, concurrency) -> Dict:
+    report = {}
+    for name, ratios in scenarios.items():
+        results = {}
+        for mode in SUPERVISOR_PROMPT_MODES:
+            results[mode] = await sample_decisions(queries, ratios, mode, samples, concurrency)
+
+        full, compact = results["full"], results["compact"]
+        agreement = [
+            full["per_query"][q].most_common(1)[0][0] == compact["per_query"][q].most_common(1)[0][0]
+            for q in queries
+        ]
+        report[name] = {
+            "ratios": ratios,
+            "distribution": {
+                mode: {agent: result["overall"][agent] for agent in PROMPT_AGENTS}
+                for mode, result in results.items()
+            },
+            "per_query_tvd": {q: round(total_variation(full["per_query"][q], compact["per_query"][q]), 3) for q in queries},
+            "overall_tvd": round(total_variation(full["overall"], compact["overall"]), 3),
+            "top_choice_agreement": round(sum(agreement) / len(agreement), 3),
+            "fallbacks": {mode: result["fallbacks"] for mode, result in results.items()},
+            "model_latency_p50_ms": {mode: result["model_latency_p50_ms"] for mode, result in results.items()},
+        }
+    return report
+
+
+def print_summary(report: Dict):
+    tokens = report["tokens"]
+    print("📏 프롬프트 길이")
+    for mode in SUPERVISOR_PROMPT_MODES:
+        print(f"  {mode:8s} 평균 토큰 {tokens[mode]['avg_tokens']:>7}  평균 글자 {tokens[mode]['avg_chars']:>7}")
+    print(f"  compact 정적 접두어 토큰: {tokens['compact']['static_prefix_tokens']}  (감소율 {tokens['token_reduction']:.1%}, 측정: {report['token_counter']})")
+
+    for name, scenario in report.get("parity", {}).items():
+        print(f"\n🎯 분포 비교 [{name}] TVD={scenario['overall_tvd']}  최빈 선택 일치율={scenario['top_choice_agreement']:.0%}")
+        for mode, distribution in scenario["distribution"].items():
+            total = sum(distribution.values()) or 1
+            row = "  ".join(f"{agent.replace('_에이전트', '')} {count / total:5.1%}" for agent, count in distribution.items())
+            print(f"  {mode:8s} {row}  (p50 {scenario['model_latency_p50_ms'][mode]}ms)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="슈퍼바이저 프롬프트 모드 벤치마크")
+    parser.add_argument("--query", action="append", help="테스트 질문 (여러 번 지정 가능, 기본: 예시 질문 6개)")
+    parser.add_argument("--scenarios", help='비율 시나리오 JSON 파일 ({"이름": {"축구_에이전트": 0.4, ...}})')
+    parser.add_argument("--samples", type=int, default=50, help="질문/모드당 모델 호출 횟수 (0이면 토큰만 측정)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--token-counter", choices=["estimate", "model"], default="estimate")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="허용 TVD (넘으면 종료 코드 1)")
+    parser.add_argument("--output", help="JSON 리포트 저장 경로")
+    parser.add_argument("--json", action="store_true", help="요약 대신 JSON 리포트를 stdout으로 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    queries = args.query or DEFAULT_QUERIES
+    scenarios = DEFAULT_SCENARIOS
+    if args.scenarios:
+        with open(args.scenarios, encoding="utf-8") as f:
+            scenarios = json.load(f)
+
+    started_at = time.perf_counter()
+    report = {
+        "token_counter": args.token_counter,
+        "tokens": measure_tokens(queries, scenarios, make_token_counter(args.token_counter)),
+    }
+    if args.samples > 0:
+        report["parity"] = asyncio.run(measure_parity(queries, scenarios, args.samples, args.concurrency))
+    report["elapsed_s"] = round(time.perf_counter() - started_at, 2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_summary(report)
+        if args.output:
+            print(f"💾 리포트 저장: {args.output}")
+
+    worst = max((scenario["overall_tvd"] for scenario in report.get("parity", {}).values()), default=0.0)
+    return 1 if worst > args.tolerance else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
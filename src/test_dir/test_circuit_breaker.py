@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+서킷 브레이커 테스트 - 상태 전환(closed → open → half_open), 취소된 탐침 반환,
+브레이커 차단/대기열 초과가 축구_에이전트 폴백이나 브레이커 실패로 집계되지 않는지 확인합니다.
+
+실행:
+    cd src && python -m unittest test_dir.test_circuit_breaker
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SUPERVISOR_MODEL"] = "fake"
+
+from agent import circuit_breaker, hedging, nodes  # noqa: E402
+from agent.circuit_breaker import CIRCUIT_REJECTIONS, CircuitBreaker  # noqa: E402
+from agent.hedging import SUPERVISOR_TIMEOUTS, HedgePolicy  # noqa: E402
+from agent.metrics import SUPERVISOR_FALLBACKS  # noqa: E402
+from agent.utils import AgentSelection  # noqa: E402
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    options = dict(failure_threshold=2, open_ms=20, max_open_ms=20, seed=0)
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+class CircuitBreakerStateTest(unittest.TestCase):
+
+    def open_then_half_open(self, breaker: CircuitBreaker) -> None:
+        breaker.record_failure()
+        breaker.record_failure()
+        time.sleep(0.05)
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, "half_open")
+
+    def test_closed_open_half_open_closed(self):
+        breaker = make_breaker()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+        self.assertTrue(breaker.allow_request())
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow_request())
+
+        time.sleep(0.05)
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, "half_open")
+        # 탐침은 half_open_max_calls(1)개까지만
+        self.assertFalse(breaker.allow_request())
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+        self.assertTrue(breaker.allow_request())
+
+    def test_failed_probe_reopens(self):
+        breaker = make_breaker()
+        self.open_then_half_open(breaker)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow_request())
+
+    def test_cancelled_probe_is_released(self):
+        breaker = make_breaker()
+        self.open_then_half_open(breaker)
+        self.assertFalse(breaker.allow_request())
+
+        breaker.release()
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.allow_request())
+
+
+class SupervisorBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (circuit_breaker._circuit_breaker, hedging._hedge_policy, nodes._supervisor_limiter)
+
+    def tearDown(self):
+        circuit_breaker._circuit_breaker, hedging._hedge_policy, nodes._supervisor_limiter = self.saved
+
+    def test_circuit_open_is_not_a_fallback(self):
+        breaker = make_breaker(failure_threshold=1, open_ms=60000, max_open_ms=60000)
+        breaker.record_failure()
+        circuit_breaker._circuit_breaker = breaker
+        local_selection = AgentSelection(selected_agent="테니스_에이전트", reason="로컬 라우터", confidence=0.7)
+        fallbacks = SUPERVISOR_FALLBACKS.value(reason="circuit_open")
+        rejections = CIRCUIT_REJECTIONS.value()
+
+        result = asyncio.run(nodes.select_agent_with_model("운동 추천", lambda: local_selection))
+
+        self.assertTrue(result["circuit_open"])
+        self.assertEqual(result["attempts"], 0)
+        self.assertIs(result["agent_selection"], local_selection)
+        self.assertEqual(SUPERVISOR_FALLBACKS.value(reason="circuit_open"), fallbacks)
+        self.assertEqual(CIRCUIT_REJECTIONS.value(), rejections + 1)
+
+    def test_queue_timeout_is_not_a_breaker_failure(self):
+        breaker = make_breaker(failure_threshold=1)
+        circuit_breaker._circuit_breaker = breaker
+        hedging._hedge_policy = HedgePolicy(attempt_timeout_ms=1000, total_budget_ms=30)
+        queue_timeouts = SUPERVISOR_TIMEOUTS.value(kind="queue")
+
+        async def run_with_full_queue():
+            semaphore = asyncio.Semaphore(1)
+            nodes._supervisor_limiter = (asyncio.get_running_loop(), semaphore)
+            async with semaphore:
+                return await nodes.select_agent_with_model("운동 추천")
+
+        result = asyncio.run(run_with_full_queue())
+
+        self.assertTrue(result["fallback"])
+        self.assertFalse(result["circuit_open"])
+        self.assertEqual(SUPERVISOR_TIMEOUTS.value(kind="queue"), queue_timeouts + 1)
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(breaker.get_stats()["consecutive_failures"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
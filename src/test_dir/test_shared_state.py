@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+공유 상태 백엔드 테스트 - 두 워커(백엔드 인스턴스)가 하나의 키-값 저장소를 공유할 때
+가중치, 이력, 집계(window/decay), 파티션 집계가 서로에게 보이는지 확인합니다.
+
+실행:
+    cd src && python -m unittest test_dir.test_shared_state
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.counters import DecayedRoutingCounters, RoutingCounters  # noqa: E402
+from agent.partitions import StorePartitionedHistory  # noqa: E402
+from agent.shared_state import InMemoryKeyValueStore, KeyValueSharedState  # noqa: E402
+from agent.weight_store import WeightStore  # noqa: E402
+
+
+def make_record(agent: str, partition: str = None, confidence: float = 0.5) -> dict:
+    record = {
+        "timestamp": datetime.now().isoformat(),
+        "user_query": "운동하고 싶어",
+        "selected_agent": agent,
+        "confidence": confidence,
+        "reason": "test",
+    }
+    if partition:
+        record["partition"] = partition
+    return record
+
+
+class KeyValueSharedStateTest(unittest.TestCase):
+
+    def setUp(self):
+        store = InMemoryKeyValueStore()
+        self.worker_a = KeyValueSharedState(store, retention=10, partition_retention=4)
+        self.worker_b = KeyValueSharedState(store, retention=10, partition_retention=4)
+
+    def test_weights_propagate_between_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store_a = WeightStore(os.path.join(directory, "a.env"), shared=self.worker_a)
+            store_b = WeightStore(os.path.join(directory, "b.env"), shared=self.worker_b)
+            self.assertEqual(store_a.current().version, store_b.current().version)
+
+            store_a.update({"농구_에이전트": 2.5}, persist=False)
+
+            self.assertEqual(store_b.current().version, store_a.current().version)
+            self.assertEqual(store_b.current().weights["농구_에이전트"], 2.5)
+            self.assertEqual(store_a.current().source, "api")
+            self.assertEqual(store_b.current().source, "shared")
+
+    def test_history_is_shared_and_trimmed(self):
+        history_a = self.worker_a.history_store()
+        history_b = self.worker_b.history_store()
+        history_a.append_many([make_record("축구_에이전트") for _ in range(8)])
+        history_b.append_many([make_record("농구_에이전트") for _ in range(4)])
+
+        self.assertEqual(history_a.count(), 10)
+        self.assertEqual(history_a.load(), history_b.load())
+        self.assertEqual([r["selected_agent"] for r in history_a.tail(4)], ["농구_에이전트"] * 4)
+
+    def test_query_cursors(self):
+        history_a = self.worker_a.history_store()
+        history_a.append_many([make_record("축구_에이전트") for _ in range(3)])
+        history_a.append_many([make_record("농구_에이전트") for _ in range(3)])
+
+        page = self.worker_b.history_store().query(4)
+        self.assertEqual(len(page["history"]), 4)
+        self.assertTrue(page["has_more"])
+        older = self.worker_b.history_store().query(4, before=page["next_cursor"])
+        self.assertEqual(len(older["history"]), 2)
+        self.assertFalse(older["has_more"])
+
+        newer = self.worker_b.history_store().query(10, after=older["history"][0]["cursor"], agent="농구_에이전트")
+        self.assertEqual([r["selected_agent"] for r in newer["history"]], ["농구_에이전트"] * 3)
+
+    def test_counters_see_other_worker_records(self):
+        for counters_factory in (RoutingCounters, DecayedRoutingCounters):
+            with self.subTest(counters=counters_factory.__name__):
+                self.worker_a.history_store().clear()
+                counters_a = self.worker_a.routing_counters(counters_factory, 10, ttl_seconds=0)
+                counters_b = self.worker_b.routing_counters(counters_factory, 10, ttl_seconds=0)
+
+                self.worker_a.history_store().append_many([make_record("축구_에이전트") for _ in range(3)])
+                self.worker_b.history_store().append_many([make_record("야구_에이전트")])
+
+                for counters in (counters_a, counters_b):
+                    counts, _, total = counters.window_snapshot()
+                    self.assertEqual(total, 4)
+                    self.assertEqual(counts, {"축구_에이전트": 3, "야구_에이전트": 1})
+
+    def test_partition_counters_are_shared(self):
+        partitions = [
+            StorePartitionedHistory(
+                lambda key, worker=worker: worker.routing_counters(RoutingCounters, 4, key, ttl_seconds=0),
+                retention=4,
+            )
+            for worker in (self.worker_a, self.worker_b)
+        ]
+        self.worker_a.history_store().append_many(
+            [make_record("테니스_에이전트", partition="user-1") for _ in range(6)]
+            + [make_record("축구_에이전트", partition="user-2")]
+        )
+
+        for partitioned in partitions:
+            self.assertEqual(partitioned.get_counters("user-1").window_snapshot()[2], 4)
+            self.assertEqual(partitioned.get_counters("user-2").window_snapshot()[0], {"축구_에이전트": 1})
+
+        self.assertTrue(self.worker_b.history_store().clear())
+        self.assertEqual(partitions[0].get_counters("user-1").total, 0)
+        self.assertEqual(self.worker_a.history_store().count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()